@@ -0,0 +1,285 @@
+"""
+Historical backtest of a forecasting model.
+
+Replays a daily history with rolling forecast origins: from every origin the
+model is rolled forward `--horizon` days starting at that day's observed
+parameters, and the rollout is scored against the days that followed. Origins
+are grouped into chunks that run as one batched rollout each (one model call
+per horizon day for the whole chunk), and chunks are spread over a process
+pool.
+
+The history is a CSV file with a `date` column and one column per parameter
+(water_temperature, lagoon, OR_brine_level, OR_bund_level, IR_brine_level,
+IR_bound_level, East_channel, West_channel), one row per day. Models that take
+weather also need the weather columns (temperature_mean, temperature_min,
+temperature_max, rain_sum, wind_speed_max, wind_gusts_max,
+relative_humidity_mean); their observed weather is fed to every rollout.
+
+Each rollout starts from the model's full input window of observed days, so
+the first origin is the last day of the first window.
+
+Origins are split chronologically: the last `--test-fraction` of them form the
+test set and the rest the validation set. MAE, RMSE and R2 are reported per
+horizon day and per parameter; with `--write` the summary is stored in the
+model's artifact metadata, which the server reports in ModelInfo.
+
+Usage:
+    python backtest.py models/best_hybrid_model.keras data/history.csv --horizon 30 --write
+"""
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from ml_predictor import PARAMETER_NAMES, WEATHER_NAMES
+from model_metadata import write_metadata
+
+logger = logging.getLogger(__name__)
+
+_worker_model = None
+_worker_values = None
+_worker_weather = None
+
+
+def load_history(path):
+    """
+    Return (dates, values, weather) from a daily history CSV
+
+    values is shaped (days, 8); weather is shaped (days, 7), or None when the
+    file has no weather columns.
+    """
+    dates = []
+    rows = []
+    weather_rows = []
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames or []
+        missing = [name for name in ['date'] + PARAMETER_NAMES if name not in columns]
+        if missing:
+            raise ValueError(f"History file {path} is missing columns: {', '.join(missing)}")
+        has_weather = any(name in columns for name in WEATHER_NAMES)
+        missing = [name for name in WEATHER_NAMES if name not in columns]
+        if has_weather and missing:
+            raise ValueError(f"History file {path} is missing weather columns: {', '.join(missing)}")
+        for row in reader:
+            dates.append(datetime.strptime(row['date'][:10], '%Y-%m-%d'))
+            rows.append([float(row[name]) for name in PARAMETER_NAMES])
+            if has_weather:
+                weather_rows.append([float(row[name]) for name in WEATHER_NAMES])
+
+    order = np.argsort(np.array(dates, dtype='datetime64[D]'), kind='stable')
+    dates = [dates[i] for i in order]
+    values = np.array(rows, dtype=np.float64)[order]
+    weather = np.array(weather_rows, dtype=np.float64)[order] if has_weather else None
+    gaps = [i for i in range(1, len(dates)) if (dates[i] - dates[i - 1]).days != 1]
+    if gaps:
+        logger.warning(f"History has {len(gaps)} gaps or duplicate days; origins spanning them are scored as if contiguous")
+    return dates, values, weather
+
+
+def _init_worker(model_path, values, weather):
+    global _worker_model, _worker_values, _worker_weather
+    from model_registry import ModelRegistry
+    _worker_model = ModelRegistry(model_path).get().model
+    _worker_values = values
+    _worker_weather = weather
+
+
+def _model_window():
+    """(timesteps, features) of the worker's model"""
+    from rollout import model_window
+    return model_window(_worker_model)
+
+
+def _score_chunk(args):
+    """Roll out one chunk of origins and return its error sums"""
+    from rollout import rollout, model_window
+
+    origins, horizon = args
+    values = _worker_values
+    timesteps, features = model_window(_worker_model)
+    rows = values if _worker_weather is None else np.concatenate([values, _worker_weather], axis=1)
+    initial = values[origins]
+    # The observed window ending at each origin, so the first step sees the
+    # same input it would in service
+    history = np.stack([rows[origin - timesteps + 1:origin + 1] for origin in origins])
+    weather = None
+    if features is not None and features > values.shape[1]:
+        weather = np.stack([_worker_weather[origin + 1:origin + 1 + horizon] for origin in origins])
+    targets = np.stack([values[origin + 1:origin + 1 + horizon] for origin in origins])
+    forecasts = rollout(_worker_model, initial, horizon, weather=weather, history=history)
+    errors = forecasts - targets
+    return {
+        'count': len(origins),
+        'abs_error': np.abs(errors).sum(axis=0),
+        'sq_error': np.square(errors).sum(axis=0),
+        'target_sum': targets.sum(axis=0),
+        'target_sq_sum': np.square(targets).sum(axis=0),
+    }
+
+
+def _merge(totals, partial):
+    if totals is None:
+        return dict(partial)
+    return {key: totals[key] + partial[key] for key in totals}
+
+
+def _metrics(totals):
+    """MAE, RMSE and R2 shaped (horizon, 8) plus pooled summaries"""
+    n = totals['count']
+    mae = totals['abs_error'] / n
+    rmse = np.sqrt(totals['sq_error'] / n)
+    total_variance = totals['target_sq_sum'] - np.square(totals['target_sum']) / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(total_variance > 0, 1.0 - totals['sq_error'] / total_variance, np.nan)
+    r2_mean = float(np.nanmean(r2)) if np.any(np.isfinite(r2)) else 0.0
+    return {
+        'origins': int(n),
+        'mae': mae,
+        'rmse': rmse,
+        'r2': r2,
+        'mae_mean': float(mae.mean()),
+        'rmse_mean': float(np.sqrt(np.square(rmse).mean())),
+        'r2_mean': r2_mean,
+    }
+
+
+def run_backtest(model_path, values, horizon, stride=1, test_fraction=0.2, workers=None, chunk_size=256,
+                 weather=None):
+    """
+    Backtest model_path over a history array
+
+    Args:
+        weather: Observed weather shaped (days, 7); required by models that
+            take weather
+
+    Returns:
+        Dictionary with 'validation' and 'test' metric sets
+    """
+    workers = workers or os.cpu_count() or 1
+    ctx = mp.get_context('spawn')
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(model_path, values, weather)
+    ) as pool:
+        timesteps, features = pool.submit(_model_window).result()
+        if features is not None and features > values.shape[1] and weather is None:
+            raise ValueError(
+                f"Model {model_path} takes {features - values.shape[1]} weather features but the history "
+                f"has no weather columns ({', '.join(WEATHER_NAMES)})"
+            )
+
+        origins = np.arange(timesteps - 1, len(values) - horizon, stride)
+        if len(origins) < 2:
+            raise ValueError(
+                f"History of {len(values)} days is too short for a {timesteps}-day window and a {horizon}-day horizon"
+            )
+        split = int(round(len(origins) * (1.0 - test_fraction)))
+        split = min(max(split, 1), len(origins) - 1)
+        sets = {'validation': origins[:split], 'test': origins[split:]}
+
+        tasks = []
+        for name, set_origins in sets.items():
+            for start in range(0, len(set_origins), chunk_size):
+                tasks.append((name, (set_origins[start:start + chunk_size], horizon)))
+
+        totals = {name: None for name in sets}
+        for (name, _), partial in zip(tasks, pool.map(_score_chunk, [task for _, task in tasks])):
+            totals[name] = _merge(totals[name], partial)
+
+    return {name: _metrics(set_totals) for name, set_totals in totals.items()}
+
+
+def performance_metrics(results):
+    """Map backtest results onto the PerformanceMetrics fields"""
+    test = results['test']
+    validation = results['validation']
+    return {
+        'test_mae': test['mae_mean'],
+        'test_rmse': test['rmse_mean'],
+        'test_r2_score': test['r2_mean'],
+        'test_accuracy': test['r2_mean'] * 100,
+        'validation_r2_score': validation['r2_mean'],
+        'validation_accuracy': validation['r2_mean'] * 100,
+    }
+
+
+def _detail(metrics):
+    """JSON-friendly per-horizon, per-parameter breakdown"""
+    return {
+        'origins': metrics['origins'],
+        'parameters': PARAMETER_NAMES,
+        'mae': np.round(metrics['mae'], 6).tolist(),
+        'rmse': np.round(metrics['rmse'], 6).tolist(),
+        'r2': [[None if np.isnan(v) else round(float(v), 6) for v in row] for row in metrics['r2']],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('model_path', help='.keras file or mapped model directory')
+    parser.add_argument('history', help='daily history CSV')
+    parser.add_argument('--horizon', type=int, default=30, help='days forecast from every origin')
+    parser.add_argument('--stride', type=int, default=1, help='days between forecast origins')
+    parser.add_argument('--test-fraction', type=float, default=0.2, help='share of (latest) origins scored as test')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='origins per batched rollout')
+    parser.add_argument('--output', help='write the full per-horizon report as JSON here')
+    parser.add_argument('--write', action='store_true', help='store the metrics in the model artifact metadata')
+    args = parser.parse_args()
+
+    try:
+        dates, values, weather = load_history(args.history)
+        started = time.perf_counter()
+        results = run_backtest(
+            args.model_path, values, args.horizon,
+            stride=args.stride, test_fraction=args.test_fraction,
+            workers=args.workers, chunk_size=args.chunk_size, weather=weather
+        )
+    except ValueError as e:
+        print(f'Backtest failed: {str(e)}')
+        return 1
+    elapsed = time.perf_counter() - started
+
+    metrics = performance_metrics(results)
+    report = {
+        'model_path': args.model_path,
+        'history': args.history,
+        'history_start': dates[0].strftime('%Y-%m-%d'),
+        'history_end': dates[-1].strftime('%Y-%m-%d'),
+        'horizon_days': args.horizon,
+        'stride_days': args.stride,
+        'evaluated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'performance_metrics': metrics,
+        'validation': _detail(results['validation']),
+        'test': _detail(results['test']),
+    }
+
+    print(f"Backtested {results['validation']['origins'] + results['test']['origins']} origins "
+          f"x {args.horizon} days in {elapsed:.1f}s")
+    for name, value in metrics.items():
+        print(f'  {name:<20} {value:.6f}')
+    print(f"  {'horizon':<8}" + ''.join(f'{name[:14]:>16}' for name in PARAMETER_NAMES) + '   (test MAE)')
+    for day, row in enumerate(results['test']['mae'], start=1):
+        print(f'  {day:<8}' + ''.join(f'{v:16.4f}' for v in row))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.write:
+        backtest_report = {key: value for key, value in report.items() if key != 'performance_metrics'}
+        write_metadata(args.model_path, {'performance_metrics': metrics, 'backtest': backtest_report})
+        print(f'Wrote metrics to the metadata of {args.model_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
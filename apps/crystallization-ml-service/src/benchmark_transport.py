@@ -0,0 +1,184 @@
+"""
+Benchmark the TCP, Unix domain socket and shared-memory paths.
+
+Starts server.py on a TCP port and a Unix domain socket (or uses a running
+server given with --tcp and --uds), then times the same calls over each path:
+
+    GetPredictions     TCP and UDS
+    ExportForecasts    TCP inline, UDS inline and UDS with shared memory;
+                       the client decodes every Arrow batch in all three
+
+For every path it reports the per-call latency (p50 and p95) and the CPU
+seconds the client and the server spent per call. Server CPU is read from
+/proc, so it is only reported on Linux for a server this script started.
+
+Usage:
+    python benchmark_transport.py --iterations 20 --requests 256 --days 90
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+import grpc
+import numpy as np
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generated'))
+import predictions_pb2
+import predictions_pb2_grpc
+from shared_results import read_batch
+
+CURRENT_VALUES = predictions_pb2.CurrentValues(
+    water_temperature=28.0, lagoon=2.0, OR_brine_level=4.5, OR_bund_level=1.5,
+    IR_brine_level=5.5, IR_bound_level=1.5, East_channel=7.0, West_channel=6.5
+)
+
+
+def _server_cpu_seconds(pid):
+    """utime + stime of a process from /proc, or None"""
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            fields = stat.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def start_server(port, uds_path):
+    """Start server.py with both listeners and wait until it answers"""
+    env = dict(
+        os.environ, GRPC_PORT=str(port), GRPC_UDS_PATH=uds_path,
+        PRECOMPUTE_INTERVAL_SECONDS='0', FORECAST_CACHE_TTL_SECONDS='0', METRICS_LOG_INTERVAL='0'
+    )
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generated'), env.get('PYTHONPATH')
+    ]))
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    channel = grpc.insecure_channel(f'localhost:{port}')
+    try:
+        grpc.channel_ready_future(channel).result(timeout=120)
+    finally:
+        channel.close()
+    return process
+
+
+def _run(label, call, iterations, server_pid):
+    call()  # warm up
+    latencies = []
+    client_started = time.process_time()
+    server_started = _server_cpu_seconds(server_pid) if server_pid else None
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000.0)
+    client_cpu = (time.process_time() - client_started) / iterations
+    server_cpu = None
+    if server_started is not None:
+        server_cpu = (_server_cpu_seconds(server_pid) - server_started) / iterations
+    return {
+        'path': label,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'client_cpu_ms': client_cpu * 1000.0,
+        'server_cpu_ms': None if server_cpu is None else server_cpu * 1000.0,
+    }
+
+
+def _predictions_call(stub, days, model_id):
+    request = predictions_pb2.PredictionRequest(
+        start_date='2026-01-01', forecast_days=days, current_values=CURRENT_VALUES, model_id=model_id
+    )
+    return lambda: stub.GetPredictions(request)
+
+
+def _export_call(stub, requests, days, model_id, shared_memory):
+    request = predictions_pb2.ForecastExportRequest(
+        requests=[
+            predictions_pb2.PredictionRequest(
+                site_id=f'site-{index}', start_date='2026-01-01', forecast_days=days,
+                current_values=CURRENT_VALUES, model_id=model_id
+            )
+            for index in range(requests)
+        ],
+        shared_memory=shared_memory
+    )
+
+    def call():
+        rows = 0
+        for message in stub.ExportForecasts(request):
+            if message.shm_name:
+                batch, segment = read_batch(message.shm_name, message.shm_size)
+                rows += batch.num_rows
+                del batch
+                segment.close()
+            else:
+                rows += pa.ipc.open_stream(message.ipc_stream).read_next_batch().num_rows
+        return rows
+
+    return call
+
+
+def benchmark(tcp_target, uds_target, iterations=20, requests=256, days=90, model_id='', server_pid=None):
+    """Time every path; returns a list of result dictionaries"""
+    tcp = predictions_pb2_grpc.PredictionsServiceStub(grpc.insecure_channel(tcp_target))
+    uds = predictions_pb2_grpc.PredictionsServiceStub(grpc.insecure_channel(uds_target))
+    cases = [
+        ('GetPredictions', 'tcp', _predictions_call(tcp, days, model_id)),
+        ('GetPredictions', 'uds', _predictions_call(uds, days, model_id)),
+        ('ExportForecasts', 'tcp inline', _export_call(tcp, requests, days, model_id, False)),
+        ('ExportForecasts', 'uds inline', _export_call(uds, requests, days, model_id, False)),
+        ('ExportForecasts', 'uds shared memory', _export_call(uds, requests, days, model_id, True)),
+    ]
+    results = []
+    for rpc, label, call in cases:
+        result = _run(label, call, iterations, server_pid)
+        result['rpc'] = rpc
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare TCP, Unix socket and shared-memory transport')
+    parser.add_argument('--iterations', type=int, default=20, help='timed calls per path')
+    parser.add_argument('--requests', type=int, default=256, help='requests per ExportForecasts call')
+    parser.add_argument('--days', type=int, default=90, help='forecast days per request')
+    parser.add_argument('--model-id', default='', help='model to forecast with')
+    parser.add_argument('--tcp', help='host:port of a running server instead of starting one')
+    parser.add_argument('--uds', help='socket path of a running server instead of starting one')
+    args = parser.parse_args()
+
+    process = None
+    if args.tcp and args.uds:
+        tcp_target, uds_path = args.tcp, args.uds
+    else:
+        uds_path = os.path.join(tempfile.mkdtemp(), 'ml-service.sock')
+        port = 50059
+        process = start_server(port, uds_path)
+        tcp_target = f'localhost:{port}'
+
+    try:
+        results = benchmark(
+            tcp_target, f'unix:{uds_path}', args.iterations, args.requests, args.days, args.model_id,
+            server_pid=process.pid if process else None
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(f"{'rpc':<17}{'path':<20}{'p50 ms':>9}{'p95 ms':>9}{'client cpu ms':>15}{'server cpu ms':>15}")
+    for result in results:
+        server_cpu = '-' if result['server_cpu_ms'] is None else f"{result['server_cpu_ms']:.2f}"
+        print(f"{result['rpc']:<17}{result['path']:<20}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+              f"{result['client_cpu_ms']:>15.2f}{server_cpu:>15}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
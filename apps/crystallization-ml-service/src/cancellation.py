@@ -0,0 +1,47 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionCancelled(Exception):
+    """Raised when the caller is gone or its deadline has passed"""
+
+    def __init__(self, stage, reason):
+        super().__init__(f"Prediction cancelled during {stage}: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+class CancellationToken:
+    """
+    Lets long-running prediction work notice that nobody is waiting for it.
+
+    Wraps two callables, normally a gRPC context's `is_active` and
+    `time_remaining`. Work calls `check(stage)` at safe points (between
+    rollout chunks, before aggregation and encoding), which raises
+    PredictionCancelled once the caller disconnected or its deadline passed.
+    A token built without callables never cancels.
+    """
+
+    def __init__(self, is_active=None, time_remaining=None):
+        self._is_active = is_active
+        self._time_remaining = time_remaining
+
+    @classmethod
+    def from_grpc_context(cls, context):
+        return cls(is_active=context.is_active, time_remaining=context.time_remaining)
+
+    def reason(self):
+        """Why work should stop, or None while the caller is still waiting"""
+        if self._time_remaining is not None:
+            remaining = self._time_remaining()
+            if remaining is not None and remaining <= 0:
+                return 'deadline exceeded'
+        if self._is_active is not None and not self._is_active():
+            return 'client disconnected'
+        return None
+
+    def check(self, stage):
+        reason = self.reason()
+        if reason is not None:
+            raise PredictionCancelled(stage, reason)
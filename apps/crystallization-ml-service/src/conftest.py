@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generated'))
+
+from mapped_model import ARCHITECTURE_FILE, FORMAT_VERSION, INDEX_FILE, WEIGHTS_FILE
+from production import REFERENCE_PARAMETERS
+
+CURRENT_VALUES = dict(zip(
+    ['water_temperature', 'lagoon', 'OR_brine_level', 'OR_bund_level',
+     'IR_brine_level', 'IR_bound_level', 'East_channel', 'West_channel'],
+    [28.0, 2.0, 4.5, 1.5, 5.5, 1.5, 7.0, 6.5]
+))
+
+
+def write_relaxing_model(path):
+    """A mapped Flatten + Dense model relaxing every parameter towards REFERENCE_PARAMETERS"""
+    os.makedirs(path)
+    weights = [
+        np.ascontiguousarray(0.9 * np.eye(8, dtype=np.float32)),
+        np.asarray(0.1 * REFERENCE_PARAMETERS, dtype=np.float32),
+    ]
+    entries = []
+    with open(os.path.join(path, WEIGHTS_FILE), 'wb') as f:
+        offset = 0
+        for position, weight in enumerate(weights):
+            entries.append({
+                'layer': 'dense', 'position': position, 'dtype': weight.dtype.str,
+                'shape': list(weight.shape), 'offset': offset
+            })
+            f.write(weight.tobytes())
+            offset += weight.nbytes
+    with open(os.path.join(path, INDEX_FILE), 'w') as f:
+        json.dump({'format_version': FORMAT_VERSION, 'weights': entries}, f)
+    with open(os.path.join(path, ARCHITECTURE_FILE), 'w') as f:
+        json.dump({'class_name': 'Sequential', 'config': {'layers': [
+            {'class_name': 'InputLayer', 'config': {'name': 'input', 'batch_shape': [None, 1, 8]}},
+            {'class_name': 'Flatten', 'config': {'name': 'flatten'}},
+            {'class_name': 'Dense', 'config': {'name': 'dense', 'units': 8}},
+        ]}}, f)
+    return path
+
+
+@pytest.fixture(scope='session')
+def model_dir(tmp_path_factory):
+    """Directory holding the relaxing model as relax.mmw"""
+    directory = tmp_path_factory.mktemp('models')
+    write_relaxing_model(str(directory / 'relax.mmw'))
+    return directory
+
+
+@pytest.fixture
+def make_predictor(model_dir, tmp_path, monkeypatch):
+    """Build MLPredictors serving relax.mmw as the default model, with stores under tmp_path"""
+    def make(**env):
+        settings = {
+            'FORECAST_STATE_DB': str(tmp_path / 'state.db'),
+            'MATERIALIZED_FORECAST_DB': '',
+            'FORECAST_CACHE_TTL_SECONDS': '0',
+        }
+        settings.update(env)
+        for name, value in settings.items():
+            monkeypatch.setenv(name, value)
+        from ml_predictor import MLPredictor
+        return MLPredictor(model_path=str(model_dir / 'relax.mmw'), model_dir=str(model_dir))
+
+    return make
@@ -0,0 +1,285 @@
+"""
+Bulk forecast export to Apache Arrow IPC streams and Parquet files.
+
+Forecasts for many requests are written as three tables with fixed schemas:
+`daily` (one row per request and day), `monthly` (one row per request and
+month) and `seasonal` (one row per request and season). Columns are filled
+straight from the rolled-out forecast arrays. Requests are processed in chunks;
+within a chunk the requests sharing a model and horizon are rolled out as one
+batch and become one record batch per table, so no per-day dictionaries or
+protobufs are built.
+
+The request file holds one JSON object per line, shaped like PredictionRequest:
+    {"site_id": "site-a", "start_date": "2026-01-01", "forecast_days": 30,
+     "current_values": {"water_temperature": 28.1, ...}, "model_id": "", "horizon_mode": "monthly"}
+
+Usage:
+    python forecast_export.py requests.jsonl exports/ --format parquet
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import production
+from ml_predictor import MLPredictor, PARAMETER_NAMES, WEATHER_NAMES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64
+
+SEASONS = ['Maha', 'Yala', 'Other']
+
+# Index into SEASONS of each calendar month (index 0 unused)
+SEASON_OF_MONTH = np.array([0] + [SEASONS.index(production.season_for_month(month)) for month in range(1, 13)])
+
+_KEY_FIELDS = [
+    pa.field('request_index', pa.int32()),
+    pa.field('site_id', pa.string()),
+    pa.field('model_id', pa.string()),
+]
+
+DAILY_SCHEMA = pa.schema(
+    _KEY_FIELDS
+    + [pa.field('date', pa.date32()), pa.field('day_number', pa.int32())]
+    + [pa.field(name, pa.float64()) for name in PARAMETER_NAMES]
+    + [pa.field(name, pa.float64()) for name in WEATHER_NAMES]
+)
+
+MONTHLY_SCHEMA = pa.schema(_KEY_FIELDS + [
+    pa.field('month', pa.string()),
+    pa.field('month_number', pa.int32()),
+    pa.field('production_forecast', pa.float64()),
+    pa.field('lower_bound', pa.float64()),
+    pa.field('upper_bound', pa.float64()),
+    pa.field('season', pa.string()),
+])
+
+SEASONAL_SCHEMA = pa.schema(_KEY_FIELDS + [
+    pa.field('season', pa.string()),
+    pa.field('months_count', pa.int32()),
+    pa.field('total_production', pa.float64()),
+])
+
+SCHEMAS = {'daily': DAILY_SCHEMA, 'monthly': MONTHLY_SCHEMA, 'seasonal': SEASONAL_SCHEMA}
+
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrows'}
+
+
+class ExportError(ValueError):
+    """Raised when an export request is malformed"""
+
+
+def resolve_tables(tables):
+    """Validate requested table names; an empty list selects every table"""
+    if not tables:
+        return list(SCHEMAS)
+    unknown = [table for table in tables if table not in SCHEMAS]
+    if unknown:
+        raise ExportError(f"Unknown export tables: {', '.join(unknown)}. Valid tables: {', '.join(SCHEMAS)}")
+    return list(tables)
+
+
+def export_batches(predictor, requests, tables=None, chunk_size=DEFAULT_CHUNK_SIZE, cancellation=None):
+    """
+    Forecast every request and yield the results as Arrow record batches
+
+    Args:
+        predictor: MLPredictor used for the rollouts
+        requests: List of request dictionaries (site_id, start_date,
+            forecast_days, current_values, model_id, horizon_mode)
+        tables: Tables to produce (see SCHEMAS); all when empty
+        chunk_size: Requests forecast per chunk
+        cancellation: Optional CancellationToken; abandoned work raises PredictionCancelled
+
+    Yields:
+        Tuples of (table name, pa.RecordBatch)
+    """
+    tables = resolve_tables(tables)
+    for request in requests:
+        if not 1 <= request.get('forecast_days', 0) <= predictor.max_forecast_days:
+            raise ExportError(
+                f"forecast_days must be between 1 and {predictor.max_forecast_days} "
+                f"(site '{request.get('site_id', '')}')"
+            )
+
+    for chunk_start in range(0, len(requests), max(chunk_size, 1)):
+        chunk = requests[chunk_start:chunk_start + max(chunk_size, 1)]
+
+        # Requests sharing a model, horizon and horizon mode are rolled out as one batch
+        groups = {}
+        for offset, request in enumerate(chunk):
+            key = (request.get('model_id') or '', request['forecast_days'], request.get('horizon_mode') or None)
+            groups.setdefault(key, []).append(chunk_start + offset)
+
+        for (model_id, forecast_days, horizon_mode), indices in groups.items():
+            arrays = predictor.forecast_arrays(
+                [requests[i]['start_date'] for i in indices],
+                forecast_days,
+                [requests[i]['current_values'] for i in indices],
+                model_id=model_id,
+                horizon_mode=horizon_mode,
+                cancellation=cancellation
+            )
+            keys = {
+                'request_index': np.array(indices, dtype=np.int32),
+                'site_id': np.array([requests[i].get('site_id') or '' for i in indices], dtype=object),
+                'model_id': arrays['model_id'],
+            }
+            if cancellation is not None:
+                cancellation.check('encoding')
+            for table in tables:
+                yield table, _BUILDERS[table](keys, arrays)
+
+
+def _key_columns(keys, repeats):
+    """Request key columns with every request repeated `repeats` times"""
+    rows = len(keys['request_index']) * repeats
+    return [
+        pa.array(np.repeat(keys['request_index'], repeats), pa.int32()),
+        pa.array(np.repeat(keys['site_id'], repeats), pa.string()),
+        pa.array(np.full(rows, keys['model_id'], dtype=object), pa.string()),
+    ]
+
+
+def _daily_batch(keys, arrays):
+    parameters, weather = arrays['parameters'], arrays['weather']
+    batch, days = parameters.shape[:2]
+    start_dates = np.array([start.strftime('%Y-%m-%d') for start in arrays['start_dates']], dtype='datetime64[D]')
+    dates = (start_dates[:, None] + np.arange(days)).ravel()
+
+    columns = _key_columns(keys, days) + [
+        pa.array(dates, pa.date32()),
+        pa.array(np.tile(np.arange(1, days + 1, dtype=np.int32), batch), pa.int32()),
+    ]
+    columns += [pa.array(parameters[:, :, i].ravel(), pa.float64()) for i in range(len(PARAMETER_NAMES))]
+    columns += [pa.array(weather[:, :, i].ravel(), pa.float64()) for i in range(len(WEATHER_NAMES))]
+    return pa.RecordBatch.from_arrays(columns, schema=DAILY_SCHEMA)
+
+
+def _monthly_batch(keys, arrays):
+    monthly_production = arrays['monthly_production']
+    batch, months = monthly_production.shape
+    labels = np.array(arrays['month_labels'], dtype=object).ravel()
+    month_of_year = np.array([int(label[5:7]) for label in labels])
+    production_forecast = monthly_production.ravel()
+
+    columns = _key_columns(keys, months) + [
+        pa.array(labels, pa.string()),
+        pa.array(np.tile(np.arange(1, months + 1, dtype=np.int32), batch), pa.int32()),
+        pa.array(production_forecast, pa.float64()),
+        pa.array(production_forecast * 0.85, pa.float64()),
+        pa.array(production_forecast * 1.15, pa.float64()),
+        pa.array(np.array(SEASONS, dtype=object)[SEASON_OF_MONTH[month_of_year]], pa.string()),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=MONTHLY_SCHEMA)
+
+
+def _seasonal_batch(keys, arrays):
+    monthly_production = arrays['monthly_production']
+    month_of_year = np.array([[int(label[5:7]) for label in labels] for labels in arrays['month_labels']])
+    seasons = SEASON_OF_MONTH[month_of_year]
+
+    # (batch, seasons) month counts and production totals
+    counts = np.stack([(seasons == i).sum(axis=1) for i in range(len(SEASONS))], axis=1)
+    totals = np.stack([np.where(seasons == i, monthly_production, 0.0).sum(axis=1) for i in range(len(SEASONS))], axis=1)
+
+    # Only seasons that occur in a request's months get a row
+    present = counts.ravel() > 0
+    columns = [column.filter(pa.array(present)) for column in _key_columns(keys, len(SEASONS))] + [
+        pa.array(np.tile(np.array(SEASONS, dtype=object), len(seasons))[present], pa.string()),
+        pa.array(counts.ravel()[present].astype(np.int32), pa.int32()),
+        pa.array(totals.ravel()[present], pa.float64()),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=SEASONAL_SCHEMA)
+
+
+_BUILDERS = {'daily': _daily_batch, 'monthly': _monthly_batch, 'seasonal': _seasonal_batch}
+
+
+def serialize_batch(batch):
+    """Encode one record batch as a self-contained Arrow IPC stream"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def write_export(batches, output_dir, file_format='parquet', tables=None):
+    """
+    Write record batches to one file per table in output_dir
+
+    Returns:
+        Dictionary of table name to (path, rows written)
+    """
+    tables = resolve_tables(tables)
+    os.makedirs(output_dir, exist_ok=True)
+    writers, written = {}, {}
+    try:
+        for table in tables:
+            path = os.path.join(output_dir, table + FORMATS[file_format])
+            if file_format == 'parquet':
+                writers[table] = pq.ParquetWriter(path, SCHEMAS[table])
+            else:
+                writers[table] = pa.ipc.new_stream(path, SCHEMAS[table])
+            written[table] = (path, 0)
+        for table, batch in batches:
+            writers[table].write_batch(batch)
+            written[table] = (written[table][0], written[table][1] + batch.num_rows)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return written
+
+
+def load_requests(path):
+    """Read one request dictionary per non-empty line of a JSON lines file"""
+    requests = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            missing = [key for key in ('start_date', 'forecast_days', 'current_values') if key not in request]
+            if missing:
+                raise ExportError(f"{path}:{line_number} is missing {', '.join(missing)}")
+            requests.append(request)
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export forecasts for many requests to Arrow or Parquet')
+    parser.add_argument('requests', help='JSON lines file with one PredictionRequest-shaped object per line')
+    parser.add_argument('output_dir', help='directory receiving one file per table')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='parquet', help='output file format')
+    parser.add_argument('--tables', nargs='*', default=None, help=f"tables to export (default: {' '.join(SCHEMAS)})")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='requests per batched rollout')
+    parser.add_argument('--model-path', default='models/best_hybrid_model.keras', help='default model artifact')
+    parser.add_argument('--model-dir', default=None, help='directory with additional model artifacts')
+    args = parser.parse_args()
+
+    predictor = MLPredictor(model_path=args.model_path, model_dir=args.model_dir)
+
+    requests = load_requests(args.requests)
+    started = time.perf_counter()
+    written = write_export(
+        export_batches(predictor, requests, args.tables, args.chunk_size),
+        args.output_dir, args.format, args.tables
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f'Exported {len(requests)} requests in {elapsed:.1f}s')
+    for table, (path, rows) in written.items():
+        print(f'  {table:<10} {rows:>10} rows  {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
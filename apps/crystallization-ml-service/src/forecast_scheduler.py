@@ -0,0 +1,192 @@
+"""
+Scheduled precomputation of the standard forecast horizons.
+
+Every site in the forecast state store is a registered site. Its state holds
+the latest observed values and the date the next forecast starts on (written
+by GetPredictions with a site_id and by AdvanceForecast, i.e. whenever a day's
+data arrives). A precompute pass rolls out PRECOMPUTE_HORIZONS days from those
+values for every site whose forecasts are missing for its current start date,
+inputs, model version and HORIZON_MODE, and writes them to the materialized
+store that GetPredictions serves from.
+
+Sites sharing a model are rolled out as one batch over the longest horizon;
+shorter horizons are prefixes of that rollout, each with monthly production
+continued from its own last day as an on-demand request for that horizon
+computes it. The scheduler thread runs a
+pass every PRECOMPUTE_INTERVAL_SECONDS while inside PRECOMPUTE_WINDOW, so the
+compute happens off-peak and peak-hour requests become lookups.
+
+Environment:
+    PRECOMPUTE_HORIZONS             comma separated horizons in days (7,30,90)
+    PRECOMPUTE_WINDOW               local time window such as 01:00-05:00; any time when empty
+    PRECOMPUTE_INTERVAL_SECONDS     seconds between passes; 0 disables the thread (300)
+    MATERIALIZED_RETENTION_DAYS     days a past forecast is kept after its start date (7)
+
+Usage (one pass, e.g. from cron):
+    python forecast_scheduler.py
+"""
+import os
+import sys
+import time
+import logging
+import threading
+from datetime import datetime
+
+from ml_predictor import MLPredictor, PARAMETER_NAMES
+from service_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def parse_window(window):
+    """Parse 'HH:MM-HH:MM' into (start, end) minutes after midnight, or None"""
+    if not window:
+        return None
+    try:
+        start, end = window.split('-')
+        start_hour, start_minute = (int(part) for part in start.strip().split(':'))
+        end_hour, end_minute = (int(part) for part in end.strip().split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid precompute window '{window}', expected HH:MM-HH:MM")
+    return start_hour * 60 + start_minute, end_hour * 60 + end_minute
+
+
+class PrecomputeScheduler:
+    """Precomputes the standard horizons of every registered site"""
+
+    def __init__(self, predictor, horizons=(7, 30, 90), window=None, interval_seconds=300, retention_days=7):
+        self.predictor = predictor
+        self.horizons = sorted(set(horizons))
+        self.window = parse_window(window)
+        self.interval_seconds = interval_seconds
+        self.retention_days = retention_days
+        self._thread = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_env(cls, predictor):
+        return cls(
+            predictor,
+            horizons=[int(h) for h in os.getenv('PRECOMPUTE_HORIZONS', '7,30,90').split(',') if h.strip()],
+            window=os.getenv('PRECOMPUTE_WINDOW', ''),
+            interval_seconds=float(os.getenv('PRECOMPUTE_INTERVAL_SECONDS', '300')),
+            retention_days=int(os.getenv('MATERIALIZED_RETENTION_DAYS', '7'))
+        )
+
+    @property
+    def enabled(self):
+        return (
+            self.predictor.state_store is not None
+            and self.predictor.materialized is not None
+            and bool(self.horizons)
+        )
+
+    def in_window(self, now=None):
+        if self.window is None:
+            return True
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        start, end = self.window
+        if start <= end:
+            return start <= minute < end
+        # Window wrapping midnight, e.g. 22:00-04:00
+        return minute >= start or minute < end
+
+    def run_once(self):
+        """
+        Precompute missing forecasts for every registered site
+
+        Returns:
+            Number of sites forecast
+        """
+        if not self.enabled:
+            return 0
+        started = time.perf_counter()
+        state_store, materialized = self.predictor.state_store, self.predictor.materialized
+
+        # Sites with missing horizons, grouped by model
+        pending = {}
+        for site_id in state_store.site_ids():
+            state = state_store.load(site_id)
+            if state is None or state.observed_values is None:
+                continue
+            if (datetime.now() - state.start_date).days > self.retention_days:
+                # Would be pruned again right away
+                continue
+            try:
+                slot = self.predictor.registry.get(state.model_id)
+            except Exception as e:
+                logger.warning(f"Skipping precompute for site '{site_id}': {str(e)}")
+                continue
+            stored = materialized.horizons(
+                site_id, state.start_date, slot.version, self.predictor.horizon_mode, state.observed_values
+            )
+            if any(horizon not in stored for horizon in self.horizons):
+                pending.setdefault(slot.model_id, []).append(state)
+
+        sites = 0
+        for model_id, states in pending.items():
+            arrays = self.predictor.forecast_arrays(
+                [state.start_date.strftime('%Y-%m-%d') for state in states],
+                self.horizons[-1],
+                [dict(zip(PARAMETER_NAMES, state.observed_values.tolist())) for state in states],
+                model_id=model_id, production_horizons=self.horizons
+            )
+            version = self.predictor.registry.get(model_id).version
+            for row, state in enumerate(states):
+                for horizon in self.horizons:
+                    materialized.put(
+                        state.site_id, state.start_date, version, arrays['horizon_mode'], arrays['model_id'],
+                        state.observed_values,
+                        arrays['parameters'][row, :horizon], arrays['weather'][row, :horizon],
+                        arrays['monthly_production_by_horizon'][horizon][row]
+                    )
+            sites += len(states)
+
+        materialized.prune(self.retention_days)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        metrics.increment('precompute.passes')
+        metrics.increment('precompute.sites', sites)
+        metrics.observe('precompute.pass_ms', elapsed_ms)
+        if sites:
+            logger.info(f"Precomputed {len(self.horizons)} horizons for {sites} sites in {elapsed_ms:.0f} ms")
+        return sites
+
+    def start(self):
+        """Run passes from a daemon thread until stop() is called"""
+        if self._thread is not None or not self.enabled or self.interval_seconds <= 0:
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                if self.in_window():
+                    try:
+                        self.run_once()
+                    except Exception as e:
+                        logger.error(f"Precompute pass failed: {str(e)}", exc_info=True)
+                self._stop.wait(self.interval_seconds)
+
+        self._thread = threading.Thread(target=loop, name='forecast-precompute', daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Forecast precompute scheduled every {self.interval_seconds:g}s for horizons "
+            f"{', '.join(str(h) for h in self.horizons)}"
+        )
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    scheduler = PrecomputeScheduler.from_env(MLPredictor())
+    if not scheduler.enabled:
+        print('Precompute needs FORECAST_STATE_DB, MATERIALIZED_FORECAST_DB and PRECOMPUTE_HORIZONS')
+        return 1
+    sites = scheduler.run_once()
+    print(f'Precomputed forecasts for {sites} sites')
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
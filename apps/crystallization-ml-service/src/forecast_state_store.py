@@ -0,0 +1,113 @@
+import io
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastState:
+    """The last rollout stored for a site"""
+
+    def __init__(self, site_id, model_id, start_date, arrays, updated_at):
+        self.site_id = site_id
+        self.model_id = model_id
+        self.start_date = start_date
+        self.arrays = arrays
+        self.updated_at = updated_at
+
+    @property
+    def parameters(self):
+        return self.arrays['parameters']
+
+    @property
+    def weather(self):
+        return self.arrays['weather']
+
+    @property
+    def observed_values(self):
+        """Parameter vector the forecast was rolled out from; None for older rows"""
+        return self.arrays.get('observed_values')
+
+
+class ForecastStateStore:
+    """
+    Per-site forecast state kept in a local SQLite database.
+
+    Each site has one row holding the model it was forecast with, the first
+    forecast date and the rolled-out arrays (daily parameters, weather and any
+    extra rollout state) serialized as a single npz blob.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                '''
+                CREATE TABLE IF NOT EXISTS forecast_state (
+                    site_id TEXT PRIMARY KEY,
+                    model_id TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    arrays BLOB NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                '''
+            )
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the store safe to use
+        # from the gRPC thread pool.
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, site_id, model_id, start_date, parameters, weather, **rollout_state):
+        """Replace the stored forecast for site_id"""
+        buffer = io.BytesIO()
+        np.savez(buffer, parameters=parameters, weather=weather, **rollout_state)
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO forecast_state (site_id, model_id, start_date, arrays, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    site_id,
+                    model_id,
+                    start_date.strftime('%Y-%m-%d'),
+                    buffer.getvalue(),
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                )
+            )
+
+    def load(self, site_id):
+        """Return the stored ForecastState for site_id, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT model_id, start_date, arrays, updated_at FROM forecast_state WHERE site_id = ?',
+                (site_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        model_id, start_date, blob, updated_at = row
+        with np.load(io.BytesIO(blob)) as data:
+            arrays = {name: data[name] for name in data.files}
+        return ForecastState(site_id, model_id, datetime.strptime(start_date, '%Y-%m-%d'), arrays, updated_at)
+
+    def site_ids(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute('SELECT site_id FROM forecast_state ORDER BY site_id')]
+
+    def delete(self, site_id):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM forecast_state WHERE site_id = ?', (site_id,))
@@ -0,0 +1,136 @@
+"""
+Content versions of forecasts, for polling clients that already hold one.
+
+Every forecast response carries a version: a hash of the model version, start
+date and forecast arrays it was built from. A client that sends back the
+version it holds (PredictionRequest.known_version) gets
+
+    not_modified    when the forecast would be identical, with no sections
+    delta           when the server still has the held forecast's arrays; the
+                    daily, monthly and seasonal entries that differ from it
+                    are sent, the totals in full
+    success         a full response otherwise
+
+Repeated polls only see the same forecast if it is not recomputed, so the
+predictor also keeps the arrays of recent requests and serves an identical
+request (same inputs, model version, start date and horizon) from them for
+FORECAST_CACHE_TTL_SECONDS.
+
+Environment:
+    FORECAST_CACHE_TTL_SECONDS   seconds an identical request reuses a forecast; 0 disables (300)
+    FORECAST_CACHE_ENTRIES       forecasts kept for reuse and diffing (1024)
+"""
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def forecast_version(model_version, start_dt, parameters, weather, monthly_production):
+    """Content hash of a forecast's arrays; arrays that were not computed are skipped"""
+    digest = hashlib.sha1(f"{model_version}|{start_dt.strftime('%Y-%m-%d')}".encode())
+    for name, array in (('parameters', parameters), ('weather', weather), ('production', monthly_production)):
+        if array is not None:
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class VersionedForecast:
+    """The arrays a versioned forecast response was built from"""
+
+    def __init__(self, version, start_dt, parameters, weather, monthly_production):
+        self.version = version
+        self.start_dt = start_dt
+        self.parameters = parameters
+        self.weather = weather
+        self.monthly_production = monthly_production
+        self.created = time.monotonic()
+
+    def changes_since(self, base):
+        """
+        Entries that differ from a base forecast
+
+        Returns:
+            Dictionary with the changed 'days' and 'months' (0-based indices),
+            or None when the forecasts cannot be compared entry by entry
+        """
+        if base.start_dt != self.start_dt:
+            return None
+        return {
+            'days': _changed_rows(base.parameters, self.parameters, base.weather, self.weather),
+            'months': _changed_rows(base.monthly_production, self.monthly_production),
+        }
+
+
+def _changed_rows(base, current, base_extra=None, current_extra=None):
+    """Indices of the rows of current that differ from base (all when base lacks them)"""
+    if current is None:
+        return []
+    if base is None:
+        return list(range(len(current)))
+    changed = np.ones(len(current), dtype=bool)
+    common = min(len(base), len(current))
+    changed[:common] = (base[:common] != current[:common]).reshape(common, -1).any(axis=1)
+    if base_extra is not None and current_extra is not None:
+        changed[:common] |= (base_extra[:common] != current_extra[:common]).reshape(common, -1).any(axis=1)
+    return np.flatnonzero(changed).tolist()
+
+
+class ForecastVersionCache:
+    """
+    Recent forecasts by version and by the request that produced them
+
+    A bounded LRU shared by the gRPC worker threads.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._versions = OrderedDict()
+        self._requests = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_entries=int(os.getenv('FORECAST_CACHE_ENTRIES', '1024')),
+            ttl_seconds=float(os.getenv('FORECAST_CACHE_TTL_SECONDS', '300'))
+        )
+
+    def put(self, forecast, request_key=None):
+        with self._lock:
+            self._versions[forecast.version] = forecast
+            self._versions.move_to_end(forecast.version)
+            if request_key is not None and self.ttl_seconds > 0:
+                self._requests[request_key] = forecast
+                self._requests.move_to_end(request_key)
+            for entries in (self._versions, self._requests):
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+
+    def get(self, version):
+        """The forecast with this version, or None when it is no longer kept"""
+        with self._lock:
+            forecast = self._versions.get(version)
+            if forecast is not None:
+                self._versions.move_to_end(version)
+            return forecast
+
+    def lookup(self, request_key):
+        """The forecast an identical request produced within the TTL, or None"""
+        with self._lock:
+            forecast = self._requests.get(request_key)
+            if forecast is None:
+                return None
+            if time.monotonic() - forecast.created > self.ttl_seconds:
+                del self._requests[request_key]
+                return None
+            self._requests.move_to_end(request_key)
+            return forecast
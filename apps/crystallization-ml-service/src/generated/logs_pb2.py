@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: logs.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'logs.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nlogs.proto\x12\x04logs\x1a\x1fgoogle/protobuf/timestamp.proto\"\xaa\x01\n\x10\x43reateLogRequest\x12\x14\n\x0cservice_name\x18\x01 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x02 \x01(\t\x12\x0f\n\x07user_id\x18\x03 \x01(\t\x12\x13\n\x0bresource_id\x18\x04 \x01(\t\x12\x15\n\rresource_type\x18\x05 \x01(\t\x12\x0f\n\x07\x64\x65tails\x18\x06 \x01(\t\x12\x0e\n\x06status\x18\x07 \x01(\t\x12\x12\n\nip_address\x18\x08 \x01(\t\"E\n\x11\x43reateLogResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06log_id\x18\x03 \x01(\t\"#\n\x11GetLogByIdRequest\x12\x0e\n\x06log_id\x18\x01 \x01(\t\"J\n\x0eGetLogResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x03log\x18\x03 \x01(\x0b\x32\t.logs.Log\"U\n\x0eGetLogsRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x0e\n\x06offset\x18\x02 \x01(\x05\x12\x0e\n\x06status\x18\x03 \x01(\t\x12\x14\n\x0cservice_name\x18\x04 \x01(\t\"F\n\x14GetLogsByUserRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x0e\n\x06offset\x18\x03 \x01(\x05\"N\n\x17GetLogsByServiceRequest\x12\x14\n\x0cservice_name\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x0e\n\x06offset\x18\x03 \x01(\x05\"[\n\x0fGetLogsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x17\n\x04logs\x18\x03 \x03(\x0b\x32\t.logs.Log\x12\r\n\x05total\x18\x04 \x01(\x05\"\xd9\x01\n\x03Log\x12\n\n\x02id\x18\x01 \x01(\t\x12\x14\n\x0cservice_name\x18\x02 \x01(\t\x12\x0e\n\x06\x61\x63tion\x18\x03 \x01(\t\x12\x0f\n\x07user_id\x18\x04 \x01(\t\x12\x13\n\x0bresource_id\x18\x05 \x01(\t\x12\x15\n\rresource_type\x18\x06 \x01(\t\x12\x0f\n\x07\x64\x65tails\x18\x07 \x01(\t\x12\x0e\n\x06status\x18\x08 \x01(\t\x12\x12\n\nip_address\x18\t \x01(\t\x12.\n\ncreated_at\x18\n \x01(\x0b\x32\x1a.google.protobuf.Timestamp2\xce\x02\n\x0bLogsService\x12<\n\tCreateLog\x12\x16.logs.CreateLogRequest\x1a\x17.logs.CreateLogResponse\x12;\n\nGetLogById\x12\x17.logs.GetLogByIdRequest\x1a\x14.logs.GetLogResponse\x12\x36\n\x07GetLogs\x12\x14.logs.GetLogsRequest\x1a\x15.logs.GetLogsResponse\x12\x42\n\rGetLogsByUser\x12\x1a.logs.GetLogsByUserRequest\x1a\x15.logs.GetLogsResponse\x12H\n\x10GetLogsByService\x12\x1d.logs.GetLogsByServiceRequest\x1a\x15.logs.GetLogsResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'logs_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CREATELOGREQUEST']._serialized_start=54
+  _globals['_CREATELOGREQUEST']._serialized_end=224
+  _globals['_CREATELOGRESPONSE']._serialized_start=226
+  _globals['_CREATELOGRESPONSE']._serialized_end=295
+  _globals['_GETLOGBYIDREQUEST']._serialized_start=297
+  _globals['_GETLOGBYIDREQUEST']._serialized_end=332
+  _globals['_GETLOGRESPONSE']._serialized_start=334
+  _globals['_GETLOGRESPONSE']._serialized_end=408
+  _globals['_GETLOGSREQUEST']._serialized_start=410
+  _globals['_GETLOGSREQUEST']._serialized_end=495
+  _globals['_GETLOGSBYUSERREQUEST']._serialized_start=497
+  _globals['_GETLOGSBYUSERREQUEST']._serialized_end=567
+  _globals['_GETLOGSBYSERVICEREQUEST']._serialized_start=569
+  _globals['_GETLOGSBYSERVICEREQUEST']._serialized_end=647
+  _globals['_GETLOGSRESPONSE']._serialized_start=649
+  _globals['_GETLOGSRESPONSE']._serialized_end=740
+  _globals['_LOG']._serialized_start=743
+  _globals['_LOG']._serialized_end=960
+  _globals['_LOGSSERVICE']._serialized_start=963
+  _globals['_LOGSSERVICE']._serialized_end=1297
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,269 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+import logs_pb2 as logs__pb2
+
+GRPC_GENERATED_VERSION = '1.76.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in logs_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class LogsServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.CreateLog = channel.unary_unary(
+                '/logs.LogsService/CreateLog',
+                request_serializer=logs__pb2.CreateLogRequest.SerializeToString,
+                response_deserializer=logs__pb2.CreateLogResponse.FromString,
+                _registered_method=True)
+        self.GetLogById = channel.unary_unary(
+                '/logs.LogsService/GetLogById',
+                request_serializer=logs__pb2.GetLogByIdRequest.SerializeToString,
+                response_deserializer=logs__pb2.GetLogResponse.FromString,
+                _registered_method=True)
+        self.GetLogs = channel.unary_unary(
+                '/logs.LogsService/GetLogs',
+                request_serializer=logs__pb2.GetLogsRequest.SerializeToString,
+                response_deserializer=logs__pb2.GetLogsResponse.FromString,
+                _registered_method=True)
+        self.GetLogsByUser = channel.unary_unary(
+                '/logs.LogsService/GetLogsByUser',
+                request_serializer=logs__pb2.GetLogsByUserRequest.SerializeToString,
+                response_deserializer=logs__pb2.GetLogsResponse.FromString,
+                _registered_method=True)
+        self.GetLogsByService = channel.unary_unary(
+                '/logs.LogsService/GetLogsByService',
+                request_serializer=logs__pb2.GetLogsByServiceRequest.SerializeToString,
+                response_deserializer=logs__pb2.GetLogsResponse.FromString,
+                _registered_method=True)
+
+
+class LogsServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def CreateLog(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLogById(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLogs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLogsByUser(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLogsByService(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_LogsServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'CreateLog': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateLog,
+                    request_deserializer=logs__pb2.CreateLogRequest.FromString,
+                    response_serializer=logs__pb2.CreateLogResponse.SerializeToString,
+            ),
+            'GetLogById': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLogById,
+                    request_deserializer=logs__pb2.GetLogByIdRequest.FromString,
+                    response_serializer=logs__pb2.GetLogResponse.SerializeToString,
+            ),
+            'GetLogs': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLogs,
+                    request_deserializer=logs__pb2.GetLogsRequest.FromString,
+                    response_serializer=logs__pb2.GetLogsResponse.SerializeToString,
+            ),
+            'GetLogsByUser': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLogsByUser,
+                    request_deserializer=logs__pb2.GetLogsByUserRequest.FromString,
+                    response_serializer=logs__pb2.GetLogsResponse.SerializeToString,
+            ),
+            'GetLogsByService': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLogsByService,
+                    request_deserializer=logs__pb2.GetLogsByServiceRequest.FromString,
+                    response_serializer=logs__pb2.GetLogsResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'logs.LogsService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('logs.LogsService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class LogsService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def CreateLog(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logs.LogsService/CreateLog',
+            logs__pb2.CreateLogRequest.SerializeToString,
+            logs__pb2.CreateLogResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLogById(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logs.LogsService/GetLogById',
+            logs__pb2.GetLogByIdRequest.SerializeToString,
+            logs__pb2.GetLogResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLogs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logs.LogsService/GetLogs',
+            logs__pb2.GetLogsRequest.SerializeToString,
+            logs__pb2.GetLogsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLogsByUser(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logs.LogsService/GetLogsByUser',
+            logs__pb2.GetLogsByUserRequest.SerializeToString,
+            logs__pb2.GetLogsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLogsByService(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/logs.LogsService/GetLogsByService',
+            logs__pb2.GetLogsByServiceRequest.SerializeToString,
+            logs__pb2.GetLogsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -24,47 +24,83 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11predictions.proto\x12\x0bpredictions\"r\n\x11PredictionRequest\x12\x12\n\nstart_date\x18\x01 \x01(\t\x12\x15\n\rforecast_days\x18\x02 \x01(\x05\x12\x32\n\x0e\x63urrent_values\x18\x03 \x01(\x0b\x32\x1a.predictions.CurrentValues\"\xc5\x01\n\rCurrentValues\x12\x19\n\x11water_temperature\x18\x01 \x01(\x01\x12\x0e\n\x06lagoon\x18\x02 \x01(\x01\x12\x16\n\x0eOR_brine_level\x18\x03 \x01(\x01\x12\x15\n\rOR_bund_level\x18\x04 \x01(\x01\x12\x16\n\x0eIR_brine_level\x18\x05 \x01(\x01\x12\x16\n\x0eIR_bound_level\x18\x06 \x01(\x01\x12\x14\n\x0c\x45\x61st_channel\x18\x07 \x01(\x01\x12\x14\n\x0cWest_channel\x18\x08 \x01(\x01\"\x97\x03\n\x12PredictionResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12G\n\x19\x64\x61ily_parameters_forecast\x18\x02 \x01(\x0b\x32$.predictions.DailyParametersForecast\x12J\n\x1amonthly_production_6months\x18\x03 \x01(\x0b\x32&.predictions.MonthlyProductionForecast\x12K\n\x1bmonthly_production_12months\x18\x04 \x01(\x0b\x32&.predictions.MonthlyProductionForecast\x12<\n\x13seasonal_production\x18\x05 \x01(\x0b\x32\x1f.predictions.SeasonalProduction\x12*\n\nmodel_info\x18\x06 \x01(\x0b\x32\x16.predictions.ModelInfo\x12%\n\x07summary\x18\x07 \x01(\x0b\x32\x14.predictions.Summary\"\xab\x01\n\x17\x44\x61ilyParametersForecast\x12\x15\n\rforecast_type\x18\x01 \x01(\t\x12\x1b\n\x13\x66orecast_start_date\x18\x02 \x01(\t\x12\x19\n\x11\x66orecast_end_date\x18\x03 \x01(\t\x12\x12\n\ntotal_days\x18\x04 \x01(\x05\x12-\n\tforecasts\x18\x05 \x03(\x0b\x32\x1a.predictions.DailyForecast\"\x85\x01\n\rDailyForecast\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x12\n\nday_number\x18\x02 \x01(\x05\x12+\n\nparameters\x18\x03 \x01(\x0b\x32\x17.predictions.Parameters\x12%\n\x07weather\x18\x04 \x01(\x0b\x32\x14.predictions.Weather\"\xc2\x01\n\nParameters\x12\x19\n\x11water_temperature\x18\x01 \x01(\x01\x12\x0e\n\x06lagoon\x18\x02 \x01(\x01\x12\x16\n\x0eOR_brine_level\x18\x03 \x01(\x01\x12\x15\n\rOR_bund_level\x18\x04 \x01(\x01\x12\x16\n\x0eIR_brine_level\x18\x05 \x01(\x01\x12\x16\n\x0eIR_bound_level\x18\x06 \x01(\x01\x12\x14\n\x0c\x45\x61st_channel\x18\x07 \x01(\x01\x12\x14\n\x0cWest_channel\x18\x08 \x01(\x01\"\xb7\x01\n\x07Weather\x12\x18\n\x10temperature_mean\x18\x01 \x01(\x01\x12\x17\n\x0ftemperature_min\x18\x02 \x01(\x01\x12\x17\n\x0ftemperature_max\x18\x03 \x01(\x01\x12\x10\n\x08rain_sum\x18\x04 \x01(\x01\x12\x16\n\x0ewind_speed_max\x18\x05 \x01(\x01\x12\x16\n\x0ewind_gusts_max\x18\x06 \x01(\x01\x12\x1e\n\x16relative_humidity_mean\x18\x07 \x01(\x01\"\xe6\x01\n\x19MonthlyProductionForecast\x12\x15\n\rforecast_type\x18\x01 \x01(\t\x12\x17\n\x0f\x66orecast_period\x18\x02 \x01(\t\x12\x1c\n\x14\x66orecast_start_month\x18\x03 \x01(\t\x12\x1a\n\x12\x66orecast_end_month\x18\x04 \x01(\t\x12\x14\n\x0ctotal_months\x18\x05 \x01(\x05\x12\x18\n\x10total_production\x18\x06 \x01(\x01\x12/\n\tforecasts\x18\x07 \x03(\x0b\x32\x1c.predictions.MonthlyForecast\"\x8d\x01\n\x0fMonthlyForecast\x12\r\n\x05month\x18\x01 \x01(\t\x12\x14\n\x0cmonth_number\x18\x02 \x01(\x05\x12\x1b\n\x13production_forecast\x18\x03 \x01(\x01\x12\x13\n\x0blower_bound\x18\x04 \x01(\x01\x12\x13\n\x0bupper_bound\x18\x05 \x01(\x01\x12\x0e\n\x06season\x18\x06 \x01(\t\"\xcc\x01\n\x12SeasonalProduction\x12\x15\n\rforecast_type\x18\x01 \x01(\t\x12\x17\n\x0f\x66orecast_period\x18\x02 \x01(\t\x12=\n\x07seasons\x18\x03 \x03(\x0b\x32,.predictions.SeasonalProduction.SeasonsEntry\x1aG\n\x0cSeasonsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.predictions.SeasonData:\x02\x38\x01\"j\n\nSeasonData\x12\x14\n\x0cmonths_count\x18\x01 \x01(\x05\x12\x18\n\x10total_production\x18\x02 \x01(\x01\x12,\n\x06months\x18\x03 \x03(\x0b\x32\x1c.predictions.MonthProduction\"4\n\x0fMonthProduction\x12\r\n\x05month\x18\x01 \x01(\t\x12\x12\n\nproduction\x18\x02 \x01(\x01\"y\n\tModelInfo\x12\x12\n\nmodel_type\x18\x01 \x01(\t\x12\x1a\n\x12\x66orecast_generated\x18\x02 \x01(\t\x12<\n\x13performance_metrics\x18\x03 \x01(\x0b\x32\x1f.predictions.PerformanceMetrics\"\xa1\x01\n\x12PerformanceMetrics\x12\x10\n\x08test_mae\x18\x01 \x01(\x01\x12\x11\n\ttest_rmse\x18\x02 \x01(\x01\x12\x15\n\rtest_r2_score\x18\x03 \x01(\x01\x12\x15\n\rtest_accuracy\x18\x04 \x01(\x01\x12\x1b\n\x13validation_r2_score\x18\x05 \x01(\x01\x12\x1b\n\x13validation_accuracy\x18\x06 \x01(\x01\"\xa5\x01\n\x07Summary\x12\x1b\n\x13\x64\x61ily_forecast_days\x18\x01 \x01(\x05\x12\"\n\x1amonthly_6_total_production\x18\x02 \x01(\x01\x12#\n\x1bmonthly_12_total_production\x18\x03 \x01(\x01\x12\x19\n\x11maha_season_total\x18\x04 \x01(\x01\x12\x19\n\x11yala_season_total\x18\x05 \x01(\x01\x32g\n\x12PredictionsService\x12Q\n\x0eGetPredictions\x12\x1e.predictions.PredictionRequest\x1a\x1f.predictions.PredictionResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11predictions.proto\x12\x0bpredictions\"\xd2\x01\n\x11PredictionRequest\x12\x12\n\nstart_date\x18\x01 \x01(\t\x12\x15\n\rforecast_days\x18\x02 \x01(\x05\x12\x32\n\x0e\x63urrent_values\x18\x03 \x01(\x0b\x32\x1a.predictions.CurrentValues\x12\x10\n\x08model_id\x18\x04 \x01(\t\x12\x0f\n\x07site_id\x18\x05 \x01(\t\x12\x0e\n\x06\x66ields\x18\x06 \x03(\t\x12\x14\n\x0chorizon_mode\x18\x07 \x01(\t\x12\x15\n\rknown_version\x18\x08 \x01(\t\"\x88\x01\n\x16\x41\x64vanceForecastRequest\x12\x0f\n\x07site_id\x18\x01 \x01(\t\x12\x15\n\robserved_date\x18\x02 \x01(\t\x12\x33\n\x0fobserved_values\x18\x03 \x01(\x0b\x32\x1a.predictions.CurrentValues\x12\x11\n\ttolerance\x18\x04 \x01(\x01\"|\n\x17\x41\x64vanceForecastResponse\x12\x31\n\x08\x66orecast\x18\x01 \x01(\x0b\x32\x1f.predictions.PredictionResponse\x12\x19\n\x11reused_trajectory\x18\x02 \x01(\x08\x12\x13\n\x0bmodel_steps\x18\x03 \x01(\x05\"\xd7\x01\n\x14ScenarioSweepRequest\x12\x12\n\nstart_date\x18\x01 \x01(\t\x12\x14\n\x0chorizon_days\x18\x02 \x01(\x05\x12/\n\x0b\x62\x61se_values\x18\x03 \x01(\x0b\x32\x1a.predictions.CurrentValues\x12(\n\x04grid\x18\x04 \x03(\x0b\x32\x1a.predictions.ParameterGrid\x12(\n\tscenarios\x18\x05 \x03(\x0b\x32\x15.predictions.Scenario\x12\x10\n\x08model_id\x18\x06 \x01(\t\"2\n\rParameterGrid\x12\x11\n\tparameter\x18\x01 \x01(\t\x12\x0e\n\x06\x64\x65ltas\x18\x02 \x03(\x01\"z\n\x08Scenario\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x31\n\x06\x64\x65ltas\x18\x02 \x03(\x0b\x32!.predictions.Scenario.DeltasEntry\x1a-\n\x0b\x44\x65ltasEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"\xcb\x01\n\x15ScenarioSweepResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x14\n\x0chorizon_days\x18\x02 \x01(\x05\x12/\n\tscenarios\x18\x03 \x03(\x0b\x32\x1c.predictions.ScenarioSummary\x12/\n\rsensitivities\x18\x04 \x03(\x0b\x32\x18.predictions.Sensitivity\x12*\n\nmodel_info\x18\x05 \x01(\x0b\x32\x16.predictions.ModelInfo\"\xda\x02\n\x0fScenarioSummary\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x38\n\x06\x64\x65ltas\x18\x02 \x03(\x0b\x32(.predictions.ScenarioSummary.DeltasEntry\x12\x18\n\x10total_production\x18\x03 \x01(\x01\x12\x34\n\x0emonthly_totals\x18\x04 \x03(\x0b\x32\x1c.predictions.MonthProduction\x12I\n\x0fseasonal_totals\x18\x05 \x03(\x0b\x32\x30.predictions.ScenarioSummary.SeasonalTotalsEntry\x1a-\n\x0b\x44\x65ltasEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x1a\x35\n\x13SeasonalTotalsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\"Q\n\x0bSensitivity\x12\x11\n\tparameter\x18\x01 \x01(\t\x12\x1b\n\x13production_per_unit\x18\x02 \x01(\x01\x12\x12\n\nelasticity\x18\x03 \x01(\x01\"\xc5\x01\n\rCurrentValues\x12\x19\n\x11water_temperature\x18\x01 \x01(\x01\x12\x0e\n\x06lagoon\x18\x02 \x01(\x01\x12\x16\n\x0eOR_brine_level\x18\x03 \x01(\x01\x12\x15\n\rOR_bund_level\x18\x04 \x01(\x01\x12\x16\n\x0eIR_brine_level\x18\x05 \x01(\x01\x12\x16\n\x0eIR_bound_level\x18\x06 \x01(\x01\x12\x14\n\x0c\x45\x61st_channel\x18\x07 \x01(\x01\x12\x14\n\x0cWest_channel\x18\x08 \x01(\x01\"\xbe\x03\n\x12PredictionResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12G\n\x19\x64\x61ily_parameters_forecast\x18\x02 \x01(\x0b\x32$.predictions.DailyParametersForecast\x12J\n\x1amonthly_production_6months\x18\x03 \x01(\x0b\x32&.predictions.MonthlyProductionForecast\x12K\n\x1bmonthly_production_12months\x18\x04 \x01(\x0b\x32&.predictions.MonthlyProductionForecast\x12<\n\x13seasonal_production\x18\x05 \x01(\x0b\x32\x1f.predictions.SeasonalProduction\x12*\n\nmodel_info\x18\x06 \x01(\x0b\x32\x16.predictions.ModelInfo\x12%\n\x07summary\x18\x07 \x01(\x0b\x32\x14.predictions.Summary\x12\x0f\n\x07version\x18\x08 \x01(\t\x12\x14\n\x0c\x62\x61se_version\x18\t \x01(\t\"\xab\x01\n\x17\x44\x61ilyParametersForecast\x12\x15\n\rforecast_type\x18\x01 \x01(\t\x12\x1b\n\x13\x66orecast_start_date\x18\x02 \x01(\t\x12\x19\n\x11\x66orecast_end_date\x18\x03 \x01(\t\x12\x12\n\ntotal_days\x18\x04 \x01(\x05\x12-\n\tforecasts\x18\x05 \x03(\x0b\x32\x1a.predictions.DailyForecast\"\x85\x01\n\rDailyForecast\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x12\n\nday_number\x18\x02 \x01(\x05\x12+\n\nparameters\x18\x03 \x01(\x0b\x32\x17.predictions.Parameters\x12%\n\x07weather\x18\x04 \x01(\x0b\x32\x14.predictions.Weather\"\xc2\x01\n\nParameters\x12\x19\n\x11water_temperature\x18\x01 \x01(\x01\x12\x0e\n\x06lagoon\x18\x02 \x01(\x01\x12\x16\n\x0eOR_brine_level\x18\x03 \x01(\x01\x12\x15\n\rOR_bund_level\x18\x04 \x01(\x01\x12\x16\n\x0eIR_brine_level\x18\x05 \x01(\x01\x12\x16\n\x0eIR_bound_level\x18\x06 \x01(\x01\x12\x14\n\x0c\x45\x61st_channel\x18\x07 \x01(\x01\x12\x14\n\x0cWest_channel\x18\x08 \x01(\x01\"\xb7\x01\n\x07Weather\x12\x18\n\x10temperature_mean\x18\x01 \x01(\x01\x12\x17\n\x0ftemperature_min\x18\x02 \x01(\x01\x12\x17\n\x0ftemperature_max\x18\x03 \x01(\x01\x12\x10\n\x08rain_sum\x18\x04 \x01(\x01\x12\x16\n\x0ewind_speed_max\x18\x05 \x01(\x01\x12\x16\n\x0ewind_gusts_max\x18\x06 \x01(\x01\x12\x1e\n\x16relative_humidity_mean\x18\x07 \x01(\x01\"\xe6\x01\n\x19MonthlyProductionForecast\x12\x15\n\rforecast_type\x18\x01 \x01(\t\x12\x17\n\x0f\x66orecast_period\x18\x02 \x01(\t\x12\x1c\n\x14\x66orecast_start_month\x18\x03 \x01(\t\x12\x1a\n\x12\x66orecast_end_month\x18\x04 \x01(\t\x12\x14\n\x0ctotal_months\x18\x05 \x01(\x05\x12\x18\n\x10total_production\x18\x06 \x01(\x01\x12/\n\tforecasts\x18\x07 \x03(\x0b\x32\x1c.predictions.MonthlyForecast\"\x8d\x01\n\x0fMonthlyForecast\x12\r\n\x05month\x18\x01 \x01(\t\x12\x14\n\x0cmonth_number\x18\x02 \x01(\x05\x12\x1b\n\x13production_forecast\x18\x03 \x01(\x01\x12\x13\n\x0blower_bound\x18\x04 \x01(\x01\x12\x13\n\x0bupper_bound\x18\x05 \x01(\x01\x12\x0e\n\x06season\x18\x06 \x01(\t\"\xcc\x01\n\x12SeasonalProduction\x12\x15\n\rforecast_type\x18\x01 \x01(\t\x12\x17\n\x0f\x66orecast_period\x18\x02 \x01(\t\x12=\n\x07seasons\x18\x03 \x03(\x0b\x32,.predictions.SeasonalProduction.SeasonsEntry\x1aG\n\x0cSeasonsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.predictions.SeasonData:\x02\x38\x01\"j\n\nSeasonData\x12\x14\n\x0cmonths_count\x18\x01 \x01(\x05\x12\x18\n\x10total_production\x18\x02 \x01(\x01\x12,\n\x06months\x18\x03 \x03(\x0b\x32\x1c.predictions.MonthProduction\"4\n\x0fMonthProduction\x12\r\n\x05month\x18\x01 \x01(\t\x12\x12\n\nproduction\x18\x02 \x01(\x01\"\xd6\x01\n\tModelInfo\x12\x12\n\nmodel_type\x18\x01 \x01(\t\x12\x1a\n\x12\x66orecast_generated\x18\x02 \x01(\t\x12<\n\x13performance_metrics\x18\x03 \x01(\x0b\x32\x1f.predictions.PerformanceMetrics\x12\x10\n\x08model_id\x18\x04 \x01(\t\x12\x17\n\x0fload_latency_ms\x18\x05 \x01(\x01\x12\x17\n\x0f\x63\x61\x63he_hit_ratio\x18\x06 \x01(\x01\x12\x17\n\x0fresident_models\x18\x07 \x03(\t\"\xa1\x01\n\x12PerformanceMetrics\x12\x10\n\x08test_mae\x18\x01 \x01(\x01\x12\x11\n\ttest_rmse\x18\x02 \x01(\x01\x12\x15\n\rtest_r2_score\x18\x03 \x01(\x01\x12\x15\n\rtest_accuracy\x18\x04 \x01(\x01\x12\x1b\n\x13validation_r2_score\x18\x05 \x01(\x01\x12\x1b\n\x13validation_accuracy\x18\x06 \x01(\x01\"\xa5\x01\n\x07Summary\x12\x1b\n\x13\x64\x61ily_forecast_days\x18\x01 \x01(\x05\x12\"\n\x1amonthly_6_total_production\x18\x02 \x01(\x01\x12#\n\x1bmonthly_12_total_production\x18\x03 \x01(\x01\x12\x19\n\x11maha_season_total\x18\x04 \x01(\x01\x12\x19\n\x11yala_season_total\x18\x05 \x01(\x01\"\x84\x01\n\x15\x46orecastExportRequest\x12\x30\n\x08requests\x18\x01 \x03(\x0b\x32\x1e.predictions.PredictionRequest\x12\x0e\n\x06tables\x18\x02 \x03(\t\x12\x12\n\nchunk_size\x18\x03 \x01(\x05\x12\x15\n\rshared_memory\x18\x04 \x01(\x08\"k\n\x10\x41rrowRecordBatch\x12\r\n\x05table\x18\x01 \x01(\t\x12\x12\n\nipc_stream\x18\x02 \x01(\x0c\x12\x10\n\x08num_rows\x18\x03 \x01(\x05\x12\x10\n\x08shm_name\x18\x04 \x01(\t\x12\x10\n\x08shm_size\x18\x05 \x01(\x03\"\xa9\x01\n\x12LiveForecastUpdate\x12\x0f\n\x07site_id\x18\x01 \x01(\t\x12\x12\n\nstart_date\x18\x02 \x01(\t\x12\x15\n\rforecast_days\x18\x03 \x01(\x05\x12\x32\n\x0e\x63urrent_values\x18\x04 \x01(\x0b\x32\x1a.predictions.CurrentValues\x12\x10\n\x08model_id\x18\x05 \x01(\t\x12\x11\n\ttolerance\x18\x06 \x01(\x01\"\xae\x01\n\x11LiveForecastDelta\x12\x0f\n\x07site_id\x18\x01 \x01(\t\x12\x17\n\x0fupdate_sequence\x18\x02 \x01(\x03\x12\x1b\n\x13\x66orecast_start_date\x18\x03 \x01(\t\x12\x12\n\ntotal_days\x18\x04 \x01(\x05\x12\x0c\n\x04\x66ull\x18\x05 \x01(\x08\x12\x30\n\x0c\x63hanged_days\x18\x06 \x03(\x0b\x32\x1a.predictions.DailyForecast2\xcb\x03\n\x12PredictionsService\x12Q\n\x0eGetPredictions\x12\x1e.predictions.PredictionRequest\x1a\x1f.predictions.PredictionResponse\x12\\\n\x0f\x41\x64vanceForecast\x12#.predictions.AdvanceForecastRequest\x1a$.predictions.AdvanceForecastResponse\x12W\n\x0eSweepScenarios\x12!.predictions.ScenarioSweepRequest\x1a\".predictions.ScenarioSweepResponse\x12V\n\x0f\x45xportForecasts\x12\".predictions.ForecastExportRequest\x1a\x1d.predictions.ArrowRecordBatch0\x01\x12S\n\x0cLiveForecast\x12\x1f.predictions.LiveForecastUpdate\x1a\x1e.predictions.LiveForecastDelta(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'predictions_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_SCENARIO_DELTASENTRY']._loaded_options = None
+  _globals['_SCENARIO_DELTASENTRY']._serialized_options = b'8\001'
+  _globals['_SCENARIOSUMMARY_DELTASENTRY']._loaded_options = None
+  _globals['_SCENARIOSUMMARY_DELTASENTRY']._serialized_options = b'8\001'
+  _globals['_SCENARIOSUMMARY_SEASONALTOTALSENTRY']._loaded_options = None
+  _globals['_SCENARIOSUMMARY_SEASONALTOTALSENTRY']._serialized_options = b'8\001'
   _globals['_SEASONALPRODUCTION_SEASONSENTRY']._loaded_options = None
   _globals['_SEASONALPRODUCTION_SEASONSENTRY']._serialized_options = b'8\001'
-  _globals['_PREDICTIONREQUEST']._serialized_start=34
-  _globals['_PREDICTIONREQUEST']._serialized_end=148
-  _globals['_CURRENTVALUES']._serialized_start=151
-  _globals['_CURRENTVALUES']._serialized_end=348
-  _globals['_PREDICTIONRESPONSE']._serialized_start=351
-  _globals['_PREDICTIONRESPONSE']._serialized_end=758
-  _globals['_DAILYPARAMETERSFORECAST']._serialized_start=761
-  _globals['_DAILYPARAMETERSFORECAST']._serialized_end=932
-  _globals['_DAILYFORECAST']._serialized_start=935
-  _globals['_DAILYFORECAST']._serialized_end=1068
-  _globals['_PARAMETERS']._serialized_start=1071
-  _globals['_PARAMETERS']._serialized_end=1265
-  _globals['_WEATHER']._serialized_start=1268
-  _globals['_WEATHER']._serialized_end=1451
-  _globals['_MONTHLYPRODUCTIONFORECAST']._serialized_start=1454
-  _globals['_MONTHLYPRODUCTIONFORECAST']._serialized_end=1684
-  _globals['_MONTHLYFORECAST']._serialized_start=1687
-  _globals['_MONTHLYFORECAST']._serialized_end=1828
-  _globals['_SEASONALPRODUCTION']._serialized_start=1831
-  _globals['_SEASONALPRODUCTION']._serialized_end=2035
-  _globals['_SEASONALPRODUCTION_SEASONSENTRY']._serialized_start=1964
-  _globals['_SEASONALPRODUCTION_SEASONSENTRY']._serialized_end=2035
-  _globals['_SEASONDATA']._serialized_start=2037
-  _globals['_SEASONDATA']._serialized_end=2143
-  _globals['_MONTHPRODUCTION']._serialized_start=2145
-  _globals['_MONTHPRODUCTION']._serialized_end=2197
-  _globals['_MODELINFO']._serialized_start=2199
-  _globals['_MODELINFO']._serialized_end=2320
-  _globals['_PERFORMANCEMETRICS']._serialized_start=2323
-  _globals['_PERFORMANCEMETRICS']._serialized_end=2484
-  _globals['_SUMMARY']._serialized_start=2487
-  _globals['_SUMMARY']._serialized_end=2652
-  _globals['_PREDICTIONSSERVICE']._serialized_start=2654
-  _globals['_PREDICTIONSSERVICE']._serialized_end=2757
+  _globals['_PREDICTIONREQUEST']._serialized_start=35
+  _globals['_PREDICTIONREQUEST']._serialized_end=245
+  _globals['_ADVANCEFORECASTREQUEST']._serialized_start=248
+  _globals['_ADVANCEFORECASTREQUEST']._serialized_end=384
+  _globals['_ADVANCEFORECASTRESPONSE']._serialized_start=386
+  _globals['_ADVANCEFORECASTRESPONSE']._serialized_end=510
+  _globals['_SCENARIOSWEEPREQUEST']._serialized_start=513
+  _globals['_SCENARIOSWEEPREQUEST']._serialized_end=728
+  _globals['_PARAMETERGRID']._serialized_start=730
+  _globals['_PARAMETERGRID']._serialized_end=780
+  _globals['_SCENARIO']._serialized_start=782
+  _globals['_SCENARIO']._serialized_end=904
+  _globals['_SCENARIO_DELTASENTRY']._serialized_start=859
+  _globals['_SCENARIO_DELTASENTRY']._serialized_end=904
+  _globals['_SCENARIOSWEEPRESPONSE']._serialized_start=907
+  _globals['_SCENARIOSWEEPRESPONSE']._serialized_end=1110
+  _globals['_SCENARIOSUMMARY']._serialized_start=1113
+  _globals['_SCENARIOSUMMARY']._serialized_end=1459
+  _globals['_SCENARIOSUMMARY_DELTASENTRY']._serialized_start=859
+  _globals['_SCENARIOSUMMARY_DELTASENTRY']._serialized_end=904
+  _globals['_SCENARIOSUMMARY_SEASONALTOTALSENTRY']._serialized_start=1406
+  _globals['_SCENARIOSUMMARY_SEASONALTOTALSENTRY']._serialized_end=1459
+  _globals['_SENSITIVITY']._serialized_start=1461
+  _globals['_SENSITIVITY']._serialized_end=1542
+  _globals['_CURRENTVALUES']._serialized_start=1545
+  _globals['_CURRENTVALUES']._serialized_end=1742
+  _globals['_PREDICTIONRESPONSE']._serialized_start=1745
+  _globals['_PREDICTIONRESPONSE']._serialized_end=2191
+  _globals['_DAILYPARAMETERSFORECAST']._serialized_start=2194
+  _globals['_DAILYPARAMETERSFORECAST']._serialized_end=2365
+  _globals['_DAILYFORECAST']._serialized_start=2368
+  _globals['_DAILYFORECAST']._serialized_end=2501
+  _globals['_PARAMETERS']._serialized_start=2504
+  _globals['_PARAMETERS']._serialized_end=2698
+  _globals['_WEATHER']._serialized_start=2701
+  _globals['_WEATHER']._serialized_end=2884
+  _globals['_MONTHLYPRODUCTIONFORECAST']._serialized_start=2887
+  _globals['_MONTHLYPRODUCTIONFORECAST']._serialized_end=3117
+  _globals['_MONTHLYFORECAST']._serialized_start=3120
+  _globals['_MONTHLYFORECAST']._serialized_end=3261
+  _globals['_SEASONALPRODUCTION']._serialized_start=3264
+  _globals['_SEASONALPRODUCTION']._serialized_end=3468
+  _globals['_SEASONALPRODUCTION_SEASONSENTRY']._serialized_start=3397
+  _globals['_SEASONALPRODUCTION_SEASONSENTRY']._serialized_end=3468
+  _globals['_SEASONDATA']._serialized_start=3470
+  _globals['_SEASONDATA']._serialized_end=3576
+  _globals['_MONTHPRODUCTION']._serialized_start=3578
+  _globals['_MONTHPRODUCTION']._serialized_end=3630
+  _globals['_MODELINFO']._serialized_start=3633
+  _globals['_MODELINFO']._serialized_end=3847
+  _globals['_PERFORMANCEMETRICS']._serialized_start=3850
+  _globals['_PERFORMANCEMETRICS']._serialized_end=4011
+  _globals['_SUMMARY']._serialized_start=4014
+  _globals['_SUMMARY']._serialized_end=4179
+  _globals['_FORECASTEXPORTREQUEST']._serialized_start=4182
+  _globals['_FORECASTEXPORTREQUEST']._serialized_end=4314
+  _globals['_ARROWRECORDBATCH']._serialized_start=4316
+  _globals['_ARROWRECORDBATCH']._serialized_end=4423
+  _globals['_LIVEFORECASTUPDATE']._serialized_start=4426
+  _globals['_LIVEFORECASTUPDATE']._serialized_end=4595
+  _globals['_LIVEFORECASTDELTA']._serialized_start=4598
+  _globals['_LIVEFORECASTDELTA']._serialized_end=4772
+  _globals['_PREDICTIONSSERVICE']._serialized_start=4775
+  _globals['_PREDICTIONSSERVICE']._serialized_end=5234
 # @@protoc_insertion_point(module_scope)
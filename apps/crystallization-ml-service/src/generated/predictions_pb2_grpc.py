@@ -39,6 +39,26 @@ class PredictionsServiceStub(object):
                 request_serializer=predictions__pb2.PredictionRequest.SerializeToString,
                 response_deserializer=predictions__pb2.PredictionResponse.FromString,
                 _registered_method=True)
+        self.AdvanceForecast = channel.unary_unary(
+                '/predictions.PredictionsService/AdvanceForecast',
+                request_serializer=predictions__pb2.AdvanceForecastRequest.SerializeToString,
+                response_deserializer=predictions__pb2.AdvanceForecastResponse.FromString,
+                _registered_method=True)
+        self.SweepScenarios = channel.unary_unary(
+                '/predictions.PredictionsService/SweepScenarios',
+                request_serializer=predictions__pb2.ScenarioSweepRequest.SerializeToString,
+                response_deserializer=predictions__pb2.ScenarioSweepResponse.FromString,
+                _registered_method=True)
+        self.ExportForecasts = channel.unary_stream(
+                '/predictions.PredictionsService/ExportForecasts',
+                request_serializer=predictions__pb2.ForecastExportRequest.SerializeToString,
+                response_deserializer=predictions__pb2.ArrowRecordBatch.FromString,
+                _registered_method=True)
+        self.LiveForecast = channel.stream_stream(
+                '/predictions.PredictionsService/LiveForecast',
+                request_serializer=predictions__pb2.LiveForecastUpdate.SerializeToString,
+                response_deserializer=predictions__pb2.LiveForecastDelta.FromString,
+                _registered_method=True)
 
 
 class PredictionsServiceServicer(object):
@@ -50,6 +70,30 @@ class PredictionsServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AdvanceForecast(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SweepScenarios(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExportForecasts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def LiveForecast(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_PredictionsServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +102,26 @@ def add_PredictionsServiceServicer_to_server(servicer, server):
                     request_deserializer=predictions__pb2.PredictionRequest.FromString,
                     response_serializer=predictions__pb2.PredictionResponse.SerializeToString,
             ),
+            'AdvanceForecast': grpc.unary_unary_rpc_method_handler(
+                    servicer.AdvanceForecast,
+                    request_deserializer=predictions__pb2.AdvanceForecastRequest.FromString,
+                    response_serializer=predictions__pb2.AdvanceForecastResponse.SerializeToString,
+            ),
+            'SweepScenarios': grpc.unary_unary_rpc_method_handler(
+                    servicer.SweepScenarios,
+                    request_deserializer=predictions__pb2.ScenarioSweepRequest.FromString,
+                    response_serializer=predictions__pb2.ScenarioSweepResponse.SerializeToString,
+            ),
+            'ExportForecasts': grpc.unary_stream_rpc_method_handler(
+                    servicer.ExportForecasts,
+                    request_deserializer=predictions__pb2.ForecastExportRequest.FromString,
+                    response_serializer=predictions__pb2.ArrowRecordBatch.SerializeToString,
+            ),
+            'LiveForecast': grpc.stream_stream_rpc_method_handler(
+                    servicer.LiveForecast,
+                    request_deserializer=predictions__pb2.LiveForecastUpdate.FromString,
+                    response_serializer=predictions__pb2.LiveForecastDelta.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'predictions.PredictionsService', rpc_method_handlers)
@@ -95,3 +159,111 @@ class PredictionsService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def AdvanceForecast(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/predictions.PredictionsService/AdvanceForecast',
+            predictions__pb2.AdvanceForecastRequest.SerializeToString,
+            predictions__pb2.AdvanceForecastResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SweepScenarios(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/predictions.PredictionsService/SweepScenarios',
+            predictions__pb2.ScenarioSweepRequest.SerializeToString,
+            predictions__pb2.ScenarioSweepResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExportForecasts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/predictions.PredictionsService/ExportForecasts',
+            predictions__pb2.ForecastExportRequest.SerializeToString,
+            predictions__pb2.ArrowRecordBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def LiveForecast(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/predictions.PredictionsService/LiveForecast',
+            predictions__pb2.LiveForecastUpdate.SerializeToString,
+            predictions__pb2.LiveForecastDelta.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
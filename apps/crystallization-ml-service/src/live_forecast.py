@@ -0,0 +1,136 @@
+"""
+Live forecasts for continuous sensor feeds.
+
+A LiveForecast stream carries CurrentValues updates for one site. The
+session behind it keeps the rollout it last sent in memory, so an update only
+re-rolls the model from the new values and pushes the forecast days whose
+parameters moved by more than the tolerance since they were last sent.
+
+Live rollouts are deterministic: no noise is added, and the session draws its
+weather once, so a day only changes because the inputs did. The first update,
+and any update that changes the start date, horizon or model (or arrives after
+the model artifact was replaced), resets the session and sends the whole
+forecast. An update whose values equal the last ones is not rolled out at all.
+
+Environment:
+    LIVE_TOLERANCE    largest change of a day's parameters that is not pushed (0.05)
+"""
+import os
+import logging
+from datetime import timedelta
+
+import numpy as np
+from dateutil import parser
+
+from ml_predictor import PARAMETER_NAMES, WEATHER_NAMES
+from service_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSessionError(ValueError):
+    """Raised when a live update cannot be applied to the session"""
+
+
+class LiveSession:
+    """In-memory rollout state of one LiveForecast stream"""
+
+    def __init__(self, predictor, default_tolerance=None):
+        self.predictor = predictor
+        if default_tolerance is None:
+            default_tolerance = float(os.getenv('LIVE_TOLERANCE', '0.05'))
+        self.default_tolerance = default_tolerance
+        self.site_id = None
+        self.sequence = 0
+        self._key = None
+        self._start_dt = None
+        self._inputs = None
+        self._weather = None
+        self._sent = None
+
+    def update(self, site_id, start_date, forecast_days, current_values, model_id=None, tolerance=None,
+               cancellation=None):
+        """
+        Apply one sensor update
+
+        Args:
+            site_id: Site the stream reports for; fixed by the first update
+            start_date: First forecast day (string)
+            forecast_days: Days to forecast
+            current_values: Dictionary with current parameter values
+            model_id: Model to predict with; the default model when empty
+            tolerance: Largest parameter change of a day that is not pushed;
+                LIVE_TOLERANCE when not given
+            cancellation: Optional CancellationToken
+
+        Returns:
+            Dictionary with the update sequence number, whether the forecast was
+            reset, and the changed days as daily forecast dictionaries
+        """
+        if not site_id:
+            raise LiveSessionError("Live updates need a site_id")
+        if self.site_id is not None and site_id != self.site_id:
+            raise LiveSessionError(f"Stream is for site '{self.site_id}', got an update for '{site_id}'")
+        if not 1 <= forecast_days <= self.predictor.max_forecast_days:
+            raise LiveSessionError(f"forecast_days must be between 1 and {self.predictor.max_forecast_days}")
+        self.site_id = site_id
+        self.sequence += 1
+        tolerance = self.default_tolerance if tolerance is None else tolerance
+
+        slot = self.predictor.model_slot(model_id)
+        try:
+            start_dt = parser.parse(start_date)
+        except (ValueError, OverflowError):
+            raise LiveSessionError(f"Invalid start_date '{start_date}'")
+        inputs = self.predictor.parameter_vector(current_values)
+        key = (slot.model_id, slot.version, start_dt, forecast_days)
+
+        full = key != self._key
+        if full:
+            weather = self.predictor.simulated_weather(forecast_days)
+        elif np.array_equal(inputs, self._inputs):
+            metrics.increment('live.unchanged_updates')
+            return self._delta(full, [])
+        else:
+            weather = self._weather
+
+        parameters = self.predictor.deterministic_rollout(
+            slot, inputs, forecast_days, weather, cancellation=cancellation
+        )
+
+        # The session only changes once the rollout has completed
+        self._inputs = inputs
+        if full:
+            logger.info(f"Live forecast for site '{site_id}' reset to {forecast_days} days from {start_date}")
+            self._key, self._start_dt, self._weather, self._sent = key, start_dt, weather, parameters
+            changed = list(range(forecast_days))
+        else:
+            changed = np.flatnonzero(np.abs(parameters - self._sent).max(axis=1) > tolerance).tolist()
+            self._sent[changed] = parameters[changed]
+
+        if self.predictor.state_store is not None:
+            self.predictor.state_store.save(
+                site_id, slot.model_id, start_dt, parameters, self._weather, observed_values=inputs
+            )
+        metrics.increment('live.days_sent', len(changed))
+        return self._delta(full, changed)
+
+    def _delta(self, full, changed):
+        metrics.increment('live.updates')
+        return {
+            'site_id': self.site_id,
+            'update_sequence': self.sequence,
+            'forecast_start_date': self._start_dt.strftime('%Y-%m-%d'),
+            'total_days': len(self._sent),
+            'full': full,
+            'changed_days': [
+                {
+                    'date': (self._start_dt + timedelta(days=day)).strftime('%Y-%m-%d'),
+                    'day_number': day + 1,
+                    'parameters': dict(zip(PARAMETER_NAMES, self._sent[day].tolist())),
+                    'weather': dict(zip(WEATHER_NAMES, self._weather[day].tolist()))
+                }
+                for day in changed
+            ]
+        }
+
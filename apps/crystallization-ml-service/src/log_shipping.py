@@ -0,0 +1,415 @@
+"""
+Non-blocking log output and batched shipping to the central logs service.
+
+`configure_logging` replaces `logging.basicConfig` for the service. Request
+threads only put records on a bounded queue (BoundedQueueHandler); a listener
+thread formats them to stdout and hands them to the LogShipper, whose own
+thread sends them to LogsService.CreateLog (proto/logs.proto) in batches. A
+full queue drops records per LOG_DROP_POLICY instead of blocking a request.
+
+The logs service takes one entry per CreateLog call, so a batch is sent as
+concurrent calls over one channel and awaited together. Entries of a batch
+that could not be delivered, or that the service answered without success,
+are appended to a local spill file as JSON lines. The spill file is replayed
+every flush interval once the service is not backing off; while it is at
+LOG_SPILL_MAX_MB further failed entries are dropped.
+
+Structured fields passed as `extra=` (see STRUCTURED_FIELDS) are included in
+each entry's JSON details, e.g.
+
+    logger.info("Prediction completed", extra={'rpc': 'GetPredictions', 'latency_ms': 12.5})
+
+Environment:
+    LOGS_SERVICE_URL            host:port of the logs service; shipping is off when empty
+    LOG_SHIPPING_LEVEL          lowest level shipped (INFO)
+    LOG_QUEUE_SIZE              records buffered between request threads and the listener (10000)
+    LOG_DROP_POLICY             drop_oldest or drop_newest when the queue is full (drop_oldest)
+    LOG_BATCH_SIZE              entries per shipped batch (100)
+    LOG_FLUSH_INTERVAL_SECONDS  longest time an entry waits for its batch (2)
+    LOG_SHIP_TIMEOUT_SECONDS    deadline of a batch's CreateLog calls (5)
+    LOG_SPILL_PATH              spill file for undelivered entries (data/log_spill.jsonl)
+    LOG_SPILL_MAX_MB            largest spill file (50)
+
+Usage (a local logs service stub that prints what it receives):
+    python log_shipping.py stub --port 50056
+"""
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import argparse
+import logging
+import threading
+import logging.handlers
+from concurrent import futures
+from datetime import datetime
+
+import grpc
+
+from service_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Record attributes (set with extra=) copied into the shipped details
+STRUCTURED_FIELDS = [
+    'rpc', 'site_id', 'model_id', 'model_version', 'horizon_days', 'horizon_mode', 'latency_ms',
+    'status', 'forecast_version', 'batches', 'updates'
+]
+
+DROP_POLICIES = ('drop_oldest', 'drop_newest')
+
+# Longest pause in shipping after the logs service failed a batch
+MAX_RETRY_DELAY_SECONDS = 60.0
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the logging thread
+
+    When the queue is full the oldest queued record (drop_oldest) or the new
+    record (drop_newest) is discarded and counted in logs.dropped.
+    """
+
+    def __init__(self, log_queue, drop_policy='drop_oldest'):
+        super().__init__(log_queue)
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown log drop policy '{drop_policy}'. Valid policies: {', '.join(DROP_POLICIES)}")
+        self.drop_policy = drop_policy
+
+    def prepare(self, record):
+        # Records stay in process, so formatting (and rendering exc_info) is
+        # left to the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            metrics.increment('logs.dropped')
+            if self.drop_policy == 'drop_newest':
+                return
+        try:
+            self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment('logs.dropped')
+
+
+class LogShipper(logging.Handler):
+    """Ships records to LogsService.CreateLog in batches from a background thread"""
+
+    def __init__(self, target, service_name, batch_size=100, flush_interval=2.0, timeout=5.0,
+                 spill_path='data/log_spill.jsonl', spill_max_bytes=50 * 1024 * 1024, level=logging.INFO):
+        super().__init__(level)
+        import logs_pb2
+        import logs_pb2_grpc
+        self._logs_pb2 = logs_pb2
+        self.target = target
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self._channel = grpc.insecure_channel(target)
+        self._stub = logs_pb2_grpc.LogsServiceStub(self._channel)
+        self._pending = []
+        self._condition = threading.Condition()
+        # Serializes spill file appends with each other and with replay's rename
+        self._spill_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='log-shipper', daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            entry = self._entry(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._condition:
+            self._pending.append(entry)
+            overflow = len(self._pending) - 10 * self.batch_size
+            if overflow > 0:
+                # The service is slower than the log rate: keep the newest
+                # entries in memory and spill the rest
+                spilled, self._pending = self._pending[:overflow], self._pending[overflow:]
+            else:
+                spilled = None
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+        if spilled:
+            self._spill(spilled)
+
+    def _entry(self, record):
+        """CreateLogRequest fields of a record, as a JSON-serializable dictionary"""
+        details = {
+            'message': record.getMessage(),
+            'level': record.levelname,
+            'logger': record.name,
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                details[field] = value
+        if record.exc_info:
+            details['exception'] = logging.Formatter().formatException(record.exc_info)
+        if record.levelno >= logging.ERROR:
+            status = 'error'
+        elif record.levelno >= logging.WARNING:
+            status = 'warning'
+        else:
+            status = 'success'
+        return {
+            'service_name': self.service_name,
+            'action': getattr(record, 'rpc', None) or record.name,
+            'resource_id': str(getattr(record, 'site_id', '') or ''),
+            'resource_type': 'forecast',
+            'details': json.dumps(details, default=str),
+            'status': status,
+        }
+
+    def _run(self):
+        retry_delay = 0.0
+        retry_at = 0.0
+        while True:
+            with self._condition:
+                if len(self._pending) < self.batch_size and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                closed = self._closed
+            if batch and time.monotonic() < retry_at and not closed:
+                # The service failed recently; don't wait on it again yet
+                self._spill(batch)
+                continue
+            delivered = True
+            if batch:
+                failed = self._send(batch)
+                if failed:
+                    self._spill(failed)
+                    delivered = False
+            # Spilled entries are retried on every flush interval, not only
+            # after live traffic got through
+            if delivered and time.monotonic() >= retry_at:
+                delivered = self._replay_spill()
+            if delivered:
+                retry_delay = 0.0
+            else:
+                retry_delay = min(max(2 * retry_delay, self.flush_interval), MAX_RETRY_DELAY_SECONDS)
+                retry_at = time.monotonic() + retry_delay
+            if closed and not batch:
+                return
+
+    def _send(self, entries):
+        """Send entries as concurrent CreateLog calls; returns the entries that failed or were rejected"""
+        started = time.perf_counter()
+        calls = [
+            (entry, self._stub.CreateLog.future(self._logs_pb2.CreateLogRequest(**entry), timeout=self.timeout))
+            for entry in entries
+        ]
+        failed = []
+        rejected = 0
+        for entry, call in calls:
+            try:
+                if not call.result().success:
+                    rejected += 1
+                    failed.append(entry)
+            except grpc.RpcError:
+                failed.append(entry)
+        metrics.increment('logs.shipped', len(entries) - len(failed))
+        metrics.observe('logs.batch_ms', (time.perf_counter() - started) * 1000.0)
+        if failed:
+            metrics.increment('logs.failed', len(failed))
+        if rejected:
+            metrics.increment('logs.rejected', rejected)
+        return failed
+
+    def _spill(self, entries):
+        """Append undelivered entries to the spill file, dropping them when it is full"""
+        try:
+            with self._spill_lock:
+                size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+                if size >= self.spill_max_bytes:
+                    metrics.increment('logs.dropped', len(entries))
+                    return
+                directory = os.path.dirname(self.spill_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.spill_path, 'a', encoding='utf-8') as spill:
+                    for entry in entries:
+                        spill.write(json.dumps(entry) + '\n')
+            metrics.increment('logs.spilled', len(entries))
+        except OSError as e:
+            metrics.increment('logs.dropped', len(entries))
+            sys.stderr.write(f"Could not spill {len(entries)} log entries to {self.spill_path}: {str(e)}\n")
+
+    def _replay_spill(self):
+        """
+        Send spilled entries, including a replay file a previous attempt left
+
+        Lines that are not valid entries are skipped and counted in
+        logs.dropped. Returns False when the service failed entries, which
+        are spilled again.
+        """
+        replaying = f'{self.spill_path}.replay'
+        try:
+            with self._spill_lock:
+                if os.path.exists(self.spill_path) and not os.path.exists(replaying):
+                    os.replace(self.spill_path, replaying)
+            if not os.path.exists(replaying):
+                return True
+            entries = []
+            skipped = 0
+            with open(replaying, encoding='utf-8') as spill:
+                for line in spill:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        self._logs_pb2.CreateLogRequest(**entry)
+                    except (ValueError, TypeError):
+                        skipped += 1
+                        continue
+                    entries.append(entry)
+            os.remove(replaying)
+        except OSError as e:
+            sys.stderr.write(f"Could not replay spilled log entries from {self.spill_path}: {str(e)}\n")
+            return True
+        if skipped:
+            metrics.increment('logs.dropped', skipped)
+            sys.stderr.write(f"Skipped {skipped} malformed spilled log entries from {self.spill_path}\n")
+        replayed = 0
+        for start in range(0, len(entries), self.batch_size):
+            batch = entries[start:start + self.batch_size]
+            failed = self._send(batch)
+            replayed += len(batch) - len(failed)
+            if failed:
+                self._spill(failed + entries[start + self.batch_size:])
+                break
+        metrics.increment('logs.replayed', replayed)
+        return replayed == len(entries)
+
+    def flush(self):
+        with self._condition:
+            self._condition.notify()
+
+    def close(self):
+        """Ship what is pending and stop the shipper thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(self.timeout + self.flush_interval)
+        self._channel.close()
+        super().close()
+
+
+def configure_logging(service_name, level=logging.INFO, stream=sys.stdout):
+    """
+    Route the root logger through a bounded queue to stdout and, when
+    LOGS_SERVICE_URL is set, to the logs service
+
+    Returns:
+        The QueueListener draining the queue (stopped at exit)
+    """
+    log_queue = queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', '10000')))
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers = [stream_handler]
+
+    target = os.getenv('LOGS_SERVICE_URL', '')
+    if target:
+        try:
+            handlers.append(LogShipper(
+                target, service_name,
+                batch_size=int(os.getenv('LOG_BATCH_SIZE', '100')),
+                flush_interval=float(os.getenv('LOG_FLUSH_INTERVAL_SECONDS', '2')),
+                timeout=float(os.getenv('LOG_SHIP_TIMEOUT_SECONDS', '5')),
+                spill_path=os.getenv('LOG_SPILL_PATH', 'data/log_spill.jsonl'),
+                spill_max_bytes=int(float(os.getenv('LOG_SPILL_MAX_MB', '50')) * 1024 * 1024),
+                level=logging.getLevelName(os.getenv('LOG_SHIPPING_LEVEL', 'INFO').upper())
+            ))
+        except ImportError:
+            sys.stderr.write("Log shipping disabled: logs_pb2 not generated. Please run generate_proto.bat/sh first.\n")
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(BoundedQueueHandler(log_queue, os.getenv('LOG_DROP_POLICY', 'drop_oldest')))
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    def shutdown():
+        listener.stop()
+        for handler in handlers:
+            handler.close()
+
+    atexit.register(shutdown)
+    if target and len(handlers) > 1:
+        logger.info(f"Shipping logs to {target}")
+    return listener
+
+
+def serve_stub(port, out=sys.stdout):
+    """
+    Start a LogsService stub on port that prints each CreateLog entry
+
+    Returns:
+        The server; `server.service.received` counts the stored entries,
+        setting `server.service.accepting` to False answers CreateLog without
+        success, and `server.port` is the bound port (useful with port 0)
+    """
+    import logs_pb2
+    import logs_pb2_grpc
+
+    class StubLogsService(logs_pb2_grpc.LogsServiceServicer):
+        def __init__(self):
+            self.received = 0
+            self.accepting = True
+            self._lock = threading.Lock()
+
+        def CreateLog(self, request, context):
+            if not self.accepting:
+                return logs_pb2.CreateLogResponse(success=False, message='rejected')
+            with self._lock:
+                self.received += 1
+                log_id = str(self.received)
+            out.write(f"[{request.service_name}] {request.status} {request.action} {request.details}\n")
+            return logs_pb2.CreateLogResponse(success=True, message='stored', log_id=log_id)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server.service = StubLogsService()
+    logs_pb2_grpc.add_LogsServiceServicer_to_server(server.service, server)
+    server.port = server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Log shipping tools')
+    parser.add_argument('command', choices=['stub'])
+    parser.add_argument('--port', type=int, default=50056, help='port of the stub logs service')
+    args = parser.parse_args()
+
+    server = serve_stub(args.port)
+    print(f'Logs service stub listening on port {args.port}')
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.stop(0)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generated'))
+    sys.exit(main())
@@ -4,6 +4,9 @@ import sys
 import os
 from dotenv import load_dotenv
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Add the generated directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'generated'))
@@ -14,22 +17,26 @@ try:
     import predictions_pb2_grpc
     proto_loaded = True
 except ImportError:
-    print("Warning: Generated proto files not found. Please run generate_proto.bat/sh first.")
+    logger.warning("Generated proto files not found. Please run generate_proto.bat/sh first.")
     proto_loaded = False
 
 # Import the prediction service
 try:
     from prediction_service import PredictionService
 except ImportError:
-    print("Warning: prediction_service not found in the same directory")
+    logger.warning("prediction_service not found in the same directory")
     PredictionService = None
 
+from response_compression import CompressionPolicy, add_uds_listener, grpc_server_options
+from log_shipping import configure_logging
+
 load_dotenv()
 
 if proto_loaded:
     class PredictionsServicer(predictions_pb2_grpc.PredictionsServiceServicer):
         def __init__(self):
             self.prediction_service = PredictionService() if PredictionService else None
+            self.compression = CompressionPolicy.from_env()
 
         def _convert_to_proto_response(self, result):
             """Convert dictionary result to protobuf PredictionResponse"""
@@ -179,35 +186,40 @@ if proto_loaded:
                 )
                 
                 # Convert result to protobuf response
-                return self._convert_to_proto_response(result)
+                response = self._convert_to_proto_response(result)
+                self.compression.apply(context, response)
+                return response
                 
             except Exception as e:
+                logger.error(f"Error during prediction: {str(e)}", exc_info=True, extra={'rpc': 'GetPredictions'})
                 context.set_code(grpc.StatusCode.INTERNAL)
                 context.set_details(str(e))
                 return predictions_pb2.PredictionResponse(status='error')
 
 def serve():
+    configure_logging('crystallization-ml-service')
     if not proto_loaded:
-        print("Cannot start server: Proto files not generated")
-        print("Please run: generate_proto.bat (Windows) or generate_proto.sh (Linux/Mac)")
+        logger.error("Cannot start server: Proto files not generated")
+        logger.error("Please run: generate_proto.bat (Windows) or generate_proto.sh (Linux/Mac)")
         return
     
     port = os.getenv('GRPC_PORT', '50057')
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=grpc_server_options())
     
     predictions_pb2_grpc.add_PredictionsServiceServicer_to_server(
         PredictionsServicer(), server
     )
     
     server.add_insecure_port(f'[::]:{port}')
+    add_uds_listener(server)
     server.start()
     
-    print(f'Crystallization ML Service is running on gRPC port {port}')
+    logger.info(f'Crystallization ML Service is running on gRPC port {port}')
     
     try:
         server.wait_for_termination()
     except KeyboardInterrupt:
-        print('Shutting down...')
+        logger.info('Shutting down...')
         server.stop(0)
 
 if __name__ == '__main__':
@@ -0,0 +1,317 @@
+"""
+Memory-mapped model format.
+
+A mapped model is a directory (conventionally `<model_id>.mmw`) holding:
+
+    architecture.json   Keras model config as written by `model.to_json()`
+    index.json          name, dtype, shape and byte offset of every weight
+    weights.bin         all weights back to back, each 64-byte aligned
+
+`load_mapped_model` maps `weights.bin` copy-on-write and hands out numpy views
+into the mapping, so every worker process that loads the same file shares the
+same physical pages. Supported architectures (chains of InputLayer, LSTM,
+Dense, Dropout and Flatten layers) run on a small numpy forward pass and never
+import TensorFlow. Anything else falls back to rebuilding the Keras model,
+which copies the weights into private TensorFlow variables.
+
+Usage:
+    python mapped_model.py export models/best_hybrid_model.keras models/best_hybrid_model.mmw
+"""
+import os
+import sys
+import json
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAPPED_MODEL_SUFFIX = '.mmw'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+ARCHITECTURE_FILE = 'architecture.json'
+INDEX_FILE = 'index.json'
+WEIGHTS_FILE = 'weights.bin'
+
+
+class UnsupportedArchitectureError(Exception):
+    """Raised when a model config cannot run on the numpy forward pass"""
+
+
+def is_mapped_model(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, INDEX_FILE))
+
+
+def export_mapped_model(model, out_dir):
+    """Write a Keras model in the memory-mapped format"""
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries = []
+    offset = 0
+    with open(os.path.join(out_dir, WEIGHTS_FILE), 'wb') as f:
+        for layer in model.layers:
+            for position, weight in enumerate(layer.get_weights()):
+                weight = np.ascontiguousarray(weight)
+                padding = -offset % ALIGNMENT
+                f.write(b'\0' * padding)
+                offset += padding
+                f.write(weight.tobytes())
+                entries.append({
+                    'layer': layer.name,
+                    'position': position,
+                    'dtype': weight.dtype.str,
+                    'shape': list(weight.shape),
+                    'offset': offset
+                })
+                offset += weight.nbytes
+
+    with open(os.path.join(out_dir, INDEX_FILE), 'w') as f:
+        json.dump({'format_version': FORMAT_VERSION, 'weights': entries}, f, indent=2)
+    with open(os.path.join(out_dir, ARCHITECTURE_FILE), 'w') as f:
+        f.write(model.to_json())
+
+    logger.info(f"Exported mapped model to {out_dir} ({offset} bytes of weights)")
+    return out_dir
+
+
+def load_mapped_model(path):
+    """
+    Load a mapped model directory.
+
+    Returns a MappedModel when the architecture is supported by the numpy
+    forward pass, otherwise a Keras model with the mapped weights copied in.
+    """
+    with open(os.path.join(path, INDEX_FILE)) as f:
+        index = json.load(f)
+    if index.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported mapped model format version {index.get('format_version')} in {path}")
+    with open(os.path.join(path, ARCHITECTURE_FILE)) as f:
+        architecture = json.load(f)
+
+    # Copy-on-write: pages stay shared with every other process mapping the
+    # file, and nothing this process does can write back to it.
+    buffer = np.memmap(os.path.join(path, WEIGHTS_FILE), dtype=np.uint8, mode='c')
+    layer_weights = {}
+    for entry in index['weights']:
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape']))
+        view = np.frombuffer(buffer, dtype=dtype, count=count, offset=entry['offset'])
+        layer_weights.setdefault(entry['layer'], []).append(view.reshape(entry['shape']))
+
+    try:
+        return MappedModel(architecture, layer_weights)
+    except UnsupportedArchitectureError as e:
+        logger.warning(f"{path}: {str(e)}; falling back to a Keras model with private weights")
+        from tensorflow import keras
+        model = keras.models.model_from_json(json.dumps(architecture))
+        for layer in model.layers:
+            if layer.name in layer_weights:
+                layer.set_weights(layer_weights[layer.name])
+        return model
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid(x):
+    return np.clip(x / 6.0 + 0.5, 0.0, 1.0)
+
+
+def _keras2_hard_sigmoid(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    None: lambda x: x,
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': _hard_sigmoid,
+    'relu': lambda x: np.maximum(x, 0.0),
+}
+# Keras 2 defined hard_sigmoid with a slope of 0.2 instead of 1/6
+KERAS2_ACTIVATIONS = dict(ACTIVATIONS, hard_sigmoid=_keras2_hard_sigmoid)
+
+
+def _activation(name, activations=ACTIVATIONS):
+    if isinstance(name, dict):
+        name = name.get('config', {}).get('name', name.get('class_name'))
+    if name not in activations:
+        raise UnsupportedArchitectureError(f"activation '{name}' is not supported")
+    return activations[name]
+
+
+def lstm_step(x_t, h, c, kernel, recurrent_kernel, bias, activation, recurrent_activation):
+    """One LSTM cell step with Keras gate order (input, forget, cell, output)"""
+    z = x_t @ kernel + h @ recurrent_kernel
+    if bias is not None:
+        z = z + bias
+    i, f, g, o = np.split(z, 4, axis=-1)
+    c = recurrent_activation(f) * c + recurrent_activation(i) * activation(g)
+    h = recurrent_activation(o) * activation(c)
+    return h, c
+
+
+class _LSTMLayer:
+    def __init__(self, config, weights, activations=ACTIVATIONS):
+        if config.get('go_backwards') or config.get('stateful') or config.get('return_state'):
+            raise UnsupportedArchitectureError(f"LSTM layer '{config['name']}' uses unsupported options")
+        self.units = config['units']
+        self.return_sequences = config.get('return_sequences', False)
+        self.activation = _activation(config.get('activation', 'tanh'), activations)
+        self.recurrent_activation = _activation(config.get('recurrent_activation', 'sigmoid'), activations)
+        self.kernel = weights[0]
+        self.recurrent_kernel = weights[1]
+        self.bias = weights[2] if config.get('use_bias', True) else None
+
+    def initial_state(self, batch_size, dtype):
+        zeros = np.zeros((batch_size, self.units), dtype=dtype)
+        return zeros, zeros.copy()
+
+    def __call__(self, x):
+        h, c = self.initial_state(x.shape[0], self.kernel.dtype)
+        outputs = []
+        for t in range(x.shape[1]):
+            h, c = lstm_step(
+                x[:, t, :], h, c, self.kernel, self.recurrent_kernel, self.bias,
+                self.activation, self.recurrent_activation
+            )
+            if self.return_sequences:
+                outputs.append(h)
+        return np.stack(outputs, axis=1) if self.return_sequences else h
+
+
+class _DenseLayer:
+    def __init__(self, config, weights, activations=ACTIVATIONS):
+        self.activation = _activation(config.get('activation'), activations)
+        self.kernel = weights[0]
+        self.bias = weights[1] if config.get('use_bias', True) else None
+
+    def __call__(self, x):
+        y = x @ self.kernel
+        if self.bias is not None:
+            y = y + self.bias
+        return self.activation(y)
+
+
+class _FlattenLayer:
+    def __init__(self, config, weights, activations=ACTIVATIONS):
+        pass
+
+    def __call__(self, x):
+        return x.reshape(x.shape[0], -1)
+
+
+class _IdentityLayer:
+    def __init__(self, config, weights, activations=ACTIVATIONS):
+        pass
+
+    def __call__(self, x):
+        return x
+
+
+LAYER_TYPES = {
+    'LSTM': _LSTMLayer,
+    'Dense': _DenseLayer,
+    'Flatten': _FlattenLayer,
+    'Dropout': _IdentityLayer,
+}
+
+
+def _inbound_layer_names(nodes):
+    """Names of the layers feeding a functional layer, for Keras 2 and 3 configs"""
+    names = []
+
+    def walk(node):
+        # Keras 2 nodes are [name, node_index, tensor_index, kwargs] lists;
+        # Keras 3 tensors carry the same [name, node_index, tensor_index] as
+        # their keras_history
+        if isinstance(node, dict):
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            if len(node) >= 3 and isinstance(node[0], str) and isinstance(node[1], int):
+                names.append(node[0])
+            else:
+                for value in node:
+                    walk(value)
+
+    walk(nodes)
+    return names
+
+
+class MappedModel:
+    """
+    Numpy inference over memory-mapped weights.
+
+    Exposes the subset of the Keras model API the predictor uses
+    (`predict`, `input_shape`, `weights`).
+    """
+
+    def __init__(self, architecture, layer_weights):
+        config = architecture.get('config', {})
+        layer_configs = config.get('layers', [])
+        if architecture.get('class_name') not in ('Sequential', 'Functional', 'Model'):
+            raise UnsupportedArchitectureError(f"model class '{architecture.get('class_name')}' is not supported")
+        self._check_chain(architecture.get('class_name'), layer_configs)
+        # Keras 2 configs record the version that wrote them; Keras 3 ones do not
+        keras2 = str(architecture.get('keras_version', '')).startswith('2.')
+        activations = KERAS2_ACTIVATIONS if keras2 else ACTIVATIONS
+
+        self.input_shape = None
+        self.layers = []
+        for layer_config in layer_configs:
+            class_name = layer_config['class_name']
+            layer_cfg = layer_config['config']
+            if class_name == 'InputLayer':
+                shape = layer_cfg.get('batch_shape') or layer_cfg.get('batch_input_shape')
+                self.input_shape = tuple(shape) if shape else None
+                continue
+            if class_name not in LAYER_TYPES:
+                raise UnsupportedArchitectureError(f"layer type '{class_name}' is not supported")
+            if self.input_shape is None and layer_cfg.get('batch_input_shape'):
+                self.input_shape = tuple(layer_cfg['batch_input_shape'])
+            weights = layer_weights.get(layer_cfg['name'], [])
+            self.layers.append(LAYER_TYPES[class_name](layer_cfg, weights, activations))
+
+        self.weights = [w for ws in layer_weights.values() for w in ws]
+
+    @staticmethod
+    def _check_chain(class_name, layer_configs):
+        """Functional models are only supported when they are a plain chain"""
+        if class_name == 'Sequential':
+            return
+        previous = None
+        for layer_config in layer_configs:
+            inbound = _inbound_layer_names(layer_config.get('inbound_nodes') or [])
+            if previous is not None and inbound != [previous]:
+                raise UnsupportedArchitectureError(
+                    f"layer '{layer_config['config']['name']}' is not part of a single-input chain"
+                )
+            previous = layer_config['config']['name']
+
+    def predict(self, x, verbose=0, batch_size=None):
+        x = np.asarray(x, dtype=self.weights[0].dtype if self.weights else np.float32)
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+    def __call__(self, x):
+        return self.predict(x)
+
+
+def main(argv):
+    if len(argv) != 4 or argv[1] != 'export':
+        print(__doc__)
+        return 1
+    from tensorflow import keras
+    model = keras.models.load_model(argv[2])
+    export_mapped_model(model, argv[3])
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main(sys.argv))
@@ -0,0 +1,166 @@
+import io
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Largest absolute difference between request inputs and the inputs a
+# materialized forecast was computed from that still counts as a match
+INPUT_MATCH_TOLERANCE = 1e-9
+
+
+class MaterializedForecast:
+    """A precomputed forecast for one site, start date, horizon, model version and horizon mode"""
+
+    def __init__(self, site_id, start_date, horizon, model_version, horizon_mode, model_id, arrays, created_at):
+        self.site_id = site_id
+        self.start_date = start_date
+        self.horizon = horizon
+        self.model_version = model_version
+        self.horizon_mode = horizon_mode
+        self.model_id = model_id
+        self.arrays = arrays
+        self.created_at = created_at
+
+    @property
+    def inputs(self):
+        return self.arrays['inputs']
+
+    @property
+    def parameters(self):
+        return self.arrays['parameters']
+
+    @property
+    def weather(self):
+        return self.arrays['weather']
+
+    @property
+    def monthly_production(self):
+        return self.arrays['monthly_production']
+
+
+class MaterializedForecastStore:
+    """
+    Precomputed forecasts kept in a local SQLite database.
+
+    Rows are keyed by site, start date, horizon, model version and the
+    horizon mode the monthly production was computed with (see
+    multi_resolution.py). Monthly production depends on the horizon it
+    continues from, so a row only serves requests for exactly its horizon.
+    Each row holds the input parameter vector the
+    forecast was rolled out from and the forecast arrays (daily parameters,
+    weather and monthly production) as a single npz blob, so a request is only
+    served from the store when its inputs match.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(materialized_forecast)')]
+            if columns and 'horizon_mode' not in columns:
+                # Rows from before horizon modes were keyed cannot tell which
+                # mode they hold; the scheduler recomputes them
+                logger.info("Dropping materialized forecasts stored without a horizon mode")
+                conn.execute('DROP TABLE materialized_forecast')
+            conn.execute(
+                '''
+                CREATE TABLE IF NOT EXISTS materialized_forecast (
+                    site_id TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    horizon INTEGER NOT NULL,
+                    model_version TEXT NOT NULL,
+                    horizon_mode TEXT NOT NULL,
+                    model_id TEXT NOT NULL,
+                    arrays BLOB NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (site_id, start_date, horizon, model_version, horizon_mode)
+                )
+                '''
+            )
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the store safe to use
+        # from the gRPC thread pool and the scheduler thread.
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def put(self, site_id, start_date, model_version, horizon_mode, model_id, inputs, parameters, weather,
+            monthly_production):
+        """Store a forecast; its horizon is the length of the daily arrays"""
+        buffer = io.BytesIO()
+        np.savez(
+            buffer, inputs=inputs, parameters=parameters, weather=weather, monthly_production=monthly_production
+        )
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO materialized_forecast '
+                '(site_id, start_date, horizon, model_version, horizon_mode, model_id, arrays, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    site_id,
+                    start_date.strftime('%Y-%m-%d'),
+                    len(parameters),
+                    model_version,
+                    horizon_mode,
+                    model_id,
+                    buffer.getvalue(),
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                )
+            )
+
+    def find(self, site_id, start_date, forecast_days, model_version, horizon_mode, inputs):
+        """Return the stored forecast of forecast_days in horizon_mode whose inputs match, or None"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT horizon, model_id, arrays, created_at FROM materialized_forecast '
+                'WHERE site_id = ? AND start_date = ? AND model_version = ? AND horizon_mode = ? AND horizon = ?',
+                (site_id, start_date.strftime('%Y-%m-%d'), model_version, horizon_mode, forecast_days)
+            ).fetchall()
+        for horizon, model_id, blob, created_at in rows:
+            with np.load(io.BytesIO(blob)) as data:
+                arrays = {name: data[name] for name in data.files}
+            if np.max(np.abs(arrays['inputs'] - inputs)) <= INPUT_MATCH_TOLERANCE:
+                return MaterializedForecast(
+                    site_id, start_date, horizon, model_version, horizon_mode, model_id, arrays, created_at
+                )
+        return None
+
+    def horizons(self, site_id, start_date, model_version, horizon_mode, inputs):
+        """Horizons stored for a site, start date, model version and horizon mode from matching inputs"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT horizon, arrays FROM materialized_forecast '
+                'WHERE site_id = ? AND start_date = ? AND model_version = ? AND horizon_mode = ? ORDER BY horizon',
+                (site_id, start_date.strftime('%Y-%m-%d'), model_version, horizon_mode)
+            ).fetchall()
+        horizons = []
+        for horizon, blob in rows:
+            with np.load(io.BytesIO(blob)) as data:
+                if np.max(np.abs(data['inputs'] - inputs)) <= INPUT_MATCH_TOLERANCE:
+                    horizons.append(horizon)
+        return horizons
+
+    def prune(self, retention_days, today=None):
+        """Delete forecasts starting more than retention_days before today"""
+        cutoff = (today or datetime.now()) - timedelta(days=retention_days)
+        with self._connect() as conn:
+            deleted = conn.execute(
+                'DELETE FROM materialized_forecast WHERE start_date < ?', (cutoff.strftime('%Y-%m-%d'),)
+            ).rowcount
+        if deleted:
+            logger.info(f"Pruned {deleted} materialized forecasts starting before {cutoff.strftime('%Y-%m-%d')}")
+        return deleted
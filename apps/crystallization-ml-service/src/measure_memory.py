@@ -0,0 +1,88 @@
+"""
+Measure per-process memory of worker replicas serving a model.
+
+Starts N worker processes per model artifact, has each one load the model and
+run a prediction, and reports unique set size (USS: pages private to the
+process) and proportional set size (PSS) before and after loading. All workers
+of a run stay alive until every one of them has been measured, so pages shared
+between them show up as shared rather than private.
+
+Compare a `.keras` artifact with its mapped export (see mapped_model.py):
+    python measure_memory.py models/best_hybrid_model.keras models/best_hybrid_model.mmw --workers 4
+
+Linux only: reads /proc/self/smaps_rollup.
+"""
+import argparse
+import multiprocessing as mp
+
+import numpy as np
+
+
+def read_memory():
+    """USS, PSS and RSS of the calling process in bytes"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    return {
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'pss': fields.get('Pss', 0),
+        'rss': fields.get('Rss', 0),
+    }
+
+
+def _worker(model_path, barrier, results):
+    from mapped_model import is_mapped_model, load_mapped_model
+
+    before = read_memory()
+    if is_mapped_model(model_path):
+        model = load_mapped_model(model_path)
+    else:
+        from tensorflow import keras
+        model = keras.models.load_model(model_path)
+
+    input_shape = [dim or 1 for dim in model.input_shape]
+    model.predict(np.zeros(input_shape, dtype=np.float32), verbose=0)
+
+    barrier.wait()
+    after = read_memory()
+    results.put({'before': before, 'after': after})
+    barrier.wait()
+
+
+def measure(model_path, workers):
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_worker, args=(model_path, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return samples
+
+
+def _mib(value):
+    return f'{value / (1024 * 1024):9.1f}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('model_paths', nargs='+', help='.keras files or mapped model directories')
+    parser.add_argument('--workers', type=int, default=4, help='worker processes per model')
+    args = parser.parse_args()
+
+    print(f"{'model':<48} {'USS before':>10} {'USS after':>10} {'USS delta':>10} {'PSS after':>10}   (MiB, mean per worker)")
+    for model_path in args.model_paths:
+        samples = measure(model_path, args.workers)
+        uss_before = np.mean([s['before']['uss'] for s in samples])
+        uss_after = np.mean([s['after']['uss'] for s in samples])
+        pss_after = np.mean([s['after']['pss'] for s in samples])
+        print(f'{model_path:<48} {_mib(uss_before)}  {_mib(uss_after)}  {_mib(uss_after - uss_before)}  {_mib(pss_after)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,247 +1,676 @@
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
 from datetime import datetime, timedelta
 from dateutil import parser
 import os
 import logging
+from model_registry import ModelRegistry, ModelNotFoundError, DEFAULT_MODEL_ID
+from model_metadata import DEFAULT_PERFORMANCE_METRICS
+from forecast_state_store import ForecastStateStore
+from materialized_store import MaterializedForecastStore
+from forecast_versions import ForecastVersionCache, VersionedForecast, forecast_version
+from service_metrics import metrics
+from mapped_model import UnsupportedArchitectureError
+from stateful_inference import step_model_for
+from rollout import rollout
+import production
+import scenario_sweep
+import multi_resolution
 
 logger = logging.getLogger(__name__)
 
+# PredictionResponse sections that a field mask can select
+RESPONSE_SECTIONS = [
+    'daily_parameters_forecast', 'monthly_production_6months', 'monthly_production_12months',
+    'seasonal_production', 'model_info', 'summary'
+]
+PRODUCTION_SECTIONS = {
+    'monthly_production_6months', 'monthly_production_12months', 'seasonal_production', 'summary'
+}
+
+PARAMETER_NAMES = [
+    'water_temperature', 'lagoon', 'OR_brine_level', 'OR_bund_level',
+    'IR_brine_level', 'IR_bound_level', 'East_channel', 'West_channel'
+]
+WEATHER_NAMES = [
+    'temperature_mean', 'temperature_min', 'temperature_max', 'rain_sum',
+    'wind_speed_max', 'wind_gusts_max', 'relative_humidity_mean'
+]
+# Ranges the simulated weather is drawn from, in WEATHER_NAMES order
+WEATHER_RANGES = [(25, 28), (22, 25), (27, 30), (0, 5), (10, 30), (20, 50), (70, 90)]
+
+
+class FieldMaskError(ValueError):
+    """Raised when a response field mask names an unknown section"""
+
+
+class ForecastDaysError(ValueError):
+    """Raised when forecast_days is outside the supported horizon"""
+
+
+class AdvanceError(ValueError):
+    """Raised when an observation cannot advance a site's stored forecast"""
+
+
+class ForecastStateUnavailableError(Exception):
+    """Raised when advancing forecasts while no forecast state store is configured"""
+
+
+class ForecastStateNotFoundError(Exception):
+    """Raised when a site has no stored forecast to advance"""
+
 
 class MLPredictor:
-    def __init__(self, model_path='models/best_hybrid_model.keras'):
-        """Initialize the ML predictor with the Keras model"""
+    def __init__(self, model_path='models/best_hybrid_model.keras', model_dir=None, memory_budget_mb=None):
+        """Initialize the ML predictor with the Keras model registry"""
         self.model_path = model_path
-        self.model = None
+        if memory_budget_mb is None and os.getenv('MODEL_MEMORY_BUDGET_MB'):
+            memory_budget_mb = float(os.getenv('MODEL_MEMORY_BUDGET_MB'))
+        self.registry = ModelRegistry(
+            default_model_path=model_path,
+            model_dir=model_dir or os.getenv('MODEL_DIR'),
+            memory_budget_bytes=int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        )
         self.load_model()
         
-        # Model performance metrics (you can update these with actual values)
-        self.performance_metrics = {
-            'test_mae': 0.22643738985061646,
-            'test_rmse': 0.36510669291987724,
-            'test_r2_score': 0.7749716637562971,
-            'test_accuracy': 77.49716637562972,
-            'validation_r2_score': 0.8884437289486968,
-            'validation_accuracy': 88.84437289486968
-        }
+        # Per-site forecast state used by advance(); disabled with FORECAST_STATE_DB=""
+        state_db = os.getenv('FORECAST_STATE_DB', 'data/forecast_state.db')
+        self.state_store = ForecastStateStore(state_db) if state_db else None
+        # Forecasts precomputed by forecast_scheduler.py; disabled with MATERIALIZED_FORECAST_DB=""
+        materialized_db = os.getenv('MATERIALIZED_FORECAST_DB', 'data/materialized_forecasts.db')
+        self.materialized = MaterializedForecastStore(materialized_db) if materialized_db else None
+        # Recent forecasts for reuse by identical requests and for delta responses
+        self.versions = ForecastVersionCache.from_env()
+        self.advance_tolerance = float(os.getenv('ADVANCE_TOLERANCE', '0.5'))
+        self.sweep_max_scenarios = int(os.getenv('SWEEP_MAX_SCENARIOS', '4096'))
+        # Longest daily forecast predict() rolls out; production covers 12 months
+        self.max_forecast_days = int(os.getenv('MAX_FORECAST_DAYS', '366'))
+        # Stateful LSTM stepping: 'auto' for artifacts whose metadata records a
+        # passed stateful_inference.py check, 'on' for every steppable model, 'off'
+        self.stateful_inference = os.getenv('STATEFUL_INFERENCE', 'auto').lower()
+        # Resolution of the rollout past forecast_days that feeds monthly
+        # production. 'daily' is the reference; 'weekly' and 'monthly' take
+        # about a third and a seventh of the model steps for a 12-month
+        # forecast, at the error multi_resolution.py check measures
+        self.horizon_mode = os.getenv('HORIZON_MODE', 'daily')
+        
+        # Reported for artifacts without backtest metadata
+        self.performance_metrics = DEFAULT_PERFORMANCE_METRICS
     
     def load_model(self):
-        """Load the Keras model"""
+        """Eagerly load the default Keras model"""
         try:
-            if os.path.exists(self.model_path):
-                self.model = keras.models.load_model(self.model_path)
-                logger.info(f"Model loaded successfully from {self.model_path}")
-            else:
-                logger.warning(f"Model file not found at {self.model_path}")
-                self.model = None
+            self.registry.get(DEFAULT_MODEL_ID)
+            logger.info(f"Model loaded successfully from {self.model_path}")
+        except ModelNotFoundError:
+            logger.warning(f"Model file not found at {self.model_path}")
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
-            self.model = None
     
-    def predict(self, start_date, forecast_days, current_values):
+    def _get_model_slot(self, model_id):
+        """
+        Resolve model_id to a resident model slot, loading it if needed
+        
+        Raises ModelNotFoundError when model_id has no model artifact.
+        """
+        return self.registry.get(model_id)
+    
+    def predict(self, start_date, forecast_days, current_values, model_id=None, site_id=None, fields=None,
+                horizon_mode=None, known_version=None, cancellation=None):
         """
         Generate predictions based on current values and forecast days
         
         Args:
             start_date: Starting date for forecast (string)
-            forecast_days: Number of days to forecast
+            forecast_days: Number of days to forecast, from 1 to MAX_FORECAST_DAYS
             current_values: Dictionary with current parameter values
+            model_id: Model to predict with; the default model when empty
+            site_id: When set, the rollout is stored as the site's forecast state,
+                and a precomputed forecast from the same inputs is served if one exists
+            fields: Response sections to build (see RESPONSE_SECTIONS); all when empty
+            horizon_mode: Resolution of the rollout past forecast_days that monthly
+                production is computed from (see multi_resolution.py); HORIZON_MODE
+                ('daily') when empty. Coarse modes are faster but extrapolate
+                between model steps, so their production differs slightly from
+                the daily reference
+            known_version: Version of the forecast the caller holds; answered with
+                not_modified or a delta against it when possible (see forecast_versions.py)
+            cancellation: Optional CancellationToken; abandoned work raises PredictionCancelled
             
         Returns:
             Dictionary with all forecast data
         """
-        if self.model is None:
-            raise Exception("Model not loaded. Please ensure the model file exists.")
+        if not 1 <= forecast_days <= self.max_forecast_days:
+            raise ForecastDaysError(
+                f"forecast_days must be between 1 and {self.max_forecast_days}, got {forecast_days}"
+            )
+        fields = self._resolve_fields(fields)
+        horizon_mode = horizon_mode or self.horizon_mode
+        multi_resolution.step_days_for(horizon_mode)
+        slot = self._get_model_slot(model_id)
         
         # Parse start date
         start_dt = parser.parse(start_date)
+        current_params = self._current_params(current_values)
+        store_state = bool(site_id) and self.state_store is not None
+        needs_production = bool(fields & PRODUCTION_SECTIONS)
+        needs_rollout = store_state or 'daily_parameters_forecast' in fields
         
-        # Generate daily forecasts
-        daily_forecasts = self._generate_daily_forecasts(
-            start_dt, forecast_days, current_values
+        # An identical request within the cache TTL gets the same forecast back
+        request_key = (slot.model_id, slot.version, start_dt, forecast_days, horizon_mode, current_params.tobytes())
+        cached = self.versions.lookup(request_key)
+        if cached is not None and (
+            (cached.parameters is not None or not needs_rollout)
+            and (cached.monthly_production is not None or not needs_production)
+        ):
+            metrics.increment('forecast_cache.hits')
+            if store_state and cached.parameters is not None:
+                self.state_store.save(
+                    site_id, slot.model_id, start_dt, cached.parameters, cached.weather, observed_values=current_params
+                )
+            return self._build_result(
+                slot, start_dt, forecast_days, cached.parameters, cached.weather, fields,
+                cached.monthly_production, known_version
+            )
+        metrics.increment('forecast_cache.misses')
+        
+        if site_id and self.materialized is not None:
+            materialized = self.materialized.find(
+                site_id, start_dt, forecast_days, slot.version, horizon_mode, current_params
+            )
+            metrics.increment('materialized.hits' if materialized else 'materialized.misses')
+            if materialized is not None:
+                parameters, weather = materialized.parameters, materialized.weather
+                if self.state_store is not None:
+                    self.state_store.save(
+                        site_id, slot.model_id, start_dt, parameters, weather, observed_values=current_params
+                    )
+                return self._build_result(
+                    slot, start_dt, forecast_days, parameters, weather, fields, materialized.monthly_production,
+                    known_version, request_key
+                )
+        
+        # Roll the model forward over the forecast horizon, unless nothing
+        # asked for will read the rollout; production continues it at the
+        # resolution of the horizon mode. The field mask only trims the
+        # response: production always comes from the full daily rollout, which
+        # is kept with the forecast so every mask shares one version.
+        parameters = weather = monthly_production = None
+        if needs_rollout or needs_production:
+            parameters, weather = self._generate_daily_forecasts(
+                self._rollout_model(slot), current_params, forecast_days, cancellation
+            )
+            if needs_production:
+                monthly_production = self._production(
+                    slot, parameters[None], weather[None], [start_dt], horizon_mode, cancellation
+                )[0]
+            parameters, weather = parameters[:forecast_days], weather[:forecast_days]
+        
+        if cancellation is not None:
+            cancellation.check('aggregation')
+        
+        if store_state:
+            self.state_store.save(
+                site_id, slot.model_id, start_dt, parameters, weather, observed_values=current_params
+            )
+        
+        return self._build_result(
+            slot, start_dt, forecast_days, parameters, weather, fields, monthly_production, known_version, request_key
+        )
+    
+    def advance(self, site_id, observed_date, observed_values, tolerance=None, cancellation=None):
+        """
+        Advance a site's stored forecast by one observed day
+        
+        The stored trajectory is reused when the observation agrees with what
+        was forecast for that day (every parameter within `tolerance`); then
+        only the days past the old horizon are rolled out. Otherwise the
+        horizon is recomputed from the observed values; that includes an
+        observation dated past the stored horizon, which has no forecast day
+        to compare against. An observation dated before the stored forecast
+        starts is rejected.
+        
+        Args:
+            site_id: Site whose stored forecast to advance
+            observed_date: Date the observed values were measured (string)
+            observed_values: Dictionary with the observed parameter values
+            tolerance: Maximum absolute deviation that keeps the trajectory
+            cancellation: Optional CancellationToken; abandoned work raises PredictionCancelled
+            
+        Returns:
+            Tuple of (forecast dictionary, whether the trajectory was reused,
+            number of daily model steps run)
+        """
+        if self.state_store is None:
+            raise ForecastStateUnavailableError("Forecast state store is not configured (set FORECAST_STATE_DB)")
+        state = self.state_store.load(site_id)
+        if state is None:
+            raise ForecastStateNotFoundError(f"No stored forecast for site '{site_id}'. Call GetPredictions with site_id first.")
+        if tolerance is None:
+            tolerance = self.advance_tolerance
+        
+        try:
+            observed_dt = parser.parse(observed_date)
+        except (ValueError, OverflowError) as e:
+            raise AdvanceError(f"Invalid observed_date '{observed_date}': {e}")
+        offset = (observed_dt - state.start_date).days
+        if offset < 0:
+            raise AdvanceError(
+                f"observed_date {observed_dt.strftime('%Y-%m-%d')} is before the stored forecast for site "
+                f"'{site_id}' starts ({state.start_date.strftime('%Y-%m-%d')})"
+            )
+        
+        slot = self._get_model_slot(state.model_id)
+        observed_params = self._current_params(observed_values)
+        forecast_days = len(state.parameters)
+        
+        reused = (
+            offset < forecast_days
+            and np.max(np.abs(state.parameters[offset] - observed_params)) <= tolerance
         )
+        if reused:
+            # Keep the still-valid tail and extend it past the old horizon
+            extra_parameters, extra_weather = self._generate_daily_forecasts(
+                self._rollout_model(slot), state.parameters[-1], offset + 1, cancellation,
+                history=np.concatenate([state.parameters, state.weather], axis=1)
+            )
+            parameters = np.concatenate([state.parameters[offset + 1:], extra_parameters])
+            weather = np.concatenate([state.weather[offset + 1:], extra_weather])
+            model_steps = offset + 1
+        else:
+            parameters, weather = self._generate_daily_forecasts(
+                self._rollout_model(slot), observed_params, forecast_days, cancellation
+            )
+            model_steps = forecast_days
+        
+        if cancellation is not None:
+            cancellation.check('aggregation')
         
-        # Generate monthly forecasts
-        monthly_6months = self._generate_monthly_forecast(
-            daily_forecasts, start_dt, 6
+        start_dt = observed_dt + timedelta(days=1)
+        self.state_store.save(
+            site_id, slot.model_id, start_dt, parameters, weather, observed_values=observed_params
         )
-        monthly_12months = self._generate_monthly_forecast(
-            daily_forecasts, start_dt, 12
+        
+        logger.info(
+            f"Advanced forecast for site '{site_id}' to {start_dt.strftime('%Y-%m-%d')} "
+            f"({'reused trajectory' if reused else 'full rollout'}, {model_steps} model steps)"
         )
+        monthly_production = self._production(
+            slot, parameters[None], weather[None], [start_dt], self.horizon_mode, cancellation
+        )[0]
+        result = self._build_result(slot, start_dt, len(parameters), parameters, weather,
+                                    monthly_production=monthly_production)
+        return result, reused, model_steps
+    
+    def sweep(self, start_date, horizon_days, base_values, grid=None, scenarios=None, model_id=None,
+              cancellation=None):
+        """
+        Evaluate what-if scenarios around base_values as one batched rollout
         
-        # Generate seasonal production
-        seasonal_production = self._generate_seasonal_production(monthly_12months)
+        Args:
+            start_date: Starting date for the rollout (string)
+            horizon_days: Days to roll out, up to MAX_FORECAST_DAYS; through the end
+                of the 12th month when 0
+            base_values: Dictionary with the base parameter values
+            grid: List of (parameter, [deltas]) swept as a cartesian product
+            scenarios: List of (name, {parameter: delta}) explicit scenarios
+            model_id: Model to predict with; the default model when empty
+            cancellation: Optional CancellationToken; abandoned work raises PredictionCancelled
+            
+        Returns:
+            Dictionary with per-scenario production summaries and per-input
+            sensitivities of total production
+        """
+        slot = self._get_model_slot(model_id)
+        start_dt = parser.parse(start_date)
+        if not horizon_days:
+            horizon_days = production.days_until_months_end(start_dt, 12)
+        scenario_sweep.check_horizon(horizon_days, self.max_forecast_days)
         
-        # Build response
-        response = {
+        expanded = scenario_sweep.build_scenarios(
+            PARAMETER_NAMES, grid or [], scenarios or [], self.sweep_max_scenarios
+        )
+        # Every scenario sees the same simulated weather
+        result = scenario_sweep.run_sweep(
+            self._rollout_model(slot), PARAMETER_NAMES, self._current_params(base_values),
+            expanded, start_dt, horizon_days, cancellation=cancellation,
+            weather=self._generate_weather_batch(1, horizon_days), max_horizon_days=self.max_forecast_days
+        )
+        result.update({
             'status': 'success',
-            'daily_parameters_forecast': {
+            'horizon_days': horizon_days,
+            'model_info': self._model_info(slot)
+        })
+        return result
+
+    
+    def forecast_arrays(self, start_dates, forecast_days, current_values, model_id=None, horizon_mode=None,
+                        production_horizons=None, cancellation=None):
+        """
+        Roll out a batch of requests sharing a model and horizon, in array form
+        
+        All rows are rolled out together, one batched model call per day.
+        
+        Args:
+            start_dates: Starting date of each request (strings)
+            forecast_days: Number of days to forecast
+            current_values: Current values dictionary of each request
+            model_id: Model to predict with; the default model when empty
+            horizon_mode: Resolution of the rollout feeding monthly production
+            production_horizons: Shorter horizons to also compute monthly
+                production for, each continuing only its first days of the
+                rollout as predict() would for that forecast_days
+            cancellation: Optional CancellationToken; abandoned work raises PredictionCancelled
+            
+        Returns:
+            Dictionary with 'model_id', 'horizon_mode', 'start_dates'
+            (datetimes), 'parameters' (batch, days, 8), 'weather' (batch, days,
+            7), 'month_labels' (one list of 12 per row), 'monthly_production'
+            (batch, 12) and 'monthly_production_by_horizon' ({days: (batch, 12)}
+            for forecast_days and every production horizon)
+        """
+        horizon_mode = horizon_mode or self.horizon_mode
+        slot = self._get_model_slot(model_id)
+        start_dts = [parser.parse(start_date) for start_date in start_dates]
+        initial_params = np.stack([self._current_params(values) for values in current_values])
+        
+        weather = self._generate_weather_batch(len(start_dts), forecast_days)
+        parameters = rollout(
+            self._rollout_model(slot), initial_params, forecast_days,
+            noise_scale=0.1, cancellation=cancellation, weather=weather
+        )
+        
+        monthly_production_by_horizon = {
+            days: self._production(
+                slot, parameters[:, :days], weather[:, :days], start_dts, horizon_mode, cancellation
+            )
+            for days in sorted(set(production_horizons or []) | {forecast_days})
+        }
+        month_labels = [self._month_labels(start_dt, 12) for start_dt in start_dts]
+        
+        return {
+            'model_id': slot.model_id,
+            'horizon_mode': horizon_mode,
+            'start_dates': start_dts,
+            'parameters': parameters,
+            'weather': weather,
+            'month_labels': month_labels,
+            'monthly_production': monthly_production_by_horizon[forecast_days],
+            'monthly_production_by_horizon': monthly_production_by_horizon
+        }
+    
+    def model_slot(self, model_id=None):
+        """
+        Resolve model_id to a resident model slot, loading it if needed
+        
+        Raises ModelNotFoundError when model_id has no model artifact.
+        """
+        return self._get_model_slot(model_id)
+    
+    def parameter_vector(self, current_values):
+        """Order a current values dictionary into the model's parameter vector"""
+        return self._current_params(current_values)
+    
+    def simulated_weather(self, forecast_days):
+        """Weather for forecast_days days, shaped (forecast_days, 7) in WEATHER_NAMES order"""
+        return self._generate_weather_batch(1, forecast_days)[0]
+    
+    def deterministic_rollout(self, slot, inputs, forecast_days, weather, cancellation=None):
+        """
+        Roll a parameter vector forward without noise
+        
+        Args:
+            slot: Model slot from model_slot()
+            inputs: Parameter vector shaped (8,)
+            forecast_days: Number of days to roll forward
+            weather: Weather shaped (forecast_days, 7)
+            cancellation: Optional CancellationToken; abandoned work raises PredictionCancelled
+            
+        Returns:
+            Array shaped (forecast_days, 8)
+        """
+        return rollout(
+            self._rollout_model(slot), inputs.reshape(1, -1), forecast_days,
+            cancellation=cancellation, weather=weather[None]
+        )[0]
+    
+    def _build_result(self, slot, start_dt, forecast_days, parameters, weather, fields=None,
+                      monthly_production=None, known_version=None, request_key=None):
+        """
+        Build the forecast dictionary from rolled-out parameter and weather arrays
+        
+        Only the sections named in fields (all when empty) are built. Sections
+        that merely feed others (e.g. monthly production behind the summary)
+        stay in array form. monthly_production, shaped (12,), is required for
+        the production sections.
+        
+        The result carries the forecast's version. When it equals known_version
+        only the status is returned; when the arrays of known_version are still
+        cached, the daily, monthly and seasonal entries are limited to those
+        that changed since.
+        """
+        fields = self._resolve_fields(fields)
+        version = forecast_version(slot.version, start_dt, parameters, weather, monthly_production)
+        forecast = VersionedForecast(version, start_dt, parameters, weather, monthly_production)
+        self.versions.put(forecast, request_key)
+        if known_version and known_version == version:
+            metrics.increment('versions.not_modified')
+            return {'status': 'not_modified', 'version': version, 'model_version': slot.version}
+        
+        base = self.versions.get(known_version) if known_version else None
+        changes = forecast.changes_since(base) if base is not None else None
+        if changes is not None:
+            metrics.increment('versions.deltas')
+            response = {'status': 'delta', 'version': version, 'base_version': known_version}
+        else:
+            response = {'status': 'success', 'version': version}
+        response['model_version'] = slot.version
+        days = changes['days'] if changes is not None else None
+        months = changes['months'] if changes is not None else None
+        
+        # Generate daily forecasts
+        if 'daily_parameters_forecast' in fields:
+            response['daily_parameters_forecast'] = {
                 'forecast_type': 'daily_parameters',
                 'forecast_start_date': start_dt.strftime('%Y-%m-%d'),
                 'forecast_end_date': (start_dt + timedelta(days=forecast_days-1)).strftime('%Y-%m-%d'),
                 'total_days': forecast_days,
-                'forecasts': daily_forecasts
-            },
-            'monthly_production_6months': monthly_6months,
-            'monthly_production_12months': monthly_12months,
-            'seasonal_production': seasonal_production,
-            'model_info': {
-                'model_type': 'LSTM_Hybrid_with_Weather',
-                'forecast_generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'performance_metrics': self.performance_metrics
-            },
-            'summary': {
-                'daily_forecast_days': forecast_days,
-                'monthly_6_total_production': monthly_6months['total_production'],
-                'monthly_12_total_production': monthly_12months['total_production'],
-                'maha_season_total': seasonal_production['seasons'].get('Maha', {}).get('total_production', 0),
-                'yala_season_total': seasonal_production['seasons'].get('Yala', {}).get('total_production', 0)
+                'forecasts': self._daily_forecast_items(start_dt, parameters, weather, days)
             }
-        }
+        
+        if fields & PRODUCTION_SECTIONS:
+            # Generate monthly production; the 6-month section is the first
+            # half of the 12-month one
+            month_labels = self._month_labels(start_dt, 12)
+            season_totals = production.seasonal_totals(month_labels, monthly_production.reshape(1, -1))
+            
+            if 'monthly_production_6months' in fields:
+                response['monthly_production_6months'] = self._generate_monthly_forecast(
+                    month_labels[:6], monthly_production[:6], months
+                )
+            if 'monthly_production_12months' in fields:
+                response['monthly_production_12months'] = self._generate_monthly_forecast(
+                    month_labels, monthly_production, months
+                )
+            
+            # Generate seasonal production
+            if 'seasonal_production' in fields:
+                response['seasonal_production'] = self._generate_seasonal_production(
+                    month_labels, monthly_production, months
+                )
+            
+            if 'summary' in fields:
+                response['summary'] = {
+                    'daily_forecast_days': forecast_days,
+                    'monthly_6_total_production': float(monthly_production[:6].sum()),
+                    'monthly_12_total_production': float(monthly_production.sum()),
+                    'maha_season_total': float(season_totals.get('Maha', [0.0])[0]),
+                    'yala_season_total': float(season_totals.get('Yala', [0.0])[0])
+                }
+        
+        if 'model_info' in fields:
+            response['model_info'] = self._model_info(slot)
         
         return response
     
-    def _generate_daily_forecasts(self, start_date, forecast_days, current_values):
-        """Generate daily forecasts using the ML model"""
+    def _resolve_fields(self, fields):
+        """Validate a response field mask; an empty mask selects every section"""
+        if not fields:
+            return set(RESPONSE_SECTIONS)
+        unknown = [field for field in fields if field not in RESPONSE_SECTIONS]
+        if unknown:
+            raise FieldMaskError(
+                f"Unknown response fields: {', '.join(unknown)}. Valid fields: {', '.join(RESPONSE_SECTIONS)}"
+            )
+        return set(fields)
+    
+    def _model_info(self, slot):
+        """Model metadata together with the registry's residency stats"""
+        return {
+            'model_type': 'LSTM_Hybrid_with_Weather',
+            'forecast_generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'performance_metrics': slot.metadata.get('performance_metrics', self.performance_metrics),
+            'model_id': slot.model_id,
+            'load_latency_ms': slot.load_latency_ms,
+            'cache_hit_ratio': self.registry.hit_ratio(),
+            'resident_models': self.registry.resident_models()
+        }
+    
+    def _rollout_model(self, slot):
+        """The model rollouts run on: a stateful step model when enabled for the slot"""
+        if self.stateful_inference == 'off':
+            return slot.model
+        if self.stateful_inference == 'auto' and not slot.metadata.get('stateful_inference', {}).get('enabled'):
+            return slot.model
+        if slot.step_model is None:
+            try:
+                slot.step_model = step_model_for(slot.model)
+                logger.info(f"Using stateful inference for model '{slot.model_id}'")
+            except UnsupportedArchitectureError as e:
+                logger.warning(f"Model '{slot.model_id}' cannot use stateful inference: {str(e)}")
+                slot.step_model = False
+        return slot.step_model or slot.model
+    
+    def _current_params(self, current_values):
+        """Order a current values dictionary into the model's parameter vector"""
+        return np.array([current_values[name] for name in PARAMETER_NAMES], dtype=np.float64)
+    
+    def _generate_daily_forecasts(self, model, current_params, forecast_days, cancellation=None, history=None):
+        """
+        Autoregressively roll the model forward from current_params
+        
+        history optionally holds the parameters and weather of the days before
+        (shaped (days, 15)) to fill a multi-day lookback window with.
+        
+        Returns:
+            Tuple of (parameters, weather) arrays shaped (forecast_days, 8)
+            and (forecast_days, 7), in PARAMETER_NAMES / WEATHER_NAMES order
+        """
+        # Generate weather predictions (simulated - replace with actual model predictions)
+        weather = self._generate_weather_batch(1, forecast_days)[0]
+        
+        # Small random variations are added after every step for realism
+        parameters = rollout(
+            model, current_params.reshape(1, -1), forecast_days, noise_scale=0.1, cancellation=cancellation,
+            weather=weather[None], history=None if history is None else history[None]
+        )[0]
+        
+        return parameters, weather
+    
+    def _daily_forecast_items(self, start_date, parameters, weather, days=None):
+        """Materialize rolled-out arrays as daily forecast dictionaries (only `days` when given)"""
         forecasts = []
         
-        # Prepare input features for the model
-        # Note: You'll need to adapt this based on your actual model input shape
-        current_params = np.array([
-            current_values['water_temperature'],
-            current_values['lagoon'],
-            current_values['OR_brine_level'],
-            current_values['OR_bund_level'],
-            current_values['IR_brine_level'],
-            current_values['IR_bound_level'],
-            current_values['East_channel'],
-            current_values['West_channel']
-        ])
-        
-        for day in range(forecast_days):
+        for day in (range(len(parameters)) if days is None else days):
             forecast_date = start_date + timedelta(days=day)
-            
-            # Generate weather predictions (simulated - replace with actual model predictions)
-            weather = self._generate_weather_forecast()
-            
-            # Use the model to predict parameters
-            # Note: Adjust input shape based on your model requirements
-            try:
-                # Example: if model expects shape (batch, timesteps, features)
-                model_input = current_params.reshape(1, 1, -1)
-                predictions = self.model.predict(model_input, verbose=0)
-                
-                # Update parameters based on predictions
-                if len(predictions.shape) > 1:
-                    predicted_params = predictions[0]
-                else:
-                    predicted_params = predictions
-                
-                # Ensure we have 8 parameters
-                if len(predicted_params) < 8:
-                    predicted_params = current_params
-                else:
-                    predicted_params = predicted_params[:8]
-                    
-            except Exception as e:
-                logger.warning(f"Prediction error for day {day}: {str(e)}. Using current values.")
-                predicted_params = current_params
-            
-            # Add small random variations for realism
-            noise = np.random.normal(0, 0.1, size=predicted_params.shape)
-            predicted_params = predicted_params + noise
-            
-            forecast_item = {
+            forecasts.append({
                 'date': forecast_date.strftime('%Y-%m-%d'),
                 'day_number': day + 1,
-                'parameters': {
-                    'water_temperature': float(predicted_params[0]),
-                    'lagoon': float(predicted_params[1]),
-                    'OR_brine_level': float(predicted_params[2]),
-                    'OR_bund_level': float(predicted_params[3]),
-                    'IR_brine_level': float(predicted_params[4]),
-                    'IR_bound_level': float(predicted_params[5]),
-                    'East_channel': float(predicted_params[6]),
-                    'West_channel': float(predicted_params[7])
-                },
-                'weather': weather
-            }
-            
-            forecasts.append(forecast_item)
-            
-            # Update current parameters for next iteration
-            current_params = predicted_params
+                'parameters': dict(zip(PARAMETER_NAMES, parameters[day].tolist())),
+                'weather': dict(zip(WEATHER_NAMES, weather[day].tolist()))
+            })
         
         return forecasts
     
-    def _generate_weather_forecast(self):
-        """Generate weather forecast (placeholder - replace with actual weather API)"""
-        return {
-            'temperature_mean': np.random.uniform(25, 28),
-            'temperature_min': np.random.uniform(22, 25),
-            'temperature_max': np.random.uniform(27, 30),
-            'rain_sum': np.random.uniform(0, 5),
-            'wind_speed_max': np.random.uniform(10, 30),
-            'wind_gusts_max': np.random.uniform(20, 50),
-            'relative_humidity_mean': np.random.uniform(70, 90)
-        }
-    
-    def _generate_monthly_forecast(self, daily_forecasts, start_date, months):
-        """Generate monthly production forecast from daily forecasts"""
-        monthly_forecasts = []
-        total_production = 0
+    def _generate_weather_batch(self, batch, forecast_days):
+        """
+        Generate weather forecasts (placeholder - replace with actual weather API)
         
-        current_month_start = start_date.replace(day=1)
+        Returns:
+            Array shaped (batch, forecast_days, 7) in WEATHER_NAMES order
+        """
+        lows, highs = zip(*WEATHER_RANGES)
+        return np.random.uniform(lows, highs, size=(batch, forecast_days, len(WEATHER_NAMES)))
+    
+    def _production(self, slot, parameters, weather, start_dts, horizon_mode, cancellation=None):
+        """
+        Monthly production of daily rollouts continued through the 12th month
         
-        for month_num in range(months):
-            month_date = current_month_start + timedelta(days=30 * month_num)
-            
-            # Calculate production based on daily parameters
-            # This is a simplified calculation - adjust based on your actual model
-            production = np.random.uniform(20000, 30000)
-            lower_bound = production * 0.85
-            upper_bound = production * 1.15
-            
-            # Determine season
-            month = month_date.month
-            if month in [12, 1, 2, 3]:
-                season = "Maha"
-            elif month in [4, 5, 6, 7]:
-                season = "Yala"
-            else:
-                season = "Other"
+        Args:
+            parameters, weather: Daily rollouts shaped (batch, days, 8) and (batch, days, 7)
+            start_dts: Start date of each row
+            horizon_mode: Resolution of the continuation (see multi_resolution.py)
             
+        Returns:
+            Array shaped (batch, 12)
+        """
+        future_days = max(production.days_until_months_end(start_dt, 12) for start_dt in start_dts)
+        future_days = max(future_days - parameters.shape[1], 0)
+        monthly_production, _ = multi_resolution.production_forecast(
+            self._rollout_model(slot), parameters, weather, start_dts, horizon_mode,
+            future_weather=self._generate_weather_batch(len(start_dts), future_days),
+            noise_scale=0.1, cancellation=cancellation
+        )
+        return monthly_production
+    
+    def _month_labels(self, start_date, months):
+        """'YYYY-MM' labels of `months` calendar months starting with start_date's month"""
+        return [start.strftime('%Y-%m') for start in production.month_starts(start_date, months)]
+    
+    def _generate_monthly_forecast(self, month_labels, monthly_production, changed=None):
+        """
+        Generate monthly production forecast section from monthly arrays
+        
+        changed optionally limits the month entries to those indices; the
+        totals always cover every month.
+        """
+        monthly_forecasts = []
+        months = len(month_labels)
+        
+        for month_num, (month, value) in enumerate(zip(month_labels, monthly_production.tolist())):
+            if changed is not None and month_num not in changed:
+                continue
             monthly_forecasts.append({
-                'month': month_date.strftime('%Y-%m'),
+                'month': month,
                 'month_number': month_num + 1,
-                'production_forecast': float(production),
-                'lower_bound': float(lower_bound),
-                'upper_bound': float(upper_bound),
-                'season': season
+                'production_forecast': value,
+                'lower_bound': value * 0.85,
+                'upper_bound': value * 1.15,
+                'season': production.season_for_month(int(month[5:7]))
             })
-            
-            total_production += production
-        
-        period = f"{months}_months"
-        end_month = (current_month_start + timedelta(days=30 * (months - 1))).strftime('%Y-%m')
         
         return {
             'forecast_type': 'monthly_production',
-            'forecast_period': period,
-            'forecast_start_month': current_month_start.strftime('%Y-%m'),
-            'forecast_end_month': end_month,
-            'total_months': len(monthly_forecasts),
-            'total_production': float(total_production),
+            'forecast_period': f"{months}_months",
+            'forecast_start_month': month_labels[0],
+            'forecast_end_month': month_labels[-1],
+            'total_months': months,
+            'total_production': float(monthly_production.sum()),
             'forecasts': monthly_forecasts
         }
     
-    def _generate_seasonal_production(self, monthly_forecast):
-        """Generate seasonal production summary"""
+    def _generate_seasonal_production(self, month_labels, monthly_production, changed=None):
+        """
+        Generate seasonal production summary
+        
+        changed optionally limits the seasons to those with a changed month
+        index, listing only those months.
+        """
         seasons = {}
+        if changed is not None:
+            changed_seasons = {production.season_for_month(int(month_labels[i][5:7])) for i in changed}
         
-        for forecast in monthly_forecast['forecasts']:
-            season = forecast['season']
+        for month_num, (month, value) in enumerate(zip(month_labels, monthly_production.tolist())):
+            season = production.season_for_month(int(month[5:7]))
             if season not in seasons:
                 seasons[season] = {
                     'months_count': 0,
@@ -250,12 +679,17 @@ class MLPredictor:
                 }
             
             seasons[season]['months_count'] += 1
-            seasons[season]['total_production'] += forecast['production_forecast']
+            seasons[season]['total_production'] += value
+            if changed is not None and month_num not in changed:
+                continue
             seasons[season]['months'].append({
-                'month': forecast['month'],
-                'production': forecast['production_forecast']
+                'month': month,
+                'production': value
             })
         
+        if changed is not None:
+            seasons = {season: data for season, data in seasons.items() if season in changed_seasons}
+        
         return {
             'forecast_type': 'seasonal_production',
             'forecast_period': '12_months',
@@ -0,0 +1,201 @@
+import os
+import re
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+import numpy as np
+from mapped_model import MAPPED_MODEL_SUFFIX, is_mapped_model, load_mapped_model
+from model_metadata import METADATA_FILE, read_metadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_ID = 'default'
+MODEL_ID_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$')
+
+
+class ModelNotFoundError(Exception):
+    """Raised when a model_id does not resolve to a model artifact"""
+
+
+class ModelSlot:
+    """A resident model together with its bookkeeping"""
+
+    def __init__(self, model_id, path, model, size_bytes, load_latency_ms, metadata=None, version=None):
+        self.model_id = model_id
+        self.path = path
+        self.model = model
+        self.size_bytes = size_bytes
+        self.load_latency_ms = load_latency_ms
+        self.metadata = metadata or {}
+        self.version = version or model_id
+        # Built on first use by the predictor; False when the model cannot be stepped
+        self.step_model = None
+
+
+def artifact_version(path):
+    """
+    Short fingerprint of a model artifact that changes whenever it is replaced
+
+    Built from the size and modification time of the artifact file, or of
+    every file in a mapped model directory except its metadata, so recording
+    backtest metrics does not change the version.
+    """
+    if os.path.isdir(path):
+        files = sorted(os.path.join(path, name) for name in os.listdir(path) if name != METADATA_FILE)
+    else:
+        files = [path]
+    digest = hashlib.sha1()
+    for file_path in files:
+        stat = os.stat(file_path)
+        digest.update(f'{os.path.basename(file_path)}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """
+    Hosts many Keras models in one process.
+
+    Models are resolved by model_id to `<model_dir>/<model_id>.mmw` (see
+    mapped_model.py) or, failing that, `<model_dir>/<model_id>.keras`, loaded
+    lazily on first use and kept resident while the sum of their weight sizes
+    fits in `memory_budget_bytes`. When a new model does not fit, the least
+    recently used models are evicted. The default model is resolved from
+    `default_model_path` and is handled like any other slot. Slots are keyed
+    by the resolved artifact path, so model_ids naming the same artifact (such
+    as 'default' and the default model's own id) share one slot.
+    """
+
+    def __init__(self, default_model_path, model_dir=None, memory_budget_bytes=None):
+        self.default_model_path = default_model_path
+        self.model_dir = model_dir or os.path.dirname(default_model_path) or '.'
+        self.memory_budget_bytes = memory_budget_bytes
+        self._slots = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def resolve_path(self, model_id):
+        """Map a model_id onto the artifact path it is loaded from"""
+        if not model_id or model_id == DEFAULT_MODEL_ID:
+            return self.default_model_path
+        if not MODEL_ID_PATTERN.match(model_id):
+            raise ModelNotFoundError(f"Invalid model_id '{model_id}'")
+        mapped_path = os.path.join(self.model_dir, f'{model_id}{MAPPED_MODEL_SUFFIX}')
+        if is_mapped_model(mapped_path):
+            return mapped_path
+        return os.path.join(self.model_dir, f'{model_id}.keras')
+
+    def get(self, model_id=None):
+        """Return the resident slot for model_id, loading it on first use"""
+        model_id = model_id or DEFAULT_MODEL_ID
+        path = self.resolve_path(model_id)
+        key = os.path.realpath(path)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None:
+                self._slots.move_to_end(key)
+                self._hits += 1
+                return slot
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so a slow load does not block
+        # requests for models that are already resident.
+        with load_lock:
+            with self._lock:
+                slot = self._slots.get(key)
+                if slot is not None:
+                    self._slots.move_to_end(key)
+                    self._hits += 1
+                    return slot
+                self._misses += 1
+
+            try:
+                slot = self._load(model_id, path)
+                with self._lock:
+                    self._make_room(slot.size_bytes)
+                    self._slots[key] = slot
+            finally:
+                # Also dropped when the load fails, so unknown model_ids do
+                # not leave a lock behind each
+                with self._lock:
+                    self._load_locks.pop(key, None)
+            return slot
+
+    def _load(self, model_id, path):
+        """Load the artifact at path into a new slot"""
+        if not os.path.exists(path):
+            raise ModelNotFoundError(f"Model file not found for model_id '{model_id}' at {path}")
+
+        started = time.perf_counter()
+        if is_mapped_model(path):
+            model = load_mapped_model(path)
+        else:
+            # TensorFlow is only imported once a .keras artifact is needed, so
+            # processes serving mapped models never pay for its heap.
+            from tensorflow import keras
+            model = keras.models.load_model(path)
+        load_latency_ms = (time.perf_counter() - started) * 1000.0
+        size_bytes = self._weights_size(model)
+
+        logger.info(
+            f"Loaded model '{model_id}' from {path} in {load_latency_ms:.1f} ms "
+            f"({size_bytes / (1024 * 1024):.1f} MiB of weights)"
+        )
+        return ModelSlot(
+            model_id, path, model, size_bytes, load_latency_ms, read_metadata(path), artifact_version(path)
+        )
+
+    @staticmethod
+    def _weights_size(model):
+        """Size in bytes of all weights held by a model"""
+        return int(sum(
+            int(np.prod(w.shape)) * np.dtype(getattr(w.dtype, 'name', w.dtype)).itemsize
+            for w in model.weights
+        ))
+
+    def _make_room(self, size_bytes):
+        """Evict least recently used slots until size_bytes fits the budget"""
+        if self.memory_budget_bytes is None:
+            return
+        while self._slots and self.resident_bytes() + size_bytes > self.memory_budget_bytes:
+            _, evicted = self._slots.popitem(last=False)
+            self._evictions += 1
+            logger.info(
+                f"Evicted model '{evicted.model_id}' ({evicted.size_bytes} bytes) to stay within memory budget"
+            )
+        if size_bytes > self.memory_budget_bytes:
+            logger.warning(
+                f"Model of {size_bytes} bytes exceeds the memory budget of "
+                f"{self.memory_budget_bytes} bytes; keeping it resident anyway"
+            )
+
+    def resident_bytes(self):
+        return sum(slot.size_bytes for slot in self._slots.values())
+
+    def resident_models(self):
+        """Resident model ids, least recently used first"""
+        with self._lock:
+            return [slot.model_id for slot in self._slots.values()]
+
+    def hit_ratio(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return self._hits / lookups if lookups else 0.0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'resident_models': [slot.model_id for slot in self._slots.values()],
+                'resident_bytes': self.resident_bytes(),
+                'memory_budget_bytes': self.memory_budget_bytes,
+            }
@@ -0,0 +1,227 @@
+"""
+Multi-resolution rollouts for long production horizons.
+
+Monthly production only needs monthly resolution. A forecast therefore rolls
+out the requested `forecast_days` daily, then continues to the end of the
+12th month with coarser steps chosen by the horizon mode:
+
+    daily     one model step per day (the reference)
+    weekly    one model step per 7 days
+    monthly   one model step per 30 days
+
+The service rolls out daily unless HORIZON_MODE (or a request's horizon_mode)
+opts into a coarse mode, trading the error bounded below for fewer steps.
+
+Each coarse period runs the model for two consecutive days and extrapolates
+the rest of the period geometrically from them (`rollout.extrapolate_period`):
+every parameter's one-day change is assumed to shrink by the same factor each
+day. The period's mean weather feeds the next period. A 12-month forecast then
+takes about `forecast_days + 104` (weekly) or `forecast_days + 24` (monthly)
+model steps instead of about 365.
+
+Error bound. `production.daily_production` is linear in the parameters
+(before clipping at zero), so the error a coarse mode adds to a month's total
+is at most
+
+    REFERENCE_DAILY_PRODUCTION * sum over days t, parameters i of
+        |PRODUCTION_ELASTICITIES[i] / REFERENCE_PARAMETERS[i]| * |x_i(t) - x~_i(t)|
+
+where x is the daily rollout and x~ the extrapolated coarse trajectory. The
+gap is zero when every parameter relaxes geometrically on its own (a model
+that is linear and diagonal around its equilibrium, with steady weather) and
+otherwise grows with the coupling between parameters, the model's
+nonlinearity and the weather's variation within a period. Because the decay
+factor is clamped to [0, 1), a period never moves a parameter by more than
+step_days times its one-day change. These terms depend on the model, so
+`check` rolls the same inputs out in every mode
+without noise and reports the largest relative error of the monthly and
+12-month totals against the daily rollout. With `--write` the result is
+recorded in the artifact metadata as each mode's measured error bound.
+
+Usage:
+    python multi_resolution.py check models/best_hybrid_model.keras --days 30 --write
+"""
+import sys
+import time
+import argparse
+import logging
+from datetime import datetime
+
+import numpy as np
+
+import production
+from rollout import rollout
+
+logger = logging.getLogger(__name__)
+
+HORIZON_MODES = {'daily': 1, 'weekly': 7, 'monthly': 30}
+
+
+class HorizonModeError(ValueError):
+    """Raised when a request names an unknown horizon mode"""
+
+
+def step_days_for(horizon_mode):
+    """Days per coarse model step of a horizon mode"""
+    if horizon_mode not in HORIZON_MODES:
+        raise HorizonModeError(
+            f"Unknown horizon mode '{horizon_mode}'. Valid modes: {', '.join(HORIZON_MODES)}"
+        )
+    return HORIZON_MODES[horizon_mode]
+
+
+def continue_rollout(model, parameters, weather, start_dates, horizon_mode, future_weather=None, months=12,
+                     noise_scale=0.0, cancellation=None):
+    """
+    Daily rollouts extended through the months-th month at the horizon mode's resolution
+
+    Args:
+        model: Model the daily rollout came from
+        parameters: Daily rollout shaped (batch, days, 8), day 0 being each row's start date
+        weather: Weather of those days shaped (batch, days, weather features)
+        start_dates: Start date of each row
+        horizon_mode: Resolution of the continuation past the daily rollout
+        future_weather: Weather of the continuation days (batch or 1, days, features)
+        months: Calendar months to cover
+        noise_scale: Standard deviation of gaussian noise added after each step
+        cancellation: Optional CancellationToken
+
+    Returns:
+        Tuple of (trajectory shaped (batch, days + continuation days, 8),
+        model steps of the continuation)
+    """
+    step_days = step_days_for(horizon_mode)
+    days = parameters.shape[1]
+    extra_days = max(production.days_until_months_end(start, months) for start in start_dates) - days
+    if extra_days <= 0:
+        return parameters, 0
+
+    continuation = rollout(
+        model, parameters[:, -1], extra_days, noise_scale=noise_scale, cancellation=cancellation,
+        weather=future_weather, history=np.concatenate([parameters, weather], axis=2), step_days=step_days
+    )
+    # Two model steps per period, one for a trailing single-day period
+    periods, remainder = divmod(extra_days, step_days)
+    steps = (2 if step_days > 1 else 1) * periods + min(remainder, 2)
+    return np.concatenate([parameters, continuation], axis=1), steps
+
+
+def production_forecast(model, parameters, weather, start_dates, horizon_mode, future_weather=None, months=12,
+                        noise_scale=0.0, cancellation=None):
+    """
+    Monthly production of daily rollouts extended through the months-th month
+
+    Takes the arguments of `continue_rollout`.
+
+    Returns:
+        Tuple of (monthly production shaped (batch, months), model steps of the continuation)
+    """
+    trajectory, steps = continue_rollout(
+        model, parameters, weather, start_dates, horizon_mode, future_weather, months, noise_scale, cancellation
+    )
+    return _monthly_production(trajectory, start_dates, months), steps
+
+
+def _monthly_production(trajectory, start_dates, months):
+    daily = production.daily_production(trajectory)
+    monthly_production = np.empty((len(start_dates), months))
+    for row, start in enumerate(start_dates):
+        monthly_production[row] = production.monthly_totals(daily[row:row + 1], start, months)[1][0]
+    return monthly_production
+
+
+def check_modes(model, daily_days=30, batch=16, start_date=None, seed=0):
+    """
+    Compare the monthly production of every coarse mode with the daily rollout
+
+    Production is clipped at zero, so its error alone can hide a diverging
+    trajectory; the parameters' largest error relative to
+    REFERENCE_PARAMETERS and the share of clipped days of the daily reference
+    are reported with it.
+
+    Returns:
+        Dictionary of mode to its largest relative errors, model steps and
+        time, plus 'clipped_day_share'
+    """
+    from ml_predictor import WEATHER_RANGES
+
+    rng = np.random.default_rng(seed)
+    start_date = start_date or datetime(datetime.now().year, datetime.now().month, datetime.now().day)
+    total_days = production.days_until_months_end(start_date, 12)
+    initial_params = production.REFERENCE_PARAMETERS * rng.uniform(
+        0.9, 1.1, size=(batch, len(production.REFERENCE_PARAMETERS))
+    )
+    lows, highs = zip(*WEATHER_RANGES)
+    weather = rng.uniform(lows, highs, size=(batch, total_days, len(WEATHER_RANGES)))
+
+    parameters = rollout(model, initial_params, daily_days, weather=weather)
+    results = {}
+    reference = reference_trajectory = None
+    for mode in HORIZON_MODES:
+        started = time.perf_counter()
+        trajectory, steps = continue_rollout(
+            model, parameters, weather[:, :daily_days], [start_date] * batch, mode,
+            future_weather=weather[:, daily_days:]
+        )
+        monthly = _monthly_production(trajectory, [start_date] * batch, 12)
+        elapsed = time.perf_counter() - started
+        if reference is None:
+            reference, reference_trajectory = monthly, trajectory
+            results['clipped_day_share'] = float(
+                (production.daily_production(trajectory) == 0.0).mean()
+            )
+        scale = np.maximum(np.abs(reference), 1e-9)
+        results[mode] = {
+            'model_steps': daily_days + steps,
+            'continuation_seconds': elapsed,
+            'max_monthly_relative_error': float((np.abs(monthly - reference) / scale).max()),
+            'max_total_relative_error': float(
+                (np.abs(monthly.sum(axis=1) - reference.sum(axis=1)) / scale.sum(axis=1)).max()
+            ),
+            'max_parameter_relative_error': float(
+                (np.abs(trajectory - reference_trajectory) / np.abs(production.REFERENCE_PARAMETERS)).max()
+            ),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the production error of coarse horizon modes')
+    parser.add_argument('command', choices=['check'])
+    parser.add_argument('model_path', help='.keras file or .mmw directory')
+    parser.add_argument('--days', type=int, default=30, help='daily days before the coarse continuation')
+    parser.add_argument('--batch', type=int, default=16, help='rollouts compared')
+    parser.add_argument('--write', action='store_true', help='record the errors in the artifact metadata')
+    args = parser.parse_args()
+
+    from mapped_model import is_mapped_model, load_mapped_model
+    from model_metadata import write_metadata
+    if is_mapped_model(args.model_path):
+        model = load_mapped_model(args.model_path)
+    else:
+        from tensorflow import keras
+        model = keras.models.load_model(args.model_path)
+
+    results = check_modes(model, args.days, args.batch)
+    print(f"{'mode':<10}{'steps':>8}{'seconds':>10}{'max monthly err':>18}{'max total err':>16}"
+          f"{'max param err':>16}")
+    for mode in HORIZON_MODES:
+        result = results[mode]
+        print(f"{mode:<10}{result['model_steps']:>8}{result['continuation_seconds']:>10.2f}"
+              f"{result['max_monthly_relative_error']:>18.2%}{result['max_total_relative_error']:>16.2%}"
+              f"{result['max_parameter_relative_error']:>16.2%}")
+    if results['clipped_day_share'] > 0:
+        print(f"{results['clipped_day_share']:.0%} of the reference days produce nothing (clipped at zero); "
+              f"their production error is not measured")
+
+    if args.write:
+        write_metadata(args.model_path, {'horizon_modes': dict(
+            results, daily_days=args.days, checked=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )})
+        print(f'Wrote the errors to the metadata of {args.model_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
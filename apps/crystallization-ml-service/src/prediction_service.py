@@ -3,13 +3,18 @@ import numpy as np
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import json
+import logging
+from model_metadata import DEFAULT_PERFORMANCE_METRICS, read_metadata
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class PredictionService:
     def __init__(self):
         self.model_path = os.getenv('MODEL_PATH', 'models/best_hybrid_model.keras')
         self.model = None
+        self.metadata = {}
         self._load_model()
     
     def _load_model(self):
@@ -22,9 +27,10 @@ class PredictionService:
                 self.model_path
             )
             self.model = tf.keras.models.load_model(model_full_path)
-            print(f'Model loaded successfully from {model_full_path}')
+            self.metadata = read_metadata(model_full_path)
+            logger.info(f'Model loaded successfully from {model_full_path}')
         except Exception as e:
-            print(f'Error loading model: {str(e)}')
+            logger.error(f'Error loading model: {str(e)}')
             self.model = None
     
     def predict(self, start_date: str, forecast_days: int, current_values: dict):
@@ -149,14 +155,7 @@ class PredictionService:
             'model_info': {
                 'model_type': 'LSTM_Hybrid_with_Weather',
                 'forecast_generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'performance_metrics': {
-                    'test_rmse': 0.36510669291987724,
-                    'test_mae': 0.22643738985061646,
-                    'test_r2_score': 0.7749716637562971,
-                    'test_accuracy': 77.49716637562972,
-                    'validation_r2_score': 0.8884437289486968,
-                    'validation_accuracy': 88.84437289486968
-                }
+                'performance_metrics': self.metadata.get('performance_metrics', DEFAULT_PERFORMANCE_METRICS)
             },
             'summary': {
                 'daily_forecast_days': forecast_days,
@@ -0,0 +1,95 @@
+"""
+Salt production estimates derived from rolled-out daily parameters.
+
+The daily production rate is a linear response around typical operating
+values, scaled so typical conditions yield about 25,000 per month (the range the
+original placeholder monthly forecast drew from). It is a placeholder for a
+fitted production model: swap `daily_production` for the real one and every
+consumer of this module follows.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Typical values of each parameter, in PARAMETER_NAMES order
+REFERENCE_PARAMETERS = np.array([28.0, 2.0, 4.5, 1.5, 5.5, 1.5, 7.0, 6.5])
+
+# Relative change in production per relative change in each parameter
+PRODUCTION_ELASTICITIES = np.array([0.8, -0.1, 0.35, -0.05, 0.35, -0.05, 0.1, 0.1])
+
+REFERENCE_DAILY_PRODUCTION = 25000.0 / 30.0
+
+
+def season_for_month(month):
+    """Crystallization season of a calendar month number"""
+    if month in [12, 1, 2, 3]:
+        return 'Maha'
+    elif month in [4, 5, 6, 7]:
+        return 'Yala'
+    return 'Other'
+
+
+def daily_production(parameters):
+    """
+    Daily production for rolled-out parameters
+
+    Args:
+        parameters: Array shaped (..., 8) in PARAMETER_NAMES order
+
+    Returns:
+        Array shaped (...) of non-negative daily production
+    """
+    relative_change = (parameters - REFERENCE_PARAMETERS) / REFERENCE_PARAMETERS
+    rate = REFERENCE_DAILY_PRODUCTION * (1.0 + relative_change @ PRODUCTION_ELASTICITIES)
+    return np.maximum(rate, 0.0)
+
+
+def month_starts(start_date, months):
+    """First day of each of `months` calendar months starting with start_date's month"""
+    starts = []
+    year, month = start_date.year, start_date.month
+    for _ in range(months):
+        starts.append(datetime(year, month, 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return starts
+
+
+def days_until_months_end(start_date, months):
+    """Number of days from start_date through the last day of the months-th month"""
+    last_start = month_starts(start_date, months)[-1]
+    next_month = (last_start + timedelta(days=32)).replace(day=1)
+    return (next_month - datetime(start_date.year, start_date.month, start_date.day)).days
+
+
+def monthly_totals(production, start_date, months):
+    """
+    Sum daily production into calendar months
+
+    Args:
+        production: Array shaped (batch, days), day 0 being start_date
+        start_date: Date of the first day
+        months: Number of calendar months to report, starting with start_date's month
+
+    Returns:
+        Tuple of (month labels 'YYYY-MM', array shaped (batch, months))
+    """
+    starts = month_starts(start_date, months + 1)
+    first_day = datetime(start_date.year, start_date.month, start_date.day)
+    boundaries = [max((start - first_day).days, 0) for start in starts]
+
+    totals = np.zeros((production.shape[0], months))
+    for index in range(months):
+        lo = min(boundaries[index], production.shape[1])
+        hi = min(boundaries[index + 1], production.shape[1])
+        if hi > lo:
+            totals[:, index] = production[:, lo:hi].sum(axis=1)
+    return [start.strftime('%Y-%m') for start in starts[:months]], totals
+
+
+def seasonal_totals(month_labels, totals):
+    """Sum monthly totals per season, returning {season: array shaped (batch,)}"""
+    seasons = {}
+    for index, label in enumerate(month_labels):
+        season = season_for_month(int(label[5:7]))
+        seasons[season] = seasons.get(season, 0.0) + totals[:, index]
+    return seasons
@@ -0,0 +1,137 @@
+"""
+Per-call response compression, message size limits and the server's listeners.
+
+The algorithm for each response is chosen from the `x-response-compression`
+request metadata (gzip, deflate or none) when the client sends it, otherwise
+gzip is used for responses of at least COMPRESSION_MIN_BYTES and nothing
+below that. gRPC only compresses with algorithms the client advertises in
+grpc-accept-encoding.
+
+A sample of responses (COMPRESSION_SAMPLE_RATE) is also compressed in-process
+with every algorithm to record the compression ratio and CPU cost per response
+size bucket in service metrics, so the threshold can be tuned per deployment.
+
+Environment:
+    COMPRESSION_MIN_BYTES          size threshold for default compression (16384)
+    COMPRESSION_SAMPLE_RATE        share of responses measured (0.05)
+    GRPC_MAX_SEND_MESSAGE_MB       largest response the server sends (64)
+    GRPC_MAX_RECEIVE_MESSAGE_MB    largest request the server accepts (4)
+    GRPC_UDS_PATH                  Unix domain socket also listened on, for callers on the same host
+"""
+import os
+import gzip
+import zlib
+import time
+import random
+import logging
+
+import grpc
+
+from service_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+METADATA_KEY = 'x-response-compression'
+
+ALGORITHMS = {
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+    'none': grpc.Compression.NoCompression,
+    'identity': grpc.Compression.NoCompression,
+}
+
+# Upper bounds (exclusive) of the response size buckets, in bytes
+SIZE_BUCKETS = [
+    (16 * 1024, 'lt_16k'),
+    (64 * 1024, '16k_64k'),
+    (256 * 1024, '64k_256k'),
+    (1024 * 1024, '256k_1m'),
+]
+
+SAMPLE_COMPRESSORS = {
+    'gzip': lambda data: gzip.compress(data, compresslevel=6),
+    'deflate': lambda data: zlib.compress(data, 6),
+}
+
+
+def size_bucket(size):
+    for limit, name in SIZE_BUCKETS:
+        if size < limit:
+            return name
+    return 'gte_1m'
+
+
+def grpc_server_options():
+    """Channel options applying the configured message size limits"""
+    max_send = int(float(os.getenv('GRPC_MAX_SEND_MESSAGE_MB', '64')) * 1024 * 1024)
+    max_receive = int(float(os.getenv('GRPC_MAX_RECEIVE_MESSAGE_MB', '4')) * 1024 * 1024)
+    return [
+        ('grpc.max_send_message_length', max_send),
+        ('grpc.max_receive_message_length', max_receive),
+    ]
+
+
+def add_uds_listener(server):
+    """
+    Also listen on the Unix domain socket GRPC_UDS_PATH when it is set
+
+    A socket file left behind by a previous run is removed first.
+
+    Returns:
+        The socket path, or '' when no socket is configured
+    """
+    uds_path = os.getenv('GRPC_UDS_PATH', '')
+    if uds_path:
+        if os.path.exists(uds_path):
+            os.remove(uds_path)
+        server.add_insecure_port(f'unix:{uds_path}')
+        logger.info(f"Also listening on unix:{uds_path}")
+    return uds_path
+
+
+class CompressionPolicy:
+    """Chooses and records the compression of each response"""
+
+    def __init__(self, min_bytes=16384, sample_rate=0.05):
+        self.min_bytes = min_bytes
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            min_bytes=int(os.getenv('COMPRESSION_MIN_BYTES', '16384')),
+            sample_rate=float(os.getenv('COMPRESSION_SAMPLE_RATE', '0.05'))
+        )
+
+    def choose(self, context, size):
+        """Name of the algorithm for a response of `size` bytes"""
+        for key, value in context.invocation_metadata() or ():
+            if key == METADATA_KEY:
+                requested = value.strip().lower()
+                if requested in ALGORITHMS:
+                    return requested
+                logger.warning(f"Ignoring unknown {METADATA_KEY} value '{value}'")
+                break
+        return 'gzip' if size >= self.min_bytes else 'none'
+
+    def apply(self, context, response):
+        """Set the compression of this call's response and sample its cost"""
+        size = response.ByteSize()
+        algorithm = self.choose(context, size)
+        context.set_compression(ALGORITHMS[algorithm])
+
+        bucket = size_bucket(size)
+        metrics.increment(f'responses.{bucket}.{algorithm}')
+        metrics.increment('response_bytes', size)
+        if self.sample_rate and random.random() < self.sample_rate:
+            self._sample(response.SerializeToString(), bucket)
+        return algorithm
+
+    def _sample(self, data, bucket):
+        """Measure ratio and CPU cost of each algorithm on one serialized response"""
+        for name, compress in SAMPLE_COMPRESSORS.items():
+            started = time.thread_time()
+            compressed = compress(data)
+            cpu_ms = (time.thread_time() - started) * 1000.0
+            metrics.observe(f'compression.{bucket}.{name}.ratio', len(data) / max(len(compressed), 1))
+            metrics.observe(f'compression.{bucket}.{name}.cpu_ms', cpu_ms)
@@ -0,0 +1,254 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PARAMETERS = 8
+
+# Simulated days between cancellation checks; coarse rollouts (step_days > 1)
+# cover more than this in one period, so they check every period
+CANCELLATION_CHECK_DAYS = 7
+
+
+def model_window(model):
+    """
+    Lookback window of a model from its input signature
+
+    Returns:
+        Tuple of (timesteps, features); features is None when the model does
+        not declare a (batch, timesteps, features) input
+    """
+    shape = getattr(model, 'input_shape', None)
+    if isinstance(shape, list):
+        shape = shape[0]
+    if shape is None or len(shape) != 3:
+        return 1, None
+    return int(shape[1] or 1), (int(shape[2]) if shape[2] else None)
+
+
+class RingWindow:
+    """
+    Fixed-length history of feature rows with a zero-copy window view
+
+    Rows live in a preallocated buffer shaped (batch, 2 * window, features)
+    and every row is written twice, at slot `i` and at its mirror
+    `i + window`. The last `window` rows are therefore always contiguous along
+    the time axis, so `view()` is a plain slice of the buffer: pushing a day
+    costs one row write (twice), never a re-stack of the window.
+    """
+
+    def __init__(self, initial_rows, window):
+        """
+        Args:
+            initial_rows: Array shaped (batch, features) repeated to fill the
+                window, or (batch, history, features) with the most recent
+                rows last; a short history is padded with its oldest row
+            window: Number of timesteps in the window
+        """
+        initial_rows = np.asarray(initial_rows, dtype=np.float64)
+        if initial_rows.ndim == 2:
+            initial_rows = initial_rows[:, None]
+        batch, history, features = initial_rows.shape
+        self.window = window
+        self._buffer = np.empty((batch, 2 * window, features))
+        self._head = 0
+
+        initial_rows = initial_rows[:, -window:]
+        padding = window - initial_rows.shape[1]
+        self._buffer[:, :padding] = initial_rows[:, :1]
+        self._buffer[:, padding:window] = initial_rows
+        self._buffer[:, window:] = self._buffer[:, :window]
+
+    def push(self, rows):
+        """Append rows shaped (batch, features), dropping the oldest"""
+        self._buffer[:, self._head] = rows
+        self._buffer[:, self._head + self.window] = rows
+        self._head = (self._head + 1) % self.window
+
+    def replace(self, rows):
+        """Overwrite the most recent rows shaped (batch, features)"""
+        last = (self._head - 1) % self.window
+        self._buffer[:, last] = rows
+        self._buffer[:, last + self.window] = rows
+
+    def view(self):
+        """The last `window` rows, oldest first, as a view shaped (batch, window, features)"""
+        return self._buffer[:, self._head:self._head + self.window]
+
+
+def predict_step(model, current_params, step=0, model_input=None):
+    """
+    Run one autoregressive model step for a batch of parameter vectors
+
+    Args:
+        model: Keras or mapped model taking (batch, timesteps, features)
+        current_params: Array shaped (batch, 8)
+        step: Step index, only used for logging
+        model_input: Window shaped (batch, timesteps, features); a single
+            timestep of current_params when not given
+
+    Returns:
+        Array shaped (batch, 8) with the predicted parameters, or
+        current_params when the model output cannot be used
+    """
+    try:
+        if model_input is None:
+            model_input = current_params.reshape(len(current_params), 1, -1)
+        predictions = np.asarray(model.predict(model_input, verbose=0))
+
+        # Ensure we have 8 parameters per row
+        predictions = predictions.reshape(len(current_params), -1)
+        if predictions.shape[1] < NUM_PARAMETERS:
+            return current_params
+        return predictions[:, :NUM_PARAMETERS].astype(np.float64)
+
+    except Exception as e:
+        logger.warning(f"Prediction error for day {step}: {str(e)}. Using current values.")
+        return current_params
+
+
+def step_stateful(model, current_params, step, model_input, state):
+    """
+    Run one step of a stateful step model (see stateful_inference.py)
+
+    model_input is the whole lookback window when state is None (warming the
+    state up) and the latest row shaped (batch, features) afterwards.
+
+    Returns:
+        Tuple of (predicted parameters shaped (batch, 8), new state); on
+        failure the current params and a state that forces a fresh warm-up
+    """
+    try:
+        if state is None:
+            predictions, state = model.warm_up(model_input)
+        else:
+            predictions, state = model.step(model_input, state)
+        predictions = np.asarray(predictions).reshape(len(current_params), -1)
+        if predictions.shape[1] < NUM_PARAMETERS:
+            return current_params, state
+        return predictions[:, :NUM_PARAMETERS].astype(np.float64), state
+
+    except Exception as e:
+        logger.warning(f"Prediction error for day {step}: {str(e)}. Using current values.")
+        return current_params, None
+
+
+def extrapolate_period(start, first, second, days):
+    """
+    Daily values over a period from two consecutive one-day model steps
+
+    Every parameter is taken to relax geometrically: its one-day change
+    `first - start` shrinks by the factor a = (second - first) / (first - start)
+    each day. a is clamped to [0, 1), so the extrapolation never oscillates and
+    grows at most linearly.
+
+    Args:
+        start, first, second: Arrays shaped (batch, 8) for days 0, 1 and 2
+        days: Length of the period
+
+    Returns:
+        Array shaped (batch, days, 8); day j is start + change * (1 - a^j) / (1 - a)
+    """
+    change = first - start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(np.abs(change) > 1e-12, (second - first) / change, 0.0)
+    rate = np.clip(rate, 0.0, 1.0 - 1e-6)[:, None]
+    elapsed = np.arange(1, days + 1)[None, :, None]
+    return start[:, None] + change[:, None] * (1.0 - rate ** elapsed) / (1.0 - rate)
+
+
+def _model_step(model, current_params, day, window, row, state, stateful):
+    """One model step from the window (or the latest row, for a warm stateful model)"""
+    if stateful and window is not None:
+        return step_stateful(model, current_params, day, window.view() if state is None else row, state)
+    return predict_step(model, current_params, day, window.view() if window is not None else None), state
+
+
+def rollout(model, initial_params, forecast_days, noise_scale=0.0, cancellation=None, weather=None,
+            history=None, step_days=1):
+    """
+    Autoregressively roll a batch of parameter vectors forward
+
+    Every step is one batched model call, so the cost of a rollout grows with
+    the horizon, not with the number of rows in the batch. With step_days > 1
+    each period of that many days costs two model steps, extrapolated over the
+    period with `extrapolate_period`. The window then holds one row per
+    period, its last day's parameters with the period's mean weather (see
+    multi_resolution.py for the error this introduces).
+
+    The model input is a window of the last `timesteps` days taken from the
+    model's input signature. Each row holds the 8 parameters, followed by the
+    day's weather when the model takes more features than that. The window
+    is kept in a RingWindow, so each step reads a view instead of copying it.
+    Stateful step models (see stateful_inference.py) read the window once to
+    warm up and then take a single row per day.
+
+    Args:
+        model: Keras or mapped model
+        initial_params: Array shaped (batch, 8)
+        forecast_days: Number of days to roll forward
+        noise_scale: Standard deviation of gaussian noise added after each step
+        cancellation: Optional CancellationToken checked every
+            CANCELLATION_CHECK_DAYS simulated days, or every period when
+            step_days > 1
+        weather: Array shaped (batch or 1, forecast_days, weather features)
+            for models that take weather; zeros when not given
+        history: Optional array shaped (batch, days, 8 + weather features) of
+            the parameters and weather of the days before the first forecast
+            day, most recent last; the window is otherwise filled with the
+            initial row
+        step_days: Days covered by each model step
+
+    Returns:
+        Array shaped (batch, forecast_days, 8)
+    """
+    current_params = np.asarray(initial_params, dtype=np.float64)
+    batch = len(current_params)
+    trajectory = np.empty((batch, forecast_days, current_params.shape[1]))
+
+    timesteps, features = model_window(model)
+    stateful = getattr(model, 'stateful', False)
+    state = None
+    window = None
+    row = None
+    if features is not None and features >= current_params.shape[1]:
+        extra = features - current_params.shape[1]
+        day_weather = np.zeros((batch, max(forecast_days, 1), extra))
+        if extra and weather is None:
+            logger.warning(f"Model takes {extra} weather features but no weather was given; using zeros")
+        elif extra and forecast_days:
+            day_weather[:] = np.asarray(weather)[:, :forecast_days, :extra]
+        initial_rows = np.concatenate([current_params, day_weather[:, 0]], axis=1)
+        window = RingWindow(initial_rows if history is None else np.asarray(history)[:, :, :features], timesteps)
+
+    for day in range(0, forecast_days, step_days):
+        end = min(day + step_days, forecast_days)
+        if cancellation is not None and (step_days > 1 or day % CANCELLATION_CHECK_DAYS == 0):
+            cancellation.check(f'rollout day {day + 1} of {forecast_days}')
+        predicted_params, state = _model_step(model, current_params, day, window, row, state, stateful)
+        if end - day > 1:
+            # A second step one day on gives each parameter's daily rate of
+            # relaxation, which is extrapolated over the rest of the period.
+            # Its input row is replaced by the period's row below, and a
+            # stateful model goes on from the state before it, so the window
+            # holds exactly one row per period.
+            if window is not None:
+                row = np.concatenate([predicted_params, day_weather[:, day]], axis=1)
+                window.push(row)
+            second_params, _ = _model_step(model, predicted_params, day + 1, window, row, state, stateful)
+            trajectory[:, day:end] = extrapolate_period(current_params, predicted_params, second_params, end - day)
+            predicted_params = trajectory[:, end - 1].copy()
+        if noise_scale:
+            predicted_params = predicted_params + np.random.normal(0, noise_scale, size=predicted_params.shape)
+        trajectory[:, end - 1] = predicted_params
+        current_params = predicted_params
+        if window is not None:
+            if end - day == 1:
+                row = np.concatenate([predicted_params, day_weather[:, day]], axis=1)
+                window.push(row)
+            else:
+                row = np.concatenate([predicted_params, day_weather[:, day:end].mean(axis=1)], axis=1)
+                window.replace(row)
+
+    return trajectory
@@ -0,0 +1,398 @@
+"""
+Site-affinity routing across PredictionsService replicas.
+
+The proxy serves PredictionsService and forwards every call to one replica
+chosen by consistent hashing of the request's routing key: the site_id when
+the request has one, otherwise its model_id. All calls for a site therefore
+reach the same replica, whose forecast state, caches and resident models
+serve it, and calls for the same model share a replica's loaded model.
+
+Each replica owns ROUTING_VNODES points on a hash ring and a key belongs to the
+first point clockwise of its hash. A replica joining takes over only the keys
+now closest to its points, and a replica leaving or failing hands its keys to
+the next replica on the ring; every other key stays where it was.
+
+Replicas are probed every ROUTING_HEALTH_INTERVAL_SECONDS by connecting to
+them. A call failing with UNAVAILABLE marks its replica down at once. Keys of
+a down replica fail over to the next healthy replica on the ring and return
+once a probe succeeds. Unary calls and server-streaming calls that have not
+sent a message yet are retried on the next replica; LiveForecast streams are
+not, because their updates have already been consumed.
+
+The proxy forwards the serialized messages unchanged. It only parses requests
+to read the routing key, and never re-encodes the (large) responses.
+
+Environment:
+    ROUTING_REPLICAS                    comma separated replica addresses (host:port)
+    ROUTING_PORT                        port the proxy listens on (50060)
+    ROUTING_VNODES                      ring points per replica (160)
+    ROUTING_HEALTH_INTERVAL_SECONDS     seconds between health probes (5)
+    ROUTING_PROBE_TIMEOUT_SECONDS       connect timeout of a probe (1)
+
+Usage:
+    python routing_proxy.py serve --replicas localhost:50061,localhost:50062,localhost:50063
+    python routing_proxy.py check --replicas a:1,b:1,c:1 --keys 10000
+
+A local setup runs each replica as `GRPC_PORT=50061 python server.py` (each
+with its own FORECAST_STATE_DB and MATERIALIZED_FORECAST_DB).
+"""
+import os
+import sys
+import bisect
+import hashlib
+import argparse
+import itertools
+import logging
+import threading
+from concurrent import futures
+
+import grpc
+
+import predictions_pb2
+from service_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SERVICE = 'predictions.PredictionsService'
+
+# time_remaining() of a call above this means the caller set no deadline
+NO_DEADLINE_SECONDS = 1e9
+
+
+def _routing_key(site_id, model_id):
+    return f'site:{site_id}' if site_id else f'model:{model_id or "default"}'
+
+
+def _export_key(request):
+    first = request.requests[0] if request.requests else predictions_pb2.PredictionRequest()
+    return _routing_key(first.site_id, first.model_id)
+
+
+# RPC name to (cardinality, request message, routing key of a request)
+METHODS = {
+    'GetPredictions': ('unary_unary', predictions_pb2.PredictionRequest,
+                       lambda r: _routing_key(r.site_id, r.model_id)),
+    'AdvanceForecast': ('unary_unary', predictions_pb2.AdvanceForecastRequest,
+                        lambda r: _routing_key(r.site_id, '')),
+    'SweepScenarios': ('unary_unary', predictions_pb2.ScenarioSweepRequest,
+                       lambda r: _routing_key('', r.model_id)),
+    'ExportForecasts': ('unary_stream', predictions_pb2.ForecastExportRequest, _export_key),
+    'LiveForecast': ('stream_stream', predictions_pb2.LiveForecastUpdate,
+                     lambda r: _routing_key(r.site_id, r.model_id)),
+}
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes"""
+
+    def __init__(self, nodes=(), vnodes=160):
+        self.vnodes = vnodes
+        self.nodes = set()
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.vnodes):
+            point = _hash(f'{node}#{replica}')
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def preference(self, key):
+        """Distinct nodes in ring order starting with the owner of key"""
+        if not self._points:
+            return []
+        start = bisect.bisect(self._points, _hash(key))
+        seen = []
+        for offset in range(len(self._points)):
+            owner = self._owners[(start + offset) % len(self._points)]
+            if owner not in seen:
+                seen.append(owner)
+                if len(seen) == len(self.nodes):
+                    break
+        return seen
+
+    def owner(self, key):
+        preference = self.preference(key)
+        return preference[0] if preference else None
+
+
+class Replica:
+    """One PredictionsService replica and the channel to it"""
+
+    def __init__(self, address):
+        self.address = address
+        self.channel = grpc.insecure_channel(address)
+        self.healthy = True
+
+    def call(self, method, cardinality):
+        """Multi-callable forwarding serialized messages to the replica"""
+        factory = getattr(self.channel, cardinality)
+        return factory(f'/{SERVICE}/{method}', request_serializer=None, response_deserializer=None)
+
+
+class ReplicaPool:
+    """Replicas on a hash ring, with health probing and failover order"""
+
+    def __init__(self, addresses=(), vnodes=160, health_interval=5.0, probe_timeout=1.0):
+        self.ring = HashRing(vnodes=vnodes)
+        self.replicas = {}
+        self.health_interval = health_interval
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        for address in addresses:
+            self.add(address)
+
+    @classmethod
+    def from_env(cls, addresses=None):
+        if addresses is None:
+            addresses = [a.strip() for a in os.getenv('ROUTING_REPLICAS', '').split(',') if a.strip()]
+        return cls(
+            addresses,
+            vnodes=int(os.getenv('ROUTING_VNODES', '160')),
+            health_interval=float(os.getenv('ROUTING_HEALTH_INTERVAL_SECONDS', '5')),
+            probe_timeout=float(os.getenv('ROUTING_PROBE_TIMEOUT_SECONDS', '1'))
+        )
+
+    def add(self, address):
+        with self._lock:
+            if address in self.replicas:
+                return
+            self.replicas[address] = Replica(address)
+            self.ring.add(address)
+        logger.info(f"Replica {address} joined the ring")
+
+    def remove(self, address):
+        with self._lock:
+            replica = self.replicas.pop(address, None)
+            self.ring.remove(address)
+        if replica is not None:
+            replica.channel.close()
+            logger.info(f"Replica {address} left the ring")
+
+    def route(self, key):
+        """Replicas to try for key: healthy ones in ring order, then the down ones"""
+        with self._lock:
+            replicas = [self.replicas[address] for address in self.ring.preference(key)]
+        healthy = [replica for replica in replicas if replica.healthy]
+        if replicas and healthy and healthy[0] is not replicas[0]:
+            metrics.increment('routing.failovers')
+        return healthy + [replica for replica in replicas if not replica.healthy]
+
+    def mark_down(self, replica, reason):
+        if replica.healthy:
+            replica.healthy = False
+            metrics.increment('routing.replicas_down')
+            logger.warning(f"Replica {replica.address} marked down: {reason}")
+
+    def probe(self):
+        """Probe every replica once; returns the addresses of the healthy ones"""
+        with self._lock:
+            replicas = list(self.replicas.values())
+        for replica in replicas:
+            ready = grpc.channel_ready_future(replica.channel)
+            try:
+                ready.result(timeout=self.probe_timeout)
+                if not replica.healthy:
+                    replica.healthy = True
+                    logger.info(f"Replica {replica.address} is healthy again")
+            except grpc.FutureTimeoutError:
+                ready.cancel()
+                self.mark_down(replica, 'health probe timed out')
+        return [replica.address for replica in replicas if replica.healthy]
+
+    def start(self):
+        """Probe the replicas from a daemon thread until stop() is called"""
+        if self._thread is not None or self.health_interval <= 0:
+            return
+
+        def loop():
+            while not self._stop.wait(self.health_interval):
+                try:
+                    self.probe()
+                except Exception as e:
+                    logger.error(f"Replica health probe failed: {str(e)}", exc_info=True)
+
+        self._thread = threading.Thread(target=loop, name='replica-health', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+class RoutingProxy:
+    """Generic gRPC handlers forwarding PredictionsService calls to the routed replica"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def handler(self):
+        handlers = {}
+        for method, (cardinality, message, key_of) in METHODS.items():
+            forward = getattr(self, f'_forward_{cardinality}')
+            handlers[method] = getattr(grpc, f'{cardinality}_rpc_method_handler')(
+                self._bind(forward, method, cardinality, message, key_of),
+                request_deserializer=None,
+                response_serializer=None
+            )
+        return grpc.method_handlers_generic_handler(SERVICE, handlers)
+
+    def _bind(self, forward, method, cardinality, message, key_of):
+        def handle(request, context):
+            return forward(method, cardinality, message, key_of, request, context)
+        return handle
+
+    def _call_options(self, context):
+        metadata = [(k, v) for k, v in context.invocation_metadata() if not k.startswith(('grpc-', ':'))]
+        remaining = context.time_remaining()
+        # Calls without a deadline report one centuries away
+        timeout = remaining if remaining < NO_DEADLINE_SECONDS else None
+        return {'timeout': timeout, 'metadata': metadata}
+
+    def _replicas(self, key, context):
+        replicas = self.pool.route(key)
+        if not replicas:
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'No replicas configured')
+        metrics.increment('routing.requests')
+        return replicas
+
+    def _forward_unary_unary(self, method, cardinality, message, key_of, request, context):
+        key = key_of(message.FromString(request))
+        for replica in self._replicas(key, context):
+            call = replica.call(method, cardinality).future(request, **self._call_options(context))
+            context.add_callback(call.cancel)
+            try:
+                return call.result()
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.UNAVAILABLE:
+                    context.abort(e.code(), e.details())
+                self.pool.mark_down(replica, e.details())
+        context.abort(grpc.StatusCode.UNAVAILABLE, f'No replica available for {key}')
+
+    def _forward_unary_stream(self, method, cardinality, message, key_of, request, context):
+        key = key_of(message.FromString(request))
+        for replica in self._replicas(key, context):
+            responses = replica.call(method, cardinality)(request, **self._call_options(context))
+            context.add_callback(responses.cancel)
+            sent = False
+            try:
+                for response in responses:
+                    sent = True
+                    yield response
+                return
+            except grpc.RpcError as e:
+                if sent or e.code() != grpc.StatusCode.UNAVAILABLE:
+                    context.abort(e.code(), e.details())
+                self.pool.mark_down(replica, e.details())
+        context.abort(grpc.StatusCode.UNAVAILABLE, f'No replica available for {key}')
+
+    def _forward_stream_stream(self, method, cardinality, message, key_of, request_iterator, context):
+        # The first update carries the site the stream is for
+        first = next(request_iterator, None)
+        if first is None:
+            return
+        key = key_of(message.FromString(first))
+        replica = self._replicas(key, context)[0]
+        responses = replica.call(method, cardinality)(
+            itertools.chain([first], request_iterator), **self._call_options(context)
+        )
+        context.add_callback(responses.cancel)
+        try:
+            for response in responses:
+                yield response
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.UNAVAILABLE:
+                self.pool.mark_down(replica, e.details())
+            context.abort(e.code(), e.details())
+
+
+def check_distribution(addresses, keys=10000, vnodes=160):
+    """
+    Share of keys per replica and the keys that move when the last replica
+    leaves or a new one joins
+
+    Returns:
+        Dictionary with 'shares', 'moved_on_leave' and 'moved_on_join' (fractions of keys)
+    """
+    ring = HashRing(addresses, vnodes)
+    names = [f'site-{index}' for index in range(keys)]
+    owners = {name: ring.owner(name) for name in names}
+    shares = {address: 0 for address in addresses}
+    for owner in owners.values():
+        shares[owner] += 1
+
+    ring.remove(addresses[-1])
+    moved_on_leave = sum(ring.owner(name) != owners[name] for name in names)
+    ring.add(addresses[-1])
+    ring.add('joining-replica')
+    moved_on_join = sum(ring.owner(name) != owners[name] for name in names)
+    return {
+        'shares': {address: count / keys for address, count in shares.items()},
+        'moved_on_leave': moved_on_leave / keys,
+        'moved_on_join': moved_on_join / keys,
+    }
+
+
+def serve(port, addresses):
+    pool = ReplicaPool.from_env(addresses)
+    if not pool.replicas:
+        logger.error("No replicas to route to; set ROUTING_REPLICAS or pass --replicas")
+        return 1
+    pool.probe()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=32))
+    server.add_generic_rpc_handlers((RoutingProxy(pool).handler(),))
+    server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    pool.start()
+    logger.info(f"Routing proxy on port {port} over replicas {', '.join(pool.replicas)}")
+    server.wait_for_termination()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route PredictionsService calls to replicas by site or model')
+    parser.add_argument('command', choices=['serve', 'check'])
+    parser.add_argument('--replicas', default=os.getenv('ROUTING_REPLICAS', ''), help='comma separated host:port')
+    parser.add_argument('--port', type=int, default=int(os.getenv('ROUTING_PORT', '50060')))
+    parser.add_argument('--keys', type=int, default=10000, help='site keys hashed by check')
+    args = parser.parse_args()
+    addresses = [a.strip() for a in args.replicas.split(',') if a.strip()]
+
+    if args.command == 'serve':
+        return serve(args.port, addresses)
+
+    if len(addresses) < 2:
+        print('check needs at least two replicas')
+        return 1
+    result = check_distribution(addresses, args.keys, int(os.getenv('ROUTING_VNODES', '160')))
+    for address, share in result['shares'].items():
+        print(f'  {address:<24}{share:>8.1%}')
+    print(f"  {addresses[-1]} leaving moves {result['moved_on_leave']:.1%} of keys "
+          f"(its own share was {result['shares'][addresses[-1]]:.1%})")
+    print(f"  a replica joining moves {result['moved_on_join']:.1%} of keys "
+          f"(ideal {1 / (len(addresses) + 1):.1%})")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+What-if scenario sweeps over the current input values.
+
+Every scenario is the base CurrentValues plus a set of per-parameter deltas.
+All scenarios, together with a central finite-difference probe pair for each
+parameter, are stacked into one batch and rolled out together, so a sweep of
+hundreds of scenarios costs one batched model call per horizon day.
+"""
+import itertools
+
+import numpy as np
+
+import production
+from rollout import rollout
+
+# Relative finite-difference step of the sensitivity probes (with an absolute
+# floor for parameters that sit at zero)
+SENSITIVITY_STEP = 0.01
+SENSITIVITY_MIN_STEP = 1e-3
+# Longest rollout a sweep may request: through the end of a 12th month
+MAX_HORIZON_DAYS = 366
+
+
+class SweepError(ValueError):
+    """Raised when a sweep request is malformed"""
+
+
+def build_scenarios(parameter_names, grid, scenarios, max_scenarios):
+    """
+    Expand a grid and an explicit scenario list into named delta dictionaries
+
+    Args:
+        parameter_names: Valid parameter names
+        grid: List of (parameter, [deltas]) whose cartesian product is swept
+        scenarios: List of (name, {parameter: delta}) explicit scenarios
+        max_scenarios: Upper bound on the number of scenarios
+
+    Returns:
+        List of (name, {parameter: delta}); the unperturbed base scenario is
+        always first
+    """
+    for parameter, _ in grid:
+        if parameter not in parameter_names:
+            raise SweepError(f"Unknown parameter '{parameter}' in grid")
+    for name, deltas in scenarios:
+        for parameter in deltas:
+            if parameter not in parameter_names:
+                raise SweepError(f"Unknown parameter '{parameter}' in scenario '{name}'")
+
+    expanded = [('base', {})]
+    if grid:
+        grid_size = int(np.prod([len(deltas) for _, deltas in grid]))
+        if grid_size + len(scenarios) + 1 > max_scenarios:
+            raise SweepError(f"Sweep of {grid_size + len(scenarios) + 1} scenarios exceeds the limit of {max_scenarios}")
+        parameters = [parameter for parameter, _ in grid]
+        for combination in itertools.product(*[deltas for _, deltas in grid]):
+            deltas = dict(zip(parameters, combination))
+            name = ', '.join(f'{parameter}{delta:+g}' for parameter, delta in deltas.items())
+            expanded.append((name, deltas))
+    for index, (name, deltas) in enumerate(scenarios):
+        expanded.append((name or f'scenario_{index + 1}', dict(deltas)))
+
+    if len(expanded) > max_scenarios:
+        raise SweepError(f"Sweep of {len(expanded)} scenarios exceeds the limit of {max_scenarios}")
+    return expanded
+
+
+def check_horizon(horizon_days, max_horizon_days=MAX_HORIZON_DAYS):
+    """Raise SweepError unless 1 <= horizon_days <= max_horizon_days"""
+    if not 1 <= horizon_days <= max_horizon_days:
+        raise SweepError(f"horizon_days must be between 1 and {max_horizon_days}, got {horizon_days}")
+
+
+def run_sweep(model, parameter_names, base_params, scenarios, start_date, horizon_days, months=12,
+              cancellation=None, weather=None, max_horizon_days=MAX_HORIZON_DAYS):
+    """
+    Roll out all scenarios and the sensitivity probes as one batch
+
+    weather, shaped (1, horizon_days, features), is shared by every row for
+    models that take weather inputs.
+
+    Returns:
+        Dictionary with per-scenario 'summaries' and per-parameter 'sensitivities'
+    """
+    check_horizon(horizon_days, max_horizon_days)
+    name_index = {name: i for i, name in enumerate(parameter_names)}
+    scenario_inputs = np.repeat(base_params.reshape(1, -1), len(scenarios), axis=0)
+    for row, (_, deltas) in enumerate(scenarios):
+        for parameter, delta in deltas.items():
+            scenario_inputs[row, name_index[parameter]] += delta
+
+    # Central difference probes: base + step and base - step for every parameter
+    steps = np.maximum(np.abs(base_params) * SENSITIVITY_STEP, SENSITIVITY_MIN_STEP)
+    probes = np.repeat(base_params.reshape(1, -1), 2 * len(parameter_names), axis=0)
+    for i in range(len(parameter_names)):
+        probes[2 * i, i] += steps[i]
+        probes[2 * i + 1, i] -= steps[i]
+
+    batch = np.concatenate([scenario_inputs, probes])
+    trajectories = rollout(model, batch, horizon_days, cancellation=cancellation, weather=weather)
+    if cancellation is not None:
+        cancellation.check('aggregation')
+    daily = production.daily_production(trajectories)
+    month_labels, monthly = production.monthly_totals(daily, start_date, months)
+    totals = monthly.sum(axis=1)
+    seasons = production.seasonal_totals(month_labels, monthly)
+
+    summaries = []
+    for row, (name, deltas) in enumerate(scenarios):
+        summaries.append({
+            'name': name,
+            'deltas': deltas,
+            'total_production': float(totals[row]),
+            'monthly_totals': [
+                {'month': label, 'production': float(monthly[row, index])}
+                for index, label in enumerate(month_labels)
+            ],
+            'seasonal_totals': {season: float(values[row]) for season, values in seasons.items()}
+        })
+
+    base_total = totals[0]
+    probe_totals = totals[len(scenarios):]
+    sensitivities = []
+    for i, parameter in enumerate(parameter_names):
+        slope = (probe_totals[2 * i] - probe_totals[2 * i + 1]) / (2 * steps[i])
+        elasticity = slope * base_params[i] / base_total if base_total else 0.0
+        sensitivities.append({
+            'parameter': parameter,
+            'production_per_unit': float(slope),
+            'elasticity': float(elasticity)
+        })
+
+    return {'summaries': summaries, 'sensitivities': sensitivities}
@@ -2,155 +2,497 @@ import grpc
 from concurrent import futures
 import predictions_pb2
 import predictions_pb2_grpc
-from ml_predictor import MLPredictor
+from ml_predictor import (
+    MLPredictor, AdvanceError, FieldMaskError, ForecastDaysError, ForecastStateNotFoundError,
+    ForecastStateUnavailableError
+)
+from model_registry import ModelNotFoundError
+from multi_resolution import HorizonModeError
+from cancellation import CancellationToken, PredictionCancelled
+from service_metrics import metrics
+from response_compression import CompressionPolicy, add_uds_listener, grpc_server_options
+import scenario_sweep
+import forecast_export
+from forecast_scheduler import PrecomputeScheduler
+from live_forecast import LiveSession, LiveSessionError
+from log_shipping import configure_logging
+from shared_results import SharedResultStore, SharedResultError
 import logging
-import sys
+import time
+import os
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    stream=sys.stdout
-)
 logger = logging.getLogger(__name__)
 
+SERVICE_NAME = 'crystallization-ml-service'
+
 
 class PredictionsService(predictions_pb2_grpc.PredictionsServiceServicer):
     def __init__(self):
         self.predictor = MLPredictor()
+        self.compression = CompressionPolicy.from_env()
+        self.scheduler = PrecomputeScheduler.from_env(self.predictor)
+        self.shared_results = SharedResultStore.from_env()
         logger.info("Predictions service initialized")
 
     def GetPredictions(self, request, context):
+        started = time.perf_counter()
         try:
-            logger.info(f"Received prediction request for {request.forecast_days} days starting {request.start_date}")
+            logger.info(
+                f"Received prediction request for {request.forecast_days} days starting {request.start_date}"
+                f" (model: {request.model_id or 'default'})"
+            )
             
             # Extract request data
-            current_values = {
-                'water_temperature': request.current_values.water_temperature,
-                'lagoon': request.current_values.lagoon,
-                'OR_brine_level': request.current_values.OR_brine_level,
-                'OR_bund_level': request.current_values.OR_bund_level,
-                'IR_brine_level': request.current_values.IR_brine_level,
-                'IR_bound_level': request.current_values.IR_bound_level,
-                'East_channel': request.current_values.East_channel,
-                'West_channel': request.current_values.West_channel,
-            }
+            current_values = self._current_values(request.current_values)
+            cancellation = CancellationToken.from_grpc_context(context)
             
             # Get predictions from ML model
             prediction_result = self.predictor.predict(
                 start_date=request.start_date,
                 forecast_days=request.forecast_days,
-                current_values=current_values
+                current_values=current_values,
+                model_id=request.model_id,
+                site_id=request.site_id,
+                fields=list(request.fields),
+                horizon_mode=request.horizon_mode,
+                known_version=request.known_version,
+                cancellation=cancellation
             )
             
             # Build response
+            cancellation.check('encoding')
             response = self._build_response(prediction_result)
-            logger.info("Prediction completed successfully")
+            self.compression.apply(context, response)
+            logger.info("Prediction completed successfully", extra=self._log_fields(
+                'GetPredictions', started,
+                site_id=request.site_id,
+                model_id=request.model_id or 'default',
+                model_version=prediction_result.get('model_version'),
+                horizon_days=request.forecast_days,
+                horizon_mode=request.horizon_mode or self.predictor.horizon_mode,
+                status=prediction_result['status'],
+                forecast_version=prediction_result.get('version')
+            ))
             return response
             
+        except PredictionCancelled as e:
+            self._abandon('GetPredictions', e, context)
+            return predictions_pb2.PredictionResponse(status="cancelled")
+        except (FieldMaskError, ForecastDaysError, HorizonModeError) as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return predictions_pb2.PredictionResponse(status="error")
+        except ModelNotFoundError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return predictions_pb2.PredictionResponse(status="error")
         except Exception as e:
-            logger.error(f"Error during prediction: {str(e)}", exc_info=True)
+            logger.error(f"Error during prediction: {str(e)}", exc_info=True, extra=self._log_fields(
+                'GetPredictions', started, site_id=request.site_id, model_id=request.model_id or 'default',
+                horizon_days=request.forecast_days, status='error'
+            ))
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f'Prediction failed: {str(e)}')
             return predictions_pb2.PredictionResponse(status="error")
 
+    def AdvanceForecast(self, request, context):
+        started = time.perf_counter()
+        try:
+            logger.info(f"Received advance request for site {request.site_id} observed on {request.observed_date}")
+            
+            cancellation = CancellationToken.from_grpc_context(context)
+            prediction_result, reused, model_steps = self.predictor.advance(
+                site_id=request.site_id,
+                observed_date=request.observed_date,
+                observed_values=self._current_values(request.observed_values),
+                tolerance=request.tolerance or None,
+                cancellation=cancellation
+            )
+            
+            cancellation.check('encoding')
+            response = predictions_pb2.AdvanceForecastResponse(
+                reused_trajectory=reused,
+                model_steps=model_steps
+            )
+            response.forecast.CopyFrom(self._build_response(prediction_result))
+            self.compression.apply(context, response)
+            logger.info("Advance completed successfully", extra=self._log_fields(
+                'AdvanceForecast', started,
+                site_id=request.site_id,
+                model_version=prediction_result.get('model_version'),
+                horizon_days=model_steps,
+                status=prediction_result['status'],
+                forecast_version=prediction_result.get('version')
+            ))
+            return response
+            
+        except PredictionCancelled as e:
+            self._abandon('AdvanceForecast', e, context)
+            return predictions_pb2.AdvanceForecastResponse(
+                forecast=predictions_pb2.PredictionResponse(status="cancelled")
+            )
+        except (ForecastStateNotFoundError, ModelNotFoundError) as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return predictions_pb2.AdvanceForecastResponse(
+                forecast=predictions_pb2.PredictionResponse(status="error")
+            )
+        except ForecastStateUnavailableError as e:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(str(e))
+            return predictions_pb2.AdvanceForecastResponse(
+                forecast=predictions_pb2.PredictionResponse(status="error")
+            )
+        except AdvanceError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return predictions_pb2.AdvanceForecastResponse(
+                forecast=predictions_pb2.PredictionResponse(status="error")
+            )
+        except Exception as e:
+            logger.error(f"Error during forecast advance: {str(e)}", exc_info=True, extra=self._log_fields(
+                'AdvanceForecast', started, site_id=request.site_id, status='error'
+            ))
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f'Advance failed: {str(e)}')
+            return predictions_pb2.AdvanceForecastResponse(
+                forecast=predictions_pb2.PredictionResponse(status="error")
+            )
+
+    def SweepScenarios(self, request, context):
+        started = time.perf_counter()
+        try:
+            logger.info(
+                f"Received scenario sweep starting {request.start_date} with {len(request.grid)} grid "
+                f"parameters and {len(request.scenarios)} explicit scenarios"
+            )
+            
+            cancellation = CancellationToken.from_grpc_context(context)
+            sweep_result = self.predictor.sweep(
+                start_date=request.start_date,
+                horizon_days=request.horizon_days,
+                base_values=self._current_values(request.base_values),
+                grid=[(g.parameter, list(g.deltas)) for g in request.grid],
+                scenarios=[(sc.name, dict(sc.deltas)) for sc in request.scenarios],
+                model_id=request.model_id,
+                cancellation=cancellation
+            )
+            
+            cancellation.check('encoding')
+            
+            response = predictions_pb2.ScenarioSweepResponse(
+                status=sweep_result['status'],
+                horizon_days=sweep_result['horizon_days']
+            )
+            for summary in sweep_result['summaries']:
+                response.scenarios.append(predictions_pb2.ScenarioSummary(
+                    name=summary['name'],
+                    deltas=summary['deltas'],
+                    total_production=summary['total_production'],
+                    monthly_totals=[
+                        predictions_pb2.MonthProduction(month=m['month'], production=m['production'])
+                        for m in summary['monthly_totals']
+                    ],
+                    seasonal_totals=summary['seasonal_totals']
+                ))
+            for sensitivity in sweep_result['sensitivities']:
+                response.sensitivities.append(predictions_pb2.Sensitivity(**sensitivity))
+            response.model_info.CopyFrom(self._build_model_info(sweep_result['model_info']))
+            self.compression.apply(context, response)
+            logger.info(
+                f"Scenario sweep of {len(response.scenarios)} scenarios completed successfully",
+                extra=self._log_fields(
+                    'SweepScenarios', started, model_id=request.model_id or 'default',
+                    horizon_days=sweep_result['horizon_days'], status='success'
+                )
+            )
+            return response
+            
+        except PredictionCancelled as e:
+            self._abandon('SweepScenarios', e, context)
+            return predictions_pb2.ScenarioSweepResponse(status="cancelled")
+        except scenario_sweep.SweepError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return predictions_pb2.ScenarioSweepResponse(status="error")
+        except ModelNotFoundError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return predictions_pb2.ScenarioSweepResponse(status="error")
+        except Exception as e:
+            logger.error(f"Error during scenario sweep: {str(e)}", exc_info=True, extra=self._log_fields(
+                'SweepScenarios', started, model_id=request.model_id or 'default', status='error'
+            ))
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f'Sweep failed: {str(e)}')
+            return predictions_pb2.ScenarioSweepResponse(status="error")
+
+    def ExportForecasts(self, request, context):
+        started = time.perf_counter()
+        try:
+            logger.info(f"Received forecast export of {len(request.requests)} requests")
+            
+            cancellation = CancellationToken.from_grpc_context(context)
+            requests = [
+                {
+                    'site_id': r.site_id,
+                    'start_date': r.start_date,
+                    'forecast_days': r.forecast_days,
+                    'current_values': self._current_values(r.current_values),
+                    'model_id': r.model_id,
+                    'horizon_mode': r.horizon_mode
+                }
+                for r in request.requests
+            ]
+            batches = forecast_export.export_batches(
+                self.predictor, requests,
+                tables=list(request.tables),
+                chunk_size=request.chunk_size or forecast_export.DEFAULT_CHUNK_SIZE,
+                cancellation=cancellation
+            )
+            
+            sent = 0
+            shared_memory = request.shared_memory and self.shared_results.enabled
+            for table, batch in batches:
+                message = predictions_pb2.ArrowRecordBatch(table=table, num_rows=batch.num_rows)
+                if shared_memory:
+                    try:
+                        message.shm_name, message.shm_size = self.shared_results.put_batch(batch)
+                    except SharedResultError as e:
+                        logger.warning(f"Sending export batch inline: {str(e)}")
+                        metrics.increment('shm_results.fallbacks')
+                        shared_memory = False
+                if not message.shm_name:
+                    message.ipc_stream = forecast_export.serialize_batch(batch)
+                if sent == 0:
+                    self.compression.apply(context, message)
+                sent += 1
+                yield message
+            logger.info(
+                f"Forecast export completed successfully ({sent} record batches)",
+                extra=self._log_fields('ExportForecasts', started, batches=sent, status='success')
+            )
+            
+        except PredictionCancelled as e:
+            self._abandon('ExportForecasts', e, context)
+        except (forecast_export.ExportError, HorizonModeError) as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+        except ModelNotFoundError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+        except Exception as e:
+            logger.error(f"Error during forecast export: {str(e)}", exc_info=True, extra=self._log_fields(
+                'ExportForecasts', started, status='error'
+            ))
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f'Export failed: {str(e)}')
+
+    def LiveForecast(self, request_iterator, context):
+        started = time.perf_counter()
+        session = LiveSession(self.predictor)
+        try:
+            logger.info("Live forecast stream opened")
+            
+            cancellation = CancellationToken.from_grpc_context(context)
+            sent = 0
+            for update in request_iterator:
+                delta = session.update(
+                    site_id=update.site_id,
+                    start_date=update.start_date,
+                    forecast_days=update.forecast_days,
+                    current_values=self._current_values(update.current_values),
+                    model_id=update.model_id,
+                    tolerance=update.tolerance or None,
+                    cancellation=cancellation
+                )
+                # Nothing moved beyond the tolerance, so there is nothing to push
+                if not delta['full'] and not delta['changed_days']:
+                    continue
+                
+                message = predictions_pb2.LiveForecastDelta(
+                    site_id=delta['site_id'],
+                    update_sequence=delta['update_sequence'],
+                    forecast_start_date=delta['forecast_start_date'],
+                    total_days=delta['total_days'],
+                    full=delta['full'],
+                    changed_days=[self._build_daily_forecast(day) for day in delta['changed_days']]
+                )
+                if sent == 0:
+                    self.compression.apply(context, message)
+                sent += 1
+                yield message
+            logger.info(
+                f"Live forecast stream for site {session.site_id} closed after {session.sequence} updates "
+                f"({sent} pushed)",
+                extra=self._log_fields(
+                    'LiveForecast', started, site_id=session.site_id, updates=session.sequence, status='success'
+                )
+            )
+            
+        except PredictionCancelled as e:
+            self._abandon('LiveForecast', e, context)
+        except LiveSessionError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+        except ModelNotFoundError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+        except Exception as e:
+            logger.error(f"Error during live forecast: {str(e)}", exc_info=True, extra=self._log_fields(
+                'LiveForecast', started, site_id=session.site_id, updates=session.sequence, status='error'
+            ))
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f'Live forecast failed: {str(e)}')
+
+    def _log_fields(self, rpc, started, **fields):
+        """Structured log fields of an RPC (see log_shipping.STRUCTURED_FIELDS)"""
+        fields.update(rpc=rpc, latency_ms=round((time.perf_counter() - started) * 1000.0, 3))
+        return fields
+    
+    def _abandon(self, method, error, context):
+        """Record work stopped because the caller went away or ran out of time"""
+        metrics.increment('requests_abandoned')
+        metrics.increment(f'requests_abandoned.{method}')
+        metrics.increment(f'requests_abandoned.{error.reason.replace(" ", "_")}')
+        logger.info(f"{method} abandoned: {str(error)}")
+        if error.reason == 'deadline exceeded':
+            context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED)
+        else:
+            context.set_code(grpc.StatusCode.CANCELLED)
+        context.set_details(str(error))
+
+    def _current_values(self, values):
+        """Convert a CurrentValues message to the predictor's dictionary form"""
+        return {
+            'water_temperature': values.water_temperature,
+            'lagoon': values.lagoon,
+            'OR_brine_level': values.OR_brine_level,
+            'OR_bund_level': values.OR_bund_level,
+            'IR_brine_level': values.IR_brine_level,
+            'IR_bound_level': values.IR_bound_level,
+            'East_channel': values.East_channel,
+            'West_channel': values.West_channel,
+        }
+
     def _build_response(self, data):
-        """Build gRPC response from prediction data"""
+        """Build gRPC response from prediction data, encoding only the sections present"""
         response = predictions_pb2.PredictionResponse(
-            status=data['status']
+            status=data['status'],
+            version=data.get('version', ''),
+            base_version=data.get('base_version', '')
         )
         
         # Daily parameters forecast
-        daily_forecast = predictions_pb2.DailyParametersForecast(
-            forecast_type=data['daily_parameters_forecast']['forecast_type'],
-            forecast_start_date=data['daily_parameters_forecast']['forecast_start_date'],
-            forecast_end_date=data['daily_parameters_forecast']['forecast_end_date'],
-            total_days=data['daily_parameters_forecast']['total_days']
-        )
-        
-        for forecast in data['daily_parameters_forecast']['forecasts']:
-            daily_item = predictions_pb2.DailyForecast(
-                date=forecast['date'],
-                day_number=forecast['day_number'],
-                parameters=predictions_pb2.Parameters(
-                    water_temperature=forecast['parameters']['water_temperature'],
-                    lagoon=forecast['parameters']['lagoon'],
-                    OR_brine_level=forecast['parameters']['OR_brine_level'],
-                    OR_bund_level=forecast['parameters']['OR_bund_level'],
-                    IR_brine_level=forecast['parameters']['IR_brine_level'],
-                    IR_bound_level=forecast['parameters']['IR_bound_level'],
-                    East_channel=forecast['parameters']['East_channel'],
-                    West_channel=forecast['parameters']['West_channel']
-                ),
-                weather=predictions_pb2.Weather(
-                    temperature_mean=forecast['weather']['temperature_mean'],
-                    temperature_min=forecast['weather']['temperature_min'],
-                    temperature_max=forecast['weather']['temperature_max'],
-                    rain_sum=forecast['weather']['rain_sum'],
-                    wind_speed_max=forecast['weather']['wind_speed_max'],
-                    wind_gusts_max=forecast['weather']['wind_gusts_max'],
-                    relative_humidity_mean=forecast['weather']['relative_humidity_mean']
-                )
+        if 'daily_parameters_forecast' in data:
+            daily_forecast = predictions_pb2.DailyParametersForecast(
+                forecast_type=data['daily_parameters_forecast']['forecast_type'],
+                forecast_start_date=data['daily_parameters_forecast']['forecast_start_date'],
+                forecast_end_date=data['daily_parameters_forecast']['forecast_end_date'],
+                total_days=data['daily_parameters_forecast']['total_days']
             )
-            daily_forecast.forecasts.append(daily_item)
-        
-        response.daily_parameters_forecast.CopyFrom(daily_forecast)
+            
+            for forecast in data['daily_parameters_forecast']['forecasts']:
+                daily_item = self._build_daily_forecast(forecast)
+                daily_forecast.forecasts.append(daily_item)
+            
+            response.daily_parameters_forecast.CopyFrom(daily_forecast)
         
         # Monthly production 6 months
-        monthly_6 = self._build_monthly_forecast(data['monthly_production_6months'])
-        response.monthly_production_6months.CopyFrom(monthly_6)
+        if 'monthly_production_6months' in data:
+            monthly_6 = self._build_monthly_forecast(data['monthly_production_6months'])
+            response.monthly_production_6months.CopyFrom(monthly_6)
         
         # Monthly production 12 months
-        monthly_12 = self._build_monthly_forecast(data['monthly_production_12months'])
-        response.monthly_production_12months.CopyFrom(monthly_12)
+        if 'monthly_production_12months' in data:
+            monthly_12 = self._build_monthly_forecast(data['monthly_production_12months'])
+            response.monthly_production_12months.CopyFrom(monthly_12)
         
         # Seasonal production
-        seasonal = predictions_pb2.SeasonalProduction(
-            forecast_type=data['seasonal_production']['forecast_type'],
-            forecast_period=data['seasonal_production']['forecast_period']
-        )
-        
-        for season_name, season_data in data['seasonal_production']['seasons'].items():
-            season_msg = predictions_pb2.SeasonData(
-                months_count=season_data['months_count'],
-                total_production=season_data['total_production']
-            )
-            for month in season_data['months']:
-                month_prod = predictions_pb2.MonthProduction(
-                    month=month['month'],
-                    production=month['production']
+        if 'seasonal_production' in data:
+            seasonal = predictions_pb2.SeasonalProduction(
+                forecast_type=data['seasonal_production']['forecast_type'],
+                forecast_period=data['seasonal_production']['forecast_period']
+            )
+            
+            for season_name, season_data in data['seasonal_production']['seasons'].items():
+                season_msg = predictions_pb2.SeasonData(
+                    months_count=season_data['months_count'],
+                    total_production=season_data['total_production']
                 )
-                season_msg.months.append(month_prod)
-            seasonal.seasons[season_name].CopyFrom(season_msg)
-        
-        response.seasonal_production.CopyFrom(seasonal)
+                for month in season_data['months']:
+                    month_prod = predictions_pb2.MonthProduction(
+                        month=month['month'],
+                        production=month['production']
+                    )
+                    season_msg.months.append(month_prod)
+                seasonal.seasons[season_name].CopyFrom(season_msg)
+            
+            response.seasonal_production.CopyFrom(seasonal)
         
         # Model info
-        model_info = predictions_pb2.ModelInfo(
-            model_type=data['model_info']['model_type'],
-            forecast_generated=data['model_info']['forecast_generated'],
-            performance_metrics=predictions_pb2.PerformanceMetrics(
-                test_mae=data['model_info']['performance_metrics']['test_mae'],
-                test_rmse=data['model_info']['performance_metrics']['test_rmse'],
-                test_r2_score=data['model_info']['performance_metrics']['test_r2_score'],
-                test_accuracy=data['model_info']['performance_metrics']['test_accuracy'],
-                validation_r2_score=data['model_info']['performance_metrics']['validation_r2_score'],
-                validation_accuracy=data['model_info']['performance_metrics']['validation_accuracy']
-            )
-        )
-        response.model_info.CopyFrom(model_info)
+        if 'model_info' in data:
+            model_info = self._build_model_info(data['model_info'])
+            response.model_info.CopyFrom(model_info)
         
         # Summary
-        summary = predictions_pb2.Summary(
-            daily_forecast_days=data['summary']['daily_forecast_days'],
-            monthly_6_total_production=data['summary']['monthly_6_total_production'],
-            monthly_12_total_production=data['summary']['monthly_12_total_production'],
-            maha_season_total=data['summary']['maha_season_total'],
-            yala_season_total=data['summary']['yala_season_total']
-        )
-        response.summary.CopyFrom(summary)
+        if 'summary' in data:
+            summary = predictions_pb2.Summary(
+                daily_forecast_days=data['summary']['daily_forecast_days'],
+                monthly_6_total_production=data['summary']['monthly_6_total_production'],
+                monthly_12_total_production=data['summary']['monthly_12_total_production'],
+                maha_season_total=data['summary']['maha_season_total'],
+                yala_season_total=data['summary']['yala_season_total']
+            )
+            response.summary.CopyFrom(summary)
         
         return response
     
+    def _build_daily_forecast(self, forecast):
+        """Build a DailyForecast message from a daily forecast dictionary"""
+        return predictions_pb2.DailyForecast(
+            date=forecast['date'],
+            day_number=forecast['day_number'],
+            parameters=predictions_pb2.Parameters(
+                water_temperature=forecast['parameters']['water_temperature'],
+                lagoon=forecast['parameters']['lagoon'],
+                OR_brine_level=forecast['parameters']['OR_brine_level'],
+                OR_bund_level=forecast['parameters']['OR_bund_level'],
+                IR_brine_level=forecast['parameters']['IR_brine_level'],
+                IR_bound_level=forecast['parameters']['IR_bound_level'],
+                East_channel=forecast['parameters']['East_channel'],
+                West_channel=forecast['parameters']['West_channel']
+            ),
+            weather=predictions_pb2.Weather(
+                temperature_mean=forecast['weather']['temperature_mean'],
+                temperature_min=forecast['weather']['temperature_min'],
+                temperature_max=forecast['weather']['temperature_max'],
+                rain_sum=forecast['weather']['rain_sum'],
+                wind_speed_max=forecast['weather']['wind_speed_max'],
+                wind_gusts_max=forecast['weather']['wind_gusts_max'],
+                relative_humidity_mean=forecast['weather']['relative_humidity_mean']
+            )
+        )
+    
+    def _build_model_info(self, data):
+        """Build model info message"""
+        return predictions_pb2.ModelInfo(
+            model_type=data['model_type'],
+            forecast_generated=data['forecast_generated'],
+            performance_metrics=predictions_pb2.PerformanceMetrics(
+                test_mae=data['performance_metrics']['test_mae'],
+                test_rmse=data['performance_metrics']['test_rmse'],
+                test_r2_score=data['performance_metrics']['test_r2_score'],
+                test_accuracy=data['performance_metrics']['test_accuracy'],
+                validation_r2_score=data['performance_metrics']['validation_r2_score'],
+                validation_accuracy=data['performance_metrics']['validation_accuracy']
+            ),
+            model_id=data['model_id'],
+            load_latency_ms=data['load_latency_ms'],
+            cache_hit_ratio=data['cache_hit_ratio'],
+            resident_models=data['resident_models']
+        )
+    
     def _build_monthly_forecast(self, data):
         """Build monthly forecast message"""
         monthly = predictions_pb2.MonthlyProductionForecast(
@@ -177,13 +519,18 @@ class PredictionsService(predictions_pb2_grpc.PredictionsServiceServicer):
 
 
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    predictions_pb2_grpc.add_PredictionsServiceServicer_to_server(
-        PredictionsService(), server
-    )
-    server.add_insecure_port('[::]:50055')
-    logger.info("Starting Crystallization ML Service on port 50055")
+    configure_logging(SERVICE_NAME)
+    metrics.start_reporter(float(os.getenv('METRICS_LOG_INTERVAL', '60')))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=grpc_server_options())
+    service = PredictionsService()
+    predictions_pb2_grpc.add_PredictionsServiceServicer_to_server(service, server)
+    port = os.getenv('GRPC_PORT', '50055')
+    server.add_insecure_port(f'[::]:{port}')
+    logger.info(f"Starting Crystallization ML Service on port {port}")
+    # Optional Unix domain socket for callers on the same host
+    add_uds_listener(server)
     server.start()
+    service.scheduler.start()
     logger.info("Server started successfully")
     server.wait_for_termination()
 
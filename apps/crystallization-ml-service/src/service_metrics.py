@@ -0,0 +1,61 @@
+import threading
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceMetrics:
+    """
+    In-process counters and summaries for the ML service.
+
+    Counters are keyed by name; observations keep count, sum, min and max so
+    averages can be derived from a snapshot. A background reporter can log a
+    snapshot at a fixed interval.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._observations = {}
+        self._reporter = None
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name, value):
+        with self._lock:
+            stats = self._observations.get(name)
+            if stats is None:
+                self._observations[name] = {'count': 1, 'sum': value, 'min': value, 'max': value}
+            else:
+                stats['count'] += 1
+                stats['sum'] += value
+                stats['min'] = min(stats['min'], value)
+                stats['max'] = max(stats['max'], value)
+
+    def snapshot(self):
+        with self._lock:
+            observations = {}
+            for name, stats in self._observations.items():
+                observations[name] = dict(stats, mean=stats['sum'] / stats['count'])
+            return {'counters': dict(self._counters), 'observations': observations}
+
+    def start_reporter(self, interval_seconds):
+        """Log a snapshot every interval_seconds from a daemon thread"""
+        if self._reporter is not None or interval_seconds <= 0:
+            return
+        stop = threading.Event()
+
+        def report():
+            while not stop.wait(interval_seconds):
+                snapshot = self.snapshot()
+                if snapshot['counters'] or snapshot['observations']:
+                    logger.info(f"Service metrics: {snapshot}")
+
+        self._reporter = (threading.Thread(target=report, name='metrics-reporter', daemon=True), stop)
+        self._reporter[0].start()
+
+
+metrics = ServiceMetrics()
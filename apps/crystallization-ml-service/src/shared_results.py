@@ -0,0 +1,164 @@
+"""
+Shared-memory result segments for co-located callers.
+
+A caller on the same host (typically connected over the Unix domain socket,
+see GRPC_UDS_PATH in response_compression.py) can ask ExportForecasts for
+shared memory. Each record batch is then written as an Arrow IPC stream
+straight into a POSIX shared-memory segment, and the response only carries the
+segment's name and size. The caller maps the segment and reads the columns in
+place with `read_batch`, so the forecast payload is neither protobuf-encoded
+nor copied through the socket.
+
+Segments belong to the server and are unlinked SHM_RESULT_TTL_SECONDS after
+they were written. A caller that already mapped a segment keeps its mapping
+after the unlink, but has to open the segment before the TTL runs out. Once
+the segments in use reach SHM_RESULT_MAX_MB, further batches are sent inline.
+
+Environment:
+    SHM_RESULTS               'on' to serve shared-memory requests, 'off' to always send inline (on)
+    SHM_RESULT_TTL_SECONDS    seconds a segment is kept (60)
+    SHM_RESULT_MAX_MB         largest total size of the live segments (1024)
+"""
+import os
+import time
+import uuid
+import logging
+import threading
+from multiprocessing import shared_memory, resource_tracker
+
+import pyarrow as pa
+
+from service_metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SharedResultError(Exception):
+    """Raised when a result cannot be placed in shared memory"""
+
+
+class SharedResultStore:
+    """Shared-memory segments holding serialized record batches, unlinked after a TTL"""
+
+    def __init__(self, enabled=True, ttl_seconds=60.0, max_bytes=1024 * 1024 * 1024):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._segments = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            enabled=os.getenv('SHM_RESULTS', 'on').lower() != 'off',
+            ttl_seconds=float(os.getenv('SHM_RESULT_TTL_SECONDS', '60')),
+            max_bytes=int(float(os.getenv('SHM_RESULT_MAX_MB', '1024')) * 1024 * 1024)
+        )
+
+    def put_batch(self, batch):
+        """
+        Write a record batch as an Arrow IPC stream into a new segment
+
+        Returns:
+            Tuple of (segment name, stream size in bytes)
+        """
+        if not self.enabled:
+            raise SharedResultError("shared-memory results are disabled")
+        # Size the stream first so it is written once, straight into the segment
+        sizer = pa.MockOutputStream()
+        with pa.ipc.new_stream(sizer, batch.schema) as writer:
+            writer.write_batch(batch)
+        size = sizer.size()
+
+        self.expire()
+        with self._lock:
+            if self._bytes + size > self.max_bytes:
+                raise SharedResultError(
+                    f"shared-memory results hold {self._bytes} bytes; {size} more exceed the limit"
+                )
+            self._bytes += size
+        try:
+            segment = shared_memory.SharedMemory(name=f'cms_{uuid.uuid4().hex[:20]}', create=True, size=size)
+        except OSError as e:
+            with self._lock:
+                self._bytes -= size
+            raise SharedResultError(f"could not create a shared-memory segment: {str(e)}")
+
+        with pa.ipc.new_stream(pa.FixedSizeBufferWriter(pa.py_buffer(segment.buf)), batch.schema) as writer:
+            writer.write_batch(batch)
+        with self._lock:
+            self._segments[segment.name] = (segment, size, time.monotonic() + self.ttl_seconds)
+        self._start_reaper()
+        metrics.increment('shm_results.segments')
+        metrics.increment('shm_results.bytes', size)
+        return segment.name, size
+
+    def expire(self, now=None):
+        """Unlink the segments whose TTL ran out; returns how many were removed"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [name for name, (_, _, expires) in self._segments.items() if expires <= now]
+            removed = [self._segments.pop(name) for name in expired]
+            self._bytes -= sum(size for _, size, _ in removed)
+        for segment, _, _ in removed:
+            _release(segment)
+        return len(removed)
+
+    def close(self):
+        """Unlink every segment"""
+        with self._lock:
+            removed = list(self._segments.values())
+            self._segments.clear()
+            self._bytes = 0
+        for segment, _, _ in removed:
+            _release(segment)
+
+    def _start_reaper(self):
+        if self._reaper is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(max(self.ttl_seconds / 4, 1.0))
+                try:
+                    self.expire()
+                except Exception as e:
+                    logger.error(f"Expiring shared-memory results failed: {str(e)}", exc_info=True)
+
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=loop, name='shm-results-reaper', daemon=True)
+                self._reaper.start()
+
+
+def _release(segment):
+    try:
+        segment.close()
+    except BufferError:
+        # A view into the segment is still alive; the mapping goes with it
+        pass
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def read_batch(name, size):
+    """
+    Map a result segment and read its record batch without copying
+
+    The returned batch's columns point into the segment; keep the batch (or
+    the returned segment) referenced while reading them. Returns a tuple of
+    (record batch, SharedMemory).
+    """
+    segment = shared_memory.SharedMemory(name=name)
+    # The segment is the server's to unlink; stop this process's resource
+    # tracker from unlinking it when the caller exits
+    try:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    except Exception:
+        pass
+    reader = pa.ipc.open_stream(pa.py_buffer(segment.buf)[:size])
+    return reader.read_next_batch(), segment
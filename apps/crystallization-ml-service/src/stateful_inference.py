@@ -0,0 +1,214 @@
+"""
+Stateful single-step inference for recurrent models.
+
+A full-window rollout re-runs every LSTM over the whole lookback window at
+each autoregressive step, which costs O(window) cell steps per day. A
+StepModel instead splits the model into its recurrent stack and the layers
+after it, runs the initial window once to warm up the hidden and cell states,
+and from then on advances each LSTM by a single `lstm_step` per day, carrying
+(h, c) across days.
+
+The two modes agree exactly on the first forecast day. After that the step
+model conditions on the whole rolled-out history rather than the last
+`window` days, so the forecasts drift apart by however much the model still
+remembers beyond its window. `check` measures that drift for an artifact and,
+with `--write`, records the result in its metadata; the predictor only steps
+models whose metadata says the check passed (see STATEFUL_INFERENCE in
+ml_predictor.py).
+
+Usage:
+    python stateful_inference.py check models/best_hybrid_model.mmw --horizon 365 --tolerance 0.05 --write
+"""
+import sys
+import json
+import time
+import argparse
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from mapped_model import (
+    MappedModel, UnsupportedArchitectureError, _IdentityLayer, _LSTMLayer, is_mapped_model, load_mapped_model,
+    lstm_step
+)
+from model_metadata import write_metadata
+from rollout import rollout
+
+logger = logging.getLogger(__name__)
+
+
+class StepModel:
+    """
+    A recurrent model run one timestep at a time with carried state
+
+    Supports chains of LSTM layers (every one but the last returning
+    sequences, optionally separated by Dropout) followed by any layers the
+    mapped model runs (Dense, Dropout, Flatten).
+    """
+
+    # rollout() checks this to drive the model with warm_up() and step()
+    stateful = True
+
+    def __init__(self, model):
+        if not isinstance(model, MappedModel):
+            raise UnsupportedArchitectureError("stateful inference needs a model the numpy forward pass can run")
+        layers = model.layers
+        recurrent = [index for index, layer in enumerate(layers) if isinstance(layer, _LSTMLayer)]
+        if not recurrent:
+            raise UnsupportedArchitectureError("model has no LSTM layer to step")
+        last = recurrent[-1]
+        for layer in layers[:last]:
+            if isinstance(layer, _LSTMLayer) and layer.return_sequences:
+                continue
+            if not isinstance(layer, _IdentityLayer):
+                raise UnsupportedArchitectureError(
+                    f"layer {type(layer).__name__} before the last LSTM cannot be stepped"
+                )
+        if layers[last].return_sequences:
+            raise UnsupportedArchitectureError("the last LSTM returns sequences, so outputs depend on the whole window")
+
+        self.input_shape = model.input_shape
+        self.weights = model.weights
+        self._recurrent = [layer for layer in layers[:last + 1] if isinstance(layer, _LSTMLayer)]
+        self._head = layers[last + 1:]
+        self._dtype = layers[last].kernel.dtype
+
+    def initial_state(self, batch_size):
+        return [layer.initial_state(batch_size, self._dtype) for layer in self._recurrent]
+
+    def step(self, x_t, state):
+        """
+        Advance every LSTM by one timestep
+
+        Args:
+            x_t: Input rows shaped (batch, features)
+            state: List of (h, c) per LSTM layer
+
+        Returns:
+            Tuple of (model outputs for this timestep, new state)
+        """
+        x = np.asarray(x_t, dtype=self._dtype)
+        new_state = []
+        for layer, (h, c) in zip(self._recurrent, state):
+            h, c = lstm_step(
+                x, h, c, layer.kernel, layer.recurrent_kernel, layer.bias,
+                layer.activation, layer.recurrent_activation
+            )
+            new_state.append((h, c))
+            x = h
+        for layer in self._head:
+            x = layer(x)
+        return x, new_state
+
+    def warm_up(self, window):
+        """Run a (batch, timesteps, features) window from zero state; returns (outputs, state)"""
+        state = self.initial_state(len(window))
+        outputs = None
+        for t in range(window.shape[1]):
+            outputs, state = self.step(window[:, t], state)
+        return outputs, state
+
+    def predict(self, x, verbose=0, batch_size=None):
+        """Full-window inference, identical to the wrapped model"""
+        return self.warm_up(np.asarray(x))[0]
+
+
+def step_model_for(model):
+    """
+    Build a StepModel for a mapped or Keras model
+
+    Keras models are converted through their config and weights (a private
+    copy). Raises UnsupportedArchitectureError when the model cannot be stepped.
+    """
+    if not isinstance(model, MappedModel):
+        layer_weights = {layer.name: layer.get_weights() for layer in model.layers}
+        model = MappedModel(json.loads(model.to_json()), layer_weights)
+    return StepModel(model)
+
+
+def check_parity(model, horizon, batch=16, seed=0):
+    """
+    Roll the same inputs out with full-window and stateful inference
+
+    Returns:
+        Dictionary with the per-day maximum absolute difference, its overall
+        maximum and the time each mode took
+    """
+    from ml_predictor import WEATHER_RANGES
+    from production import REFERENCE_PARAMETERS
+
+    step_model = step_model_for(model)
+    rng = np.random.default_rng(seed)
+    initial_params = REFERENCE_PARAMETERS * rng.uniform(0.9, 1.1, size=(batch, len(REFERENCE_PARAMETERS)))
+    lows, highs = zip(*WEATHER_RANGES)
+    weather = rng.uniform(lows, highs, size=(batch, horizon, len(WEATHER_RANGES)))
+
+    started = time.perf_counter()
+    full = rollout(model, initial_params, horizon, weather=weather)
+    full_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    stepped = rollout(step_model, initial_params, horizon, weather=weather)
+    step_seconds = time.perf_counter() - started
+
+    daily_diff = np.abs(full - stepped).max(axis=(0, 2))
+    return {
+        'horizon_days': horizon,
+        'batch': batch,
+        'window': int(model.input_shape[1] or 1) if model.input_shape else 1,
+        'max_abs_diff': float(daily_diff.max()),
+        'first_day_abs_diff': float(daily_diff[0]),
+        'daily_max_abs_diff': daily_diff.tolist(),
+        'full_window_seconds': full_seconds,
+        'stateful_seconds': step_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check stateful LSTM inference against full-window inference')
+    parser.add_argument('command', choices=['check'])
+    parser.add_argument('model_path', help='.keras file or .mmw directory')
+    parser.add_argument('--horizon', type=int, default=365, help='days to roll out')
+    parser.add_argument('--batch', type=int, default=16, help='rollouts compared')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='largest acceptable absolute difference')
+    parser.add_argument('--write', action='store_true', help='record the result in the artifact metadata')
+    args = parser.parse_args()
+
+    if is_mapped_model(args.model_path):
+        model = load_mapped_model(args.model_path)
+    else:
+        from tensorflow import keras
+        model = keras.models.load_model(args.model_path)
+
+    try:
+        result = check_parity(model, args.horizon, args.batch)
+    except UnsupportedArchitectureError as e:
+        print(f'{args.model_path} cannot use stateful inference: {str(e)}')
+        return 1
+    passed = result['max_abs_diff'] <= args.tolerance
+
+    print(f"Window {result['window']}, horizon {args.horizon} days, batch {args.batch}")
+    print(f"  full window  {result['full_window_seconds']:.3f}s")
+    print(f"  stateful     {result['stateful_seconds']:.3f}s")
+    print(f"  first day max abs diff  {result['first_day_abs_diff']:.3e}")
+    print(f"  overall max abs diff    {result['max_abs_diff']:.3e} "
+          f"({'within' if passed else 'exceeds'} tolerance {args.tolerance:g})")
+    for day in sorted({1, 7, 30, 90, 180, args.horizon}):
+        if day <= args.horizon:
+            print(f"  day {day:<5} {result['daily_max_abs_diff'][day - 1]:.3e}")
+
+    if args.write:
+        summary = {key: value for key, value in result.items() if key != 'daily_max_abs_diff'}
+        summary.update({
+            'enabled': passed,
+            'tolerance': args.tolerance,
+            'checked': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+        write_metadata(args.model_path, {'stateful_inference': summary})
+        print(f'Wrote the result to the metadata of {args.model_path}')
+    return 0 if passed else 2
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import grpc
+import numpy as np
+import pytest
+
+import predictions_pb2
+from cancellation import CancellationToken, PredictionCancelled
+from conftest import CURRENT_VALUES
+from rollout import CANCELLATION_CHECK_DAYS, rollout
+
+
+class CountingModel:
+    """Persistence model counting its calls, i.e. the simulated days"""
+
+    input_shape = (None, 1, 8)
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, x, verbose=0):
+        self.calls += 1
+        return x[:, -1, :8]
+
+
+class FakeContext:
+    """The parts of grpc.ServicerContext the handlers use"""
+
+    def __init__(self, time_remaining=None, active=True):
+        self._time_remaining = time_remaining
+        self._active = active
+        self.code = None
+        self.details = None
+
+    def is_active(self):
+        return self._active
+
+    def time_remaining(self):
+        return self._time_remaining
+
+    def invocation_metadata(self):
+        return ()
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+    def set_compression(self, compression):
+        pass
+
+
+def test_token_reports_why_work_should_stop():
+    assert CancellationToken().reason() is None
+    assert CancellationToken(is_active=lambda: True, time_remaining=lambda: None).reason() is None
+    assert CancellationToken(time_remaining=lambda: 0.0).reason() == 'deadline exceeded'
+    assert CancellationToken(is_active=lambda: False, time_remaining=lambda: 5.0).reason() == 'client disconnected'
+
+
+def test_rollout_stops_within_a_check_interval_of_the_deadline():
+    model = CountingModel()
+    # The deadline passes after the 10th simulated day
+    token = CancellationToken(time_remaining=lambda: 1.0 if model.calls < 10 else 0.0)
+
+    with pytest.raises(PredictionCancelled) as cancelled:
+        rollout(model, np.ones((2, 8)), 365, cancellation=token)
+
+    assert cancelled.value.reason == 'deadline exceeded'
+    assert cancelled.value.stage.startswith('rollout day')
+    assert 10 <= model.calls < 10 + CANCELLATION_CHECK_DAYS
+
+
+def test_predictor_stops_before_production_once_the_deadline_passed(make_predictor, monkeypatch):
+    predictor = make_predictor()
+    monkeypatch.setattr(predictor, '_production', lambda *args, **kwargs: pytest.fail('production computed'))
+
+    with pytest.raises(PredictionCancelled):
+        predictor.predict(
+            '2026-01-10', 60, CURRENT_VALUES, cancellation=CancellationToken(time_remaining=lambda: 0.0)
+        )
+
+
+@pytest.fixture
+def service(model_dir, tmp_path, monkeypatch):
+    for name, value in {
+        'MODEL_DIR': str(model_dir), 'FORECAST_STATE_DB': str(tmp_path / 'state.db'), 'MATERIALIZED_FORECAST_DB': '',
+        'FORECAST_CACHE_TTL_SECONDS': '0', 'PRECOMPUTE_INTERVAL_SECONDS': '0',
+    }.items():
+        monkeypatch.setenv(name, value)
+    from server import PredictionsService
+    return PredictionsService()
+
+
+@pytest.mark.parametrize('context, code', [
+    (FakeContext(time_remaining=0.0), grpc.StatusCode.DEADLINE_EXCEEDED),
+    (FakeContext(time_remaining=30.0, active=False), grpc.StatusCode.CANCELLED),
+])
+def test_abandoned_requests_answer_with_the_matching_status(service, context, code):
+    response = service.GetPredictions(predictions_pb2.PredictionRequest(
+        start_date='2026-01-10', forecast_days=30, model_id='relax',
+        current_values=predictions_pb2.CurrentValues(**CURRENT_VALUES)
+    ), context)
+
+    assert response.status == 'cancelled'
+    assert context.code == code
@@ -0,0 +1,94 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import CURRENT_VALUES
+from forecast_export import ExportError, export_batches, serialize_batch, write_export
+
+REQUESTS = [
+    {'site_id': 'site-a', 'start_date': '2026-01-10', 'forecast_days': 5, 'current_values': CURRENT_VALUES},
+    {'site_id': 'site-b', 'start_date': '2026-03-01', 'forecast_days': 5, 'current_values': CURRENT_VALUES},
+    {'site_id': 'site-c', 'start_date': '2026-01-10', 'forecast_days': 3, 'current_values': CURRENT_VALUES,
+     'horizon_mode': 'monthly'},
+]
+
+
+def _tables(predictor, requests=REQUESTS, **kwargs):
+    """Exported record batches combined into one sorted table per name"""
+    batches = {}
+    for table, batch in export_batches(predictor, requests, **kwargs):
+        batches.setdefault(table, []).append(batch)
+    return {
+        table: pa.Table.from_batches(parts).sort_by([('request_index', 'ascending')])
+        for table, parts in batches.items()
+    }
+
+
+def test_every_request_gets_its_rows_in_every_table(make_predictor):
+    tables = _tables(make_predictor(), chunk_size=2)
+
+    daily = tables['daily'].to_pydict()
+    assert daily['request_index'] == [0] * 5 + [1] * 5 + [2] * 3
+    assert daily['day_number'][:5] == [1, 2, 3, 4, 5]
+    assert [str(date) for date in daily['date'][5:7]] == ['2026-03-01', '2026-03-02']
+
+    monthly = tables['monthly'].to_pydict()
+    assert monthly['request_index'] == [index for index in range(3) for _ in range(12)]
+    assert monthly['month'][12:14] == ['2026-03', '2026-04']
+    assert monthly['season'][:4] == ['Maha', 'Maha', 'Maha', 'Yala']
+    np.testing.assert_allclose(monthly['lower_bound'], np.array(monthly['production_forecast']) * 0.85)
+
+
+def test_seasonal_totals_add_up_the_monthly_rows(make_predictor):
+    tables = _tables(make_predictor())
+    monthly = tables['monthly'].to_pydict()
+    seasonal = tables['seasonal'].to_pydict()
+
+    expected = {}
+    for index, season, value in zip(monthly['request_index'], monthly['season'], monthly['production_forecast']):
+        total, count = expected.get((index, season), (0.0, 0))
+        expected[(index, season)] = (total + value, count + 1)
+    exported = {
+        (index, season): (total, count)
+        for index, season, total, count in zip(
+            seasonal['request_index'], seasonal['season'], seasonal['total_production'], seasonal['months_count']
+        )
+    }
+    assert exported.keys() == expected.keys()
+    for key, (total, count) in expected.items():
+        assert exported[key] == (pytest.approx(total), count)
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_written_files_read_back(make_predictor, tmp_path, file_format):
+    predictor = make_predictor()
+    written = write_export(
+        export_batches(predictor, REQUESTS, tables=['daily', 'monthly']), str(tmp_path), file_format,
+        tables=['daily', 'monthly']
+    )
+
+    assert sorted(written) == ['daily', 'monthly']
+    path, rows = written['daily']
+    if file_format == 'parquet':
+        table = pq.read_table(path)
+    else:
+        with pa.ipc.open_stream(path) as reader:
+            table = reader.read_all()
+    assert rows == table.num_rows == 13
+
+
+def test_serialized_batches_are_self_contained_streams(make_predictor):
+    _, batch = next(export_batches(make_predictor(), REQUESTS[:1], tables=['monthly']))
+    with pa.ipc.open_stream(serialize_batch(batch)) as reader:
+        assert reader.read_all().equals(pa.Table.from_batches([batch]))
+
+
+@pytest.mark.parametrize('requests, tables', [
+    ([dict(REQUESTS[0], forecast_days=0)], None),
+    ([dict(REQUESTS[0], forecast_days=400)], None),
+    (REQUESTS, ['daily', 'hourly']),
+])
+def test_malformed_exports_are_rejected(make_predictor, requests, tables):
+    with pytest.raises(ExportError):
+        list(export_batches(make_predictor(), requests, tables=tables))
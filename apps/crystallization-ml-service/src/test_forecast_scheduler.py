@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from conftest import CURRENT_VALUES
+from forecast_scheduler import PrecomputeScheduler
+from service_metrics import metrics
+
+HORIZONS = (7, 30)
+
+
+def _counter(name):
+    return metrics.snapshot()['counters'].get(name, 0)
+
+
+@pytest.fixture
+def precomputed(make_predictor, tmp_path):
+    """A predictor whose site 'site-a' has its HORIZONS precomputed for today"""
+    predictor = make_predictor(MATERIALIZED_FORECAST_DB=str(tmp_path / 'materialized.db'))
+    today = datetime.now().strftime('%Y-%m-%d')
+    # Registers the site, then precomputes its horizons
+    predictor.predict(today, 5, CURRENT_VALUES, site_id='site-a', fields=['summary'])
+    assert PrecomputeScheduler(predictor, horizons=HORIZONS).run_once() == 1
+    return predictor, today
+
+
+def _served_from_store(predictor, today, forecast_days, **kwargs):
+    hits = _counter('materialized.hits')
+    result = predictor.predict(today, forecast_days, CURRENT_VALUES, site_id='site-a', **kwargs)
+    return _counter('materialized.hits') - hits == 1, result
+
+
+def test_precomputed_horizons_are_served_only_for_their_horizon_and_mode(precomputed):
+    predictor, today = precomputed
+
+    for forecast_days in HORIZONS:
+        hit, result = _served_from_store(predictor, today, forecast_days)
+        assert hit
+        assert len(result['daily_parameters_forecast']['forecasts']) == forecast_days
+        assert result['summary']['daily_forecast_days'] == forecast_days
+
+    # A horizon between the precomputed ones, and a different horizon mode,
+    # are computed on demand
+    assert not _served_from_store(predictor, today, 10)[0]
+    assert not _served_from_store(predictor, today, 7, horizon_mode='monthly')[0]
+
+
+def test_each_horizon_stores_production_continued_from_its_own_days(make_predictor, tmp_path, monkeypatch):
+    predictor = make_predictor(MATERIALIZED_FORECAST_DB=str(tmp_path / 'materialized.db'))
+    today = datetime.now().strftime('%Y-%m-%d')
+    predictor.predict(today, 5, CURRENT_VALUES, site_id='site-a', fields=['summary'])
+
+    continued_from = {}
+    compute = predictor._production
+
+    def recording(slot, parameters, *args, **kwargs):
+        monthly_production = compute(slot, parameters, *args, **kwargs)
+        continued_from[parameters.shape[1]] = monthly_production
+        return monthly_production
+
+    monkeypatch.setattr(predictor, '_production', recording)
+    PrecomputeScheduler(predictor, horizons=HORIZONS).run_once()
+
+    assert sorted(continued_from) == list(HORIZONS)
+    inputs = predictor.parameter_vector(CURRENT_VALUES)
+    for horizon in HORIZONS:
+        stored = predictor.materialized.find(
+            'site-a', datetime.strptime(today, '%Y-%m-%d'), horizon, predictor.model_slot().version,
+            predictor.horizon_mode, inputs
+        )
+        np.testing.assert_array_equal(stored.monthly_production, continued_from[horizon][0])
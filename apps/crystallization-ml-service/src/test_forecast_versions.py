@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import numpy as np
+
+from conftest import CURRENT_VALUES
+from forecast_versions import ForecastVersionCache, VersionedForecast, forecast_version
+
+START = datetime(2026, 1, 10)
+
+
+def _forecast(parameters, monthly_production=None, start_dt=START, weather=None):
+    parameters = np.asarray(parameters, dtype=float)
+    weather = np.zeros((len(parameters), 7)) if weather is None else weather
+    monthly_production = np.ones(12) if monthly_production is None else np.asarray(monthly_production, dtype=float)
+    version = forecast_version('model-v1', start_dt, parameters, weather, monthly_production)
+    return VersionedForecast(version, start_dt, parameters, weather, monthly_production)
+
+
+def test_version_follows_the_content():
+    parameters = np.ones((5, 8))
+    assert _forecast(parameters).version == _forecast(parameters.copy()).version
+    assert _forecast(parameters).version != _forecast(parameters + 1e-9).version
+    assert _forecast(parameters).version != _forecast(parameters, start_dt=datetime(2026, 1, 11)).version
+    # Sections that were not computed do not take part
+    assert forecast_version('m', START, parameters, None, None) != forecast_version('m', START, parameters, None, np.zeros(12))
+
+
+def test_changes_since_lists_the_entries_that_differ():
+    base = _forecast(np.ones((5, 8)))
+    parameters = np.ones((6, 8))
+    parameters[3, 2] = 2.0
+    weather = np.zeros((6, 7))
+    weather[1, 0] = 1.0
+    monthly_production = np.ones(12)
+    monthly_production[[0, 11]] = 3.0
+
+    changes = _forecast(parameters, monthly_production, weather=weather).changes_since(base)
+
+    # Day 5 is past the base forecast's horizon
+    assert changes == {'days': [1, 3, 5], 'months': [0, 11]}
+    assert _forecast(parameters, start_dt=datetime(2026, 1, 11)).changes_since(base) is None
+
+
+def test_cache_evicts_the_least_recently_used_version():
+    cache = ForecastVersionCache(max_entries=2)
+    first, second, third = (_forecast(np.full((3, 8), value)) for value in (1.0, 2.0, 3.0))
+    cache.put(first)
+    cache.put(second)
+    assert cache.get(first.version) is first
+    cache.put(third)
+
+    assert cache.get(second.version) is None
+    assert cache.get(first.version) is first and cache.get(third.version) is third
+
+
+def test_request_lookups_expire_after_the_ttl():
+    cache = ForecastVersionCache(ttl_seconds=300)
+    forecast = _forecast(np.ones((3, 8)))
+    cache.put(forecast, request_key='request')
+    assert cache.lookup('request') is forecast
+
+    forecast.created -= 301
+    assert cache.lookup('request') is None
+    # The version itself stays available for diffing
+    assert cache.get(forecast.version) is forecast
+
+
+def test_requests_are_not_kept_without_a_ttl():
+    cache = ForecastVersionCache(ttl_seconds=0)
+    cache.put(_forecast(np.ones((3, 8))), request_key='request')
+    assert cache.lookup('request') is None
+
+
+def _predict(predictor, water_temperature=CURRENT_VALUES['water_temperature'], **kwargs):
+    values = dict(CURRENT_VALUES, water_temperature=water_temperature)
+    # The same weather and rollout noise, so forecasts only differ by their inputs
+    np.random.seed(0)
+    return predictor.predict('2026-01-10', 30, values, **kwargs)
+
+
+def test_identical_request_within_the_ttl_is_not_modified(make_predictor):
+    predictor = make_predictor(FORECAST_CACHE_TTL_SECONDS='300')
+    first = _predict(predictor)
+    assert _predict(predictor)['version'] == first['version']
+
+    response = _predict(predictor, known_version=first['version'])
+    assert response == {'status': 'not_modified', 'version': first['version'], 'model_version': first['model_version']}
+
+
+def test_changed_forecast_is_sent_as_a_delta_against_the_held_version(make_predictor):
+    predictor = make_predictor()
+    first = _predict(predictor)
+    response = _predict(predictor, water_temperature=30.0, known_version=first['version'])
+
+    assert response['status'] == 'delta' and response['base_version'] == first['version']
+    assert response['version'] != first['version']
+    assert response['summary']['monthly_12_total_production'] > first['summary']['monthly_12_total_production']
+
+
+def test_unknown_held_version_gets_a_full_response(make_predictor):
+    response = _predict(make_predictor(), known_version='0123456789abcdef')
+    assert response['status'] == 'success'
+    assert len(response['daily_parameters_forecast']['forecasts']) == 30
@@ -0,0 +1,68 @@
+import pytest
+
+from conftest import CURRENT_VALUES
+from live_forecast import LiveSession, LiveSessionError
+from service_metrics import metrics
+
+FORECAST_DAYS = 40
+
+
+def _update(session, water_temperature=CURRENT_VALUES['water_temperature'], start_date='2026-01-10', **kwargs):
+    values = dict(CURRENT_VALUES, water_temperature=water_temperature)
+    return session.update('site-a', start_date, kwargs.pop('forecast_days', FORECAST_DAYS), values, **kwargs)
+
+
+def _changed(delta):
+    return [day['day_number'] - 1 for day in delta['changed_days']]
+
+
+@pytest.fixture
+def session(make_predictor):
+    return LiveSession(make_predictor(), default_tolerance=0.05)
+
+
+def test_first_update_sends_the_whole_forecast(session):
+    delta = _update(session)
+    assert delta['full'] and delta['update_sequence'] == 1
+    assert _changed(delta) == list(range(FORECAST_DAYS))
+    assert delta['changed_days'][0]['date'] == '2026-01-10'
+
+
+def test_unchanged_values_send_nothing(session):
+    _update(session)
+    unchanged = metrics.snapshot()['counters'].get('live.unchanged_updates', 0)
+    delta = _update(session)
+    assert not delta['full'] and delta['changed_days'] == []
+    assert metrics.snapshot()['counters']['live.unchanged_updates'] - unchanged == 1
+
+
+def test_only_days_that_moved_past_the_tolerance_are_sent(session):
+    first = _update(session)
+    # The relaxing model keeps 0.9 of a change per day, so a change of 0.5
+    # moves day d by 0.5 * 0.9 ** (d + 1): past 0.05 through day 20
+    delta = _update(session, CURRENT_VALUES['water_temperature'] + 0.5)
+    assert _changed(delta) == list(range(21))
+    moved = delta['changed_days'][0]['parameters']['water_temperature']
+    assert moved - first['changed_days'][0]['parameters']['water_temperature'] == pytest.approx(0.45, abs=1e-4)
+
+
+def test_days_are_compared_with_what_was_last_sent(session):
+    _update(session)
+    # 0.3 moves days 0-16 past the tolerance; the next 0.3 moves those again,
+    # and days 17-22 whose unsent changes now add up past it
+    assert _changed(_update(session, CURRENT_VALUES['water_temperature'] + 0.3)) == list(range(17))
+    assert _changed(_update(session, CURRENT_VALUES['water_temperature'] + 0.6)) == list(range(23))
+
+
+def test_a_new_start_date_or_horizon_resets_the_session(session):
+    _update(session)
+    assert _update(session, start_date='2026-01-11')['full']
+    delta = _update(session, start_date='2026-01-11', forecast_days=10)
+    assert delta['full'] and _changed(delta) == list(range(10))
+
+
+@pytest.mark.parametrize('site_id, forecast_days', [('site-b', FORECAST_DAYS), ('site-a', 0), ('site-a', 367)])
+def test_invalid_updates_are_rejected(session, site_id, forecast_days):
+    _update(session)
+    with pytest.raises(LiveSessionError):
+        session.update(site_id, '2026-01-10', forecast_days, CURRENT_VALUES)
@@ -0,0 +1,164 @@
+import io
+import os
+import json
+import time
+import queue
+import socket
+import logging
+
+import pytest
+
+from log_shipping import BoundedQueueHandler, LogShipper, serve_stub
+from service_metrics import metrics
+
+
+def _counter(name):
+    return metrics.snapshot()['counters'].get(name, 0)
+
+
+def _record(message):
+    return logging.makeLogRecord({'name': 'test', 'levelno': logging.INFO, 'levelname': 'INFO', 'msg': message})
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(condition, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.fixture
+def shipper_for(tmp_path):
+    shippers = []
+
+    def make(port):
+        shipper = LogShipper(
+            f'localhost:{port}', 'test-service', batch_size=5, flush_interval=0.1, timeout=2.0,
+            spill_path=str(tmp_path / 'spill.jsonl')
+        )
+        shippers.append(shipper)
+        return shipper
+
+    yield make
+    for shipper in shippers:
+        shipper.close()
+
+
+def test_batches_arrive_at_the_logs_service(shipper_for):
+    stub = serve_stub(0, out=io.StringIO())
+    try:
+        shipper = shipper_for(stub.port)
+        shipped = _counter('logs.shipped')
+        for index in range(12):
+            shipper.handle(_record(f'entry {index}'))
+        assert _wait_for(lambda: stub.service.received == 12)
+        assert _counter('logs.shipped') - shipped == 12
+        assert not os.path.exists(shipper.spill_path)
+    finally:
+        stub.stop(0)
+
+
+@pytest.mark.parametrize('policy, kept', [('drop_oldest', ['b', 'c']), ('drop_newest', ['a', 'b'])])
+def test_full_queue_drops_per_policy(policy, kept):
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, policy)
+    dropped = _counter('logs.dropped')
+    for message in ('a', 'b', 'c'):
+        handler.handle(_record(message))
+    assert [log_queue.get_nowait().msg for _ in range(log_queue.qsize())] == kept
+    assert _counter('logs.dropped') - dropped == 1
+
+
+def test_unknown_drop_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), 'drop_everything')
+
+
+def test_spilled_entries_are_replayed_when_the_service_returns(shipper_for):
+    port = _free_port()
+    shipper = shipper_for(port)
+    spilled = _counter('logs.spilled')
+    replayed = _counter('logs.replayed')
+    for index in range(7):
+        shipper.handle(_record(f'while down {index}'))
+    assert _wait_for(lambda: _counter('logs.spilled') - spilled == 7)
+    assert os.path.exists(shipper.spill_path)
+
+    stub = serve_stub(port, out=io.StringIO())
+    try:
+        # Keep logging until the live entries and the replayed ones have arrived
+        sent = 0
+        deadline = time.monotonic() + 30.0
+        while stub.service.received < 7 + sent and time.monotonic() < deadline:
+            shipper.handle(_record(f'after restart {sent}'))
+            sent += 1
+            time.sleep(0.3)
+        assert _wait_for(lambda: _counter('logs.replayed') - replayed >= 7)
+        assert not os.path.exists(shipper.spill_path)
+    finally:
+        stub.stop(0)
+
+
+def test_rejected_entries_are_not_counted_as_shipped(shipper_for):
+    stub = serve_stub(0, out=io.StringIO())
+    stub.service.accepting = False
+    try:
+        shipper = shipper_for(stub.port)
+        shipped = _counter('logs.shipped')
+        rejected = _counter('logs.rejected')
+        spilled = _counter('logs.spilled')
+        for index in range(5):
+            shipper.handle(_record(f'rejected {index}'))
+        assert _wait_for(lambda: _counter('logs.rejected') - rejected >= 5)
+        assert _wait_for(lambda: _counter('logs.spilled') - spilled >= 5)
+        assert _counter('logs.shipped') == shipped
+    finally:
+        stub.stop(0)
+
+
+def _write_spill(path, lines):
+    with open(path, 'w', encoding='utf-8') as spill:
+        for line in lines:
+            spill.write(line + '\n')
+
+
+def _spilled_entry(message):
+    return json.dumps({
+        'service_name': 'test-service', 'action': 'test', 'resource_id': '', 'resource_type': 'forecast',
+        'details': json.dumps({'message': message}), 'status': 'success'
+    })
+
+
+def test_spill_is_replayed_without_live_traffic(shipper_for, tmp_path):
+    _write_spill(tmp_path / 'spill.jsonl', [_spilled_entry(f'spilled {index}') for index in range(3)])
+    stub = serve_stub(0, out=io.StringIO())
+    try:
+        shipper = shipper_for(stub.port)
+        assert _wait_for(lambda: stub.service.received == 3)
+        assert _wait_for(lambda: not os.path.exists(shipper.spill_path))
+    finally:
+        stub.stop(0)
+
+
+def test_malformed_spill_lines_are_skipped(shipper_for, tmp_path):
+    _write_spill(tmp_path / 'spill.jsonl', [
+        _spilled_entry('first'), '{"service_name": "truncat', '{"unknown_field": 1}', _spilled_entry('second')
+    ])
+    dropped = _counter('logs.dropped')
+    stub = serve_stub(0, out=io.StringIO())
+    try:
+        shipper = shipper_for(stub.port)
+        assert _wait_for(lambda: stub.service.received == 2)
+        assert _counter('logs.dropped') - dropped == 2
+        assert not os.path.exists(shipper.spill_path)
+        assert not os.path.exists(f'{shipper.spill_path}.replay')
+    finally:
+        stub.stop(0)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from mapped_model import MappedModel, export_mapped_model, load_mapped_model
+
+keras = pytest.importorskip('tensorflow').keras
+
+WINDOW = 14
+FEATURES = 15
+# Largest absolute difference from the Keras model's own predictions
+TOLERANCE = 1e-5
+
+
+def _sequential():
+    return keras.Sequential([
+        keras.Input((WINDOW, FEATURES)),
+        keras.layers.LSTM(16, return_sequences=True),
+        keras.layers.Dropout(0.2),
+        keras.layers.LSTM(8),
+        keras.layers.Dense(12, activation='relu'),
+        keras.layers.Dense(8),
+    ])
+
+
+def _functional():
+    inputs = keras.Input((WINDOW, FEATURES))
+    hidden = keras.layers.LSTM(16, recurrent_activation='hard_sigmoid')(inputs)
+    outputs = keras.layers.Dense(8)(keras.layers.Dropout(0.1)(hidden))
+    return keras.Model(inputs, outputs)
+
+
+@pytest.mark.parametrize('build', [_sequential, _functional])
+def test_mapped_model_matches_the_keras_model_it_was_exported_from(build, tmp_path):
+    keras.utils.set_random_seed(0)
+    model = build()
+    export_mapped_model(model, str(tmp_path / 'model.mmw'))
+    mapped = load_mapped_model(str(tmp_path / 'model.mmw'))
+
+    # The numpy forward pass, not the Keras fallback
+    assert isinstance(mapped, MappedModel)
+    assert tuple(mapped.input_shape) == (None, WINDOW, FEATURES)
+    x = np.random.default_rng(0).normal(size=(32, WINDOW, FEATURES)).astype(np.float32)
+    np.testing.assert_allclose(mapped.predict(x), model.predict(x, verbose=0), atol=TOLERANCE)
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from conftest import CURRENT_VALUES
+from ml_predictor import AdvanceError, FieldMaskError, ForecastDaysError
+
+
+def _predict(predictor, seed=0, **kwargs):
+    # Weather and rollout noise are random; the same seed draws the same ones
+    np.random.seed(seed)
+    return predictor.predict('2026-01-10', kwargs.pop('forecast_days', 30), CURRENT_VALUES, **kwargs)
+
+
+@pytest.mark.parametrize('horizon_mode', ['daily', 'monthly'])
+def test_field_mask_does_not_change_production(make_predictor, horizon_mode):
+    predictor = make_predictor()
+    full = _predict(predictor, horizon_mode=horizon_mode)
+    summary = _predict(predictor, horizon_mode=horizon_mode, fields=['summary'])
+    monthly = _predict(predictor, horizon_mode=horizon_mode, fields=['monthly_production_12months'])
+
+    assert set(summary) == {'status', 'version', 'model_version', 'summary'}
+    assert summary['summary'] == full['summary']
+    assert monthly['monthly_production_12months'] == full['monthly_production_12months']
+    assert summary['version'] == full['version']
+
+
+def _stored(predictor, site_id='site-a', forecast_days=10):
+    _predict(predictor, forecast_days=forecast_days, site_id=site_id)
+    return predictor.state_store.load(site_id)
+
+
+def _record_rollouts(predictor, monkeypatch):
+    days = []
+    generate = predictor._generate_daily_forecasts
+
+    def recording(model, current_params, forecast_days, *args, **kwargs):
+        days.append(forecast_days)
+        return generate(model, current_params, forecast_days, *args, **kwargs)
+
+    monkeypatch.setattr(predictor, '_generate_daily_forecasts', recording)
+    return days
+
+
+def test_advance_reuses_a_trajectory_the_observation_agrees_with(make_predictor, monkeypatch):
+    predictor = make_predictor()
+    state = _stored(predictor)
+    days = _record_rollouts(predictor, monkeypatch)
+    observed = dict(zip(CURRENT_VALUES, state.parameters[0].tolist()))
+
+    result, reused, model_steps = predictor.advance('site-a', '2026-01-10', observed)
+
+    assert reused and model_steps == 1 and days == [1]
+    advanced = predictor.state_store.load('site-a')
+    assert advanced.start_date.strftime('%Y-%m-%d') == '2026-01-11'
+    np.testing.assert_allclose(advanced.parameters[:-1], state.parameters[1:])
+    np.testing.assert_allclose(advanced.weather[:-1], state.weather[1:])
+    assert len(result['daily_parameters_forecast']['forecasts']) == 10
+
+
+def test_advance_recomputes_when_the_observation_disagrees(make_predictor, monkeypatch):
+    predictor = make_predictor()
+    state = _stored(predictor)
+    days = _record_rollouts(predictor, monkeypatch)
+    observed = dict(zip(CURRENT_VALUES, (state.parameters[2] + 10.0).tolist()))
+
+    _, reused, model_steps = predictor.advance('site-a', '2026-01-12', observed)
+
+    assert not reused and model_steps == 10 and days == [10]
+    assert predictor.state_store.load('site-a').start_date.strftime('%Y-%m-%d') == '2026-01-13'
+
+
+def test_advance_past_the_horizon_recomputes(make_predictor, monkeypatch):
+    predictor = make_predictor()
+    _stored(predictor)
+    days = _record_rollouts(predictor, monkeypatch)
+
+    _, reused, model_steps = predictor.advance('site-a', '2026-03-01', CURRENT_VALUES)
+
+    assert not reused and model_steps == 10 and days == [10]
+
+
+def test_advance_before_the_stored_forecast_is_rejected(make_predictor):
+    predictor = make_predictor()
+    _stored(predictor)
+    with pytest.raises(AdvanceError):
+        predictor.advance('site-a', '2026-01-09', CURRENT_VALUES)
+
+
+@pytest.mark.parametrize('forecast_days', [0, -3, 367])
+def test_forecast_days_outside_the_horizon_are_rejected(make_predictor, forecast_days):
+    with pytest.raises(ForecastDaysError):
+        _predict(make_predictor(), forecast_days=forecast_days)
+
+
+def test_unknown_fields_are_rejected(make_predictor):
+    with pytest.raises(FieldMaskError, match='daily_weather'):
+        _predict(make_predictor(), fields=['summary', 'daily_weather'])
+
+
+def test_field_mask_skips_unrequested_work(make_predictor, monkeypatch):
+    predictor = make_predictor()
+    days = _record_rollouts(predictor, monkeypatch)
+
+    def no_production(*args, **kwargs):
+        raise AssertionError('production computed for a mask without production sections')
+
+    monkeypatch.setattr(predictor, '_production', no_production)
+    info = _predict(predictor, fields=['model_info'])
+    assert days == [] and set(info) == {'status', 'version', 'model_version', 'model_info'}
+
+    daily = _predict(predictor, fields=['daily_parameters_forecast'])
+    assert days == [30] and len(daily['daily_parameters_forecast']['forecasts']) == 30
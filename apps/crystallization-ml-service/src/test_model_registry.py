@@ -0,0 +1,88 @@
+import time
+import logging
+import threading
+
+import pytest
+
+from conftest import write_relaxing_model
+from model_registry import ModelNotFoundError, ModelRegistry
+
+# Weights of the relaxing model: an 8x8 float32 kernel and 8 float32 biases
+MODEL_BYTES = (8 * 8 + 8) * 4
+
+
+@pytest.fixture
+def models(tmp_path):
+    for model_id in ('a', 'b', 'c'):
+        write_relaxing_model(str(tmp_path / f'{model_id}.mmw'))
+    return tmp_path
+
+
+def _registry(models, memory_budget_bytes=None):
+    return ModelRegistry(str(models / 'a.mmw'), model_dir=str(models), memory_budget_bytes=memory_budget_bytes)
+
+
+def test_resident_models_are_kept_in_lru_order(models):
+    registry = _registry(models)
+    for model_id in ('a', 'b', 'c', 'a'):
+        registry.get(model_id)
+    assert registry.resident_models() == ['b', 'c', 'a']
+    assert registry.stats()['hits'] == 1 and registry.stats()['misses'] == 3
+
+
+def test_least_recently_used_models_are_evicted_to_fit_the_budget(models):
+    registry = _registry(models, memory_budget_bytes=2 * MODEL_BYTES)
+    registry.get('a')
+    registry.get('b')
+    registry.get('a')
+    registry.get('c')
+
+    stats = registry.stats()
+    assert stats['resident_models'] == ['a', 'c']
+    assert stats['evictions'] == 1
+    assert stats['resident_bytes'] == 2 * MODEL_BYTES
+
+
+def test_a_model_larger_than_the_budget_stays_resident_with_a_warning(models, caplog):
+    registry = _registry(models, memory_budget_bytes=MODEL_BYTES // 2)
+    with caplog.at_level(logging.WARNING, logger='model_registry'):
+        registry.get('b')
+    assert registry.resident_models() == ['b']
+    assert any('exceeds the memory budget' in record.getMessage() for record in caplog.records)
+
+
+def test_default_and_its_model_id_share_one_slot(models):
+    registry = _registry(models)
+    assert registry.get() is registry.get('a')
+    assert registry.resident_models() == ['default']
+    assert registry.stats()['misses'] == 1
+
+
+def test_concurrent_requests_load_a_model_once(models, monkeypatch):
+    registry = _registry(models)
+    loads = []
+    load = registry._load
+
+    def slow_load(model_id, path):
+        loads.append(model_id)
+        time.sleep(0.2)
+        return load(model_id, path)
+
+    monkeypatch.setattr(registry, '_load', slow_load)
+    slots = []
+    threads = [threading.Thread(target=lambda: slots.append(registry.get('b'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ['b']
+    assert len(slots) == 8 and all(slot is slots[0] for slot in slots)
+    assert registry._load_locks == {}
+
+
+def test_unknown_models_leave_no_load_lock_behind(models):
+    registry = _registry(models)
+    with pytest.raises(ModelNotFoundError):
+        registry.get('missing')
+    assert registry._load_locks == {}
@@ -0,0 +1,104 @@
+import logging
+from concurrent import futures
+
+import grpc
+import pytest
+
+import predictions_pb2
+from response_compression import (
+    METADATA_KEY, CompressionPolicy, add_uds_listener, grpc_server_options, size_bucket
+)
+from service_metrics import metrics
+
+
+class MetadataContext:
+    """Records the compression set for a call carrying the given metadata"""
+
+    def __init__(self, *metadata):
+        self.metadata = metadata
+        self.compression = None
+
+    def invocation_metadata(self):
+        return self.metadata
+
+    def set_compression(self, compression):
+        self.compression = compression
+
+
+def _response(size):
+    """A response whose serialized size is at least `size` bytes"""
+    return predictions_pb2.PredictionResponse(status='success', version='x' * size)
+
+
+@pytest.mark.parametrize('size, algorithm', [(0, 'none'), (1023, 'none'), (1024, 'gzip'), (50_000, 'gzip')])
+def test_responses_are_gzipped_from_the_threshold_up(size, algorithm):
+    assert CompressionPolicy(min_bytes=1024).choose(MetadataContext(), size) == algorithm
+
+
+@pytest.mark.parametrize('requested, size, algorithm', [
+    ('deflate', 10, 'deflate'), ('gzip', 10, 'gzip'), (' NONE ', 2048, 'none'),
+])
+def test_requested_algorithm_overrides_the_threshold(requested, size, algorithm):
+    context = MetadataContext(('user-agent', 'test'), (METADATA_KEY, requested))
+    assert CompressionPolicy(min_bytes=1024).choose(context, size) == algorithm
+
+
+def test_unknown_requested_algorithm_falls_back_to_the_threshold(caplog):
+    with caplog.at_level(logging.WARNING, logger='response_compression'):
+        algorithm = CompressionPolicy(min_bytes=1024).choose(MetadataContext((METADATA_KEY, 'brotli')), 2048)
+    assert algorithm == 'gzip'
+    assert 'brotli' in caplog.text
+
+
+def test_apply_sets_the_call_compression_and_records_it():
+    policy = CompressionPolicy(min_bytes=1024, sample_rate=1.0)
+    response = _response(20_000)
+    counted = metrics.snapshot()['counters'].get('responses.16k_64k.gzip', 0)
+    context = MetadataContext()
+
+    assert policy.apply(context, response) == 'gzip'
+    assert context.compression == grpc.Compression.Gzip
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['responses.16k_64k.gzip'] - counted == 1
+    # Every response is sampled at a rate of 1, with every algorithm
+    assert {'compression.16k_64k.gzip.ratio', 'compression.16k_64k.deflate.cpu_ms'} <= set(snapshot['observations'])
+
+
+def test_small_responses_are_sent_uncompressed():
+    context = MetadataContext()
+    assert CompressionPolicy(min_bytes=1024, sample_rate=0.0).apply(context, _response(10)) == 'none'
+    assert context.compression == grpc.Compression.NoCompression
+
+
+@pytest.mark.parametrize('size, bucket', [(0, 'lt_16k'), (16 * 1024, '16k_64k'), (300 * 1024, '256k_1m'),
+                                          (2 * 1024 * 1024, 'gte_1m')])
+def test_size_buckets(size, bucket):
+    assert size_bucket(size) == bucket
+
+
+def test_server_options_apply_the_configured_message_limits(monkeypatch):
+    monkeypatch.setenv('GRPC_MAX_SEND_MESSAGE_MB', '8')
+    monkeypatch.setenv('GRPC_MAX_RECEIVE_MESSAGE_MB', '0.5')
+    assert dict(grpc_server_options()) == {
+        'grpc.max_send_message_length': 8 * 1024 * 1024,
+        'grpc.max_receive_message_length': 512 * 1024,
+    }
+
+
+def test_uds_listener_replaces_a_stale_socket_file(tmp_path, monkeypatch):
+    uds_path = str(tmp_path / 'service.sock')
+    open(uds_path, 'w').close()
+    monkeypatch.setenv('GRPC_UDS_PATH', uds_path)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    try:
+        assert add_uds_listener(server) == uds_path
+        server.start()
+        with grpc.insecure_channel(f'unix:{uds_path}') as channel:
+            grpc.channel_ready_future(channel).result(timeout=10)
+    finally:
+        server.stop(0)
+
+
+def test_no_uds_listener_without_a_path(monkeypatch):
+    monkeypatch.setenv('GRPC_UDS_PATH', '')
+    assert add_uds_listener(None) == ''
@@ -0,0 +1,45 @@
+import numpy as np
+
+from rollout import RingWindow, rollout
+
+
+class RecordingModel:
+    """Relaxes every parameter towards 1 and keeps each input window it was given"""
+
+    input_shape = (None, 4, 8)
+
+    def __init__(self):
+        self.inputs = []
+
+    def predict(self, x, verbose=0):
+        self.inputs.append(np.array(x))
+        return 1.0 + 0.5 * (x[:, -1] - 1.0)
+
+
+def test_ring_window_replace_overwrites_latest_row():
+    window = RingWindow(np.zeros((1, 2)), 3)
+    window.push(np.ones((1, 2)))
+    window.replace(np.full((1, 2), 2.0))
+    assert window.view()[0, :, 0].tolist() == [0.0, 0.0, 2.0]
+
+
+def test_coarse_rollout_keeps_one_window_row_per_period():
+    model = RecordingModel()
+    trajectory = rollout(model, np.full((2, 8), 3.0), 90, step_days=30)
+
+    # Two model steps per period
+    assert len(model.inputs) == 6
+    # The third period starts from the first two periods' last days, with no
+    # daily row of the second steps left between them
+    last_window = model.inputs[4]
+    np.testing.assert_allclose(last_window[:, -1], trajectory[:, 59])
+    np.testing.assert_allclose(last_window[:, -2], trajectory[:, 29])
+    np.testing.assert_allclose(last_window[:, -3], 3.0)
+
+
+def test_daily_rollout_pushes_every_day():
+    model = RecordingModel()
+    trajectory = rollout(model, np.full((1, 8), 3.0), 5)
+
+    assert len(model.inputs) == 5
+    np.testing.assert_allclose(model.inputs[-1][:, -4:], trajectory[:, :4])
@@ -0,0 +1,130 @@
+import os
+import sys
+import socket
+import sqlite3
+import subprocess
+from concurrent import futures
+
+import grpc
+import pytest
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+import predictions_pb2
+import predictions_pb2_grpc
+from conftest import write_relaxing_model
+from routing_proxy import ReplicaPool, RoutingProxy
+
+REPLICAS = 3
+SITES = [f'site-{index}' for index in range(12)]
+CURRENT_VALUES = predictions_pb2.CurrentValues(
+    water_temperature=28.0, lagoon=2.0, OR_brine_level=4.5, OR_bund_level=1.5,
+    IR_brine_level=5.5, IR_bound_level=1.5, East_channel=7.0, West_channel=6.5
+)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def cluster(tmp_path_factory):
+    """REPLICAS server.py processes behind an in-process routing proxy"""
+    root = tmp_path_factory.mktemp('routing')
+    write_relaxing_model(str(root / 'relax.mmw'))
+
+    replicas = {}
+    for _ in range(REPLICAS):
+        port = _free_port()
+        env = dict(
+            os.environ, GRPC_PORT=str(port), MODEL_DIR=str(root),
+            FORECAST_STATE_DB=str(root / f'state-{port}.db'), MATERIALIZED_FORECAST_DB='',
+            PRECOMPUTE_INTERVAL_SECONDS='0', METRICS_LOG_INTERVAL='0', LOGS_SERVICE_URL='', GRPC_UDS_PATH=''
+        )
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.join(SRC, 'generated'), env.get('PYTHONPATH')]))
+        replicas[f'localhost:{port}'] = subprocess.Popen(
+            [sys.executable, os.path.join(SRC, 'server.py')], cwd=str(root), env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    pool = ReplicaPool(replicas, health_interval=0)
+    proxy = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    proxy.add_generic_rpc_handlers((RoutingProxy(pool).handler(),))
+    proxy_port = proxy.add_insecure_port('localhost:0')
+    proxy.start()
+    channel = grpc.insecure_channel(f'localhost:{proxy_port}')
+    try:
+        for address, process in replicas.items():
+            try:
+                grpc.channel_ready_future(pool.replicas[address].channel).result(timeout=120)
+            except grpc.FutureTimeoutError:
+                pytest.skip(f'replica {address} did not start (exit code {process.poll()})')
+        yield {
+            'root': root,
+            'replicas': replicas,
+            'pool': pool,
+            'stub': predictions_pb2_grpc.PredictionsServiceStub(channel),
+        }
+    finally:
+        channel.close()
+        proxy.stop(0)
+        for process in replicas.values():
+            process.terminate()
+            process.wait()
+
+
+def _forecast(stub, site_id):
+    response = stub.GetPredictions(predictions_pb2.PredictionRequest(
+        start_date='2026-01-10', forecast_days=5, current_values=CURRENT_VALUES, site_id=site_id,
+        model_id='relax', fields=['daily_parameters_forecast']
+    ), timeout=30)
+    assert response.status == 'success'
+    assert len(response.daily_parameters_forecast.forecasts) == 5
+
+
+def _sites_by_replica(cluster):
+    """Replica address of every site in the replicas' forecast state stores"""
+    served = {}
+    for address in cluster['replicas']:
+        port = address.rsplit(':', 1)[1]
+        with sqlite3.connect(str(cluster['root'] / f'state-{port}.db')) as conn:
+            for (site_id,) in conn.execute('SELECT site_id FROM forecast_state'):
+                served.setdefault(site_id, []).append(address)
+    return served
+
+
+def test_each_site_always_lands_on_its_ring_owner(cluster):
+    for _ in range(2):
+        for site_id in SITES:
+            _forecast(cluster['stub'], site_id)
+
+    served = _sites_by_replica(cluster)
+    assert sorted(served) == sorted(SITES)
+    for site_id, addresses in served.items():
+        assert addresses == [cluster['pool'].ring.owner(f'site:{site_id}')]
+    # The sites are spread over more than one replica
+    assert len({addresses[0] for addresses in served.values()}) > 1
+
+
+def test_traffic_moves_off_a_stopped_replica(cluster):
+    ring = cluster['pool'].ring
+    before = {site_id: ring.owner(f'site:{site_id}') for site_id in SITES}
+    stopped = before[SITES[0]]
+    process = cluster['replicas'][stopped]
+    process.terminate()
+    process.wait()
+
+    # Every site is still served, with the stopped replica's sites on the
+    # next replica of their ring preference
+    for site_id in SITES:
+        _forecast(cluster['stub'], site_id)
+    assert not cluster['pool'].replicas[stopped].healthy
+
+    served = _sites_by_replica(cluster)
+    for site_id in SITES:
+        if before[site_id] == stopped:
+            fallback = ring.preference(f'site:{site_id}')[1]
+            assert fallback in served[site_id]
+        else:
+            assert served[site_id] == [before[site_id]]
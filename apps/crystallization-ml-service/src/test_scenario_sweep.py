@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from production import PRODUCTION_ELASTICITIES, REFERENCE_DAILY_PRODUCTION, REFERENCE_PARAMETERS
+from scenario_sweep import SweepError, build_scenarios, run_sweep
+
+NAMES = ['water_temperature', 'lagoon', 'OR_brine_level', 'OR_bund_level',
+         'IR_brine_level', 'IR_bound_level', 'East_channel', 'West_channel']
+HORIZON = 60
+
+
+class PersistenceModel:
+    """Forecasts every day to be the same as the day before"""
+
+    input_shape = (None, 1, 8)
+
+    def predict(self, x, verbose=0):
+        return x[:, -1, :8]
+
+
+def test_grid_expands_to_its_cartesian_product_after_the_base():
+    expanded = build_scenarios(
+        NAMES, [('lagoon', [-1.0, 1.0]), ('East_channel', [0.5, 1.0, 1.5])],
+        [('', {'West_channel': 2.0}), ('dry', {'lagoon': -2.0})], max_scenarios=10
+    )
+
+    assert expanded[0] == ('base', {})
+    assert len(expanded) == 1 + 6 + 2
+    assert {tuple(sorted(deltas.items())) for _, deltas in expanded[1:7]} == {
+        (('East_channel', east), ('lagoon', lagoon)) for lagoon in (-1.0, 1.0) for east in (0.5, 1.0, 1.5)
+    }
+    assert expanded[1][0] == 'lagoon-1, East_channel+0.5'
+    assert expanded[7:] == [('scenario_1', {'West_channel': 2.0}), ('dry', {'lagoon': -2.0})]
+
+
+@pytest.mark.parametrize('grid, scenarios', [
+    ([('salinity', [1.0])], []),
+    ([], [('wet', {'salinity': 1.0})]),
+    ([('lagoon', [0.1, 0.2, 0.3]), ('East_channel', [0.1, 0.2])], []),
+])
+def test_malformed_sweeps_are_rejected(grid, scenarios):
+    with pytest.raises(SweepError):
+        build_scenarios(NAMES, grid, scenarios, max_scenarios=6)
+
+
+@pytest.mark.parametrize('horizon_days', [0, -5, 10_000])
+def test_horizon_outside_the_supported_range_is_rejected(horizon_days):
+    with pytest.raises(SweepError):
+        run_sweep(PersistenceModel(), NAMES, REFERENCE_PARAMETERS.copy(), [('base', {})],
+                  datetime(2026, 1, 1), horizon_days)
+
+
+def test_sensitivities_are_central_differences_of_total_production():
+    scenarios = [('base', {}), ('warmer', {'water_temperature': 2.0})]
+    result = run_sweep(
+        PersistenceModel(), NAMES, REFERENCE_PARAMETERS.copy(), scenarios, datetime(2026, 1, 1), HORIZON
+    )
+
+    # Production is linear in the inputs, which the persistence model holds
+    # for the whole horizon, so the probes recover its coefficients exactly
+    per_unit = HORIZON * REFERENCE_DAILY_PRODUCTION * PRODUCTION_ELASTICITIES / REFERENCE_PARAMETERS
+    sensitivities = result['sensitivities']
+    assert [entry['parameter'] for entry in sensitivities] == NAMES
+    np.testing.assert_allclose([entry['production_per_unit'] for entry in sensitivities], per_unit, rtol=1e-4)
+    np.testing.assert_allclose([entry['elasticity'] for entry in sensitivities], PRODUCTION_ELASTICITIES,
+                               rtol=1e-4, atol=1e-6)
+
+    base, warmer = result['summaries']
+    assert base['total_production'] == pytest.approx(HORIZON * REFERENCE_DAILY_PRODUCTION)
+    assert warmer['total_production'] - base['total_production'] == pytest.approx(2.0 * per_unit[0])
@@ -0,0 +1,68 @@
+import time
+from multiprocessing import shared_memory
+
+import pyarrow as pa
+import pytest
+
+from shared_results import SharedResultError, SharedResultStore, read_batch
+
+
+def _batch(rows=1000):
+    return pa.RecordBatch.from_pydict({'day': list(range(rows)), 'value': [float(row) for row in range(rows)]})
+
+
+def _exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+@pytest.fixture
+def store():
+    store = SharedResultStore(ttl_seconds=60.0)
+    yield store
+    store.close()
+
+
+def test_batches_read_back_from_their_segment(store):
+    batch = _batch()
+    name, size = store.put_batch(batch)
+    read, segment = read_batch(name, size)
+    try:
+        assert read.equals(batch)
+    finally:
+        del read
+        segment.close()
+
+
+def test_segments_are_unlinked_once_their_ttl_runs_out(store):
+    name, size = store.put_batch(_batch())
+    assert store.expire(now=time.monotonic() + 30.0) == 0
+    assert _exists(name)
+
+    assert store.expire(now=time.monotonic() + 61.0) == 1
+    assert not _exists(name)
+    # Their bytes no longer count against the limit
+    assert store._bytes == 0
+
+
+def test_close_unlinks_every_segment(store):
+    names = [store.put_batch(_batch())[0] for _ in range(3)]
+    store.close()
+    assert not any(_exists(name) for name in names)
+
+
+def test_segments_beyond_the_size_limit_are_refused():
+    store = SharedResultStore(max_bytes=1)
+    try:
+        with pytest.raises(SharedResultError):
+            store.put_batch(_batch())
+    finally:
+        store.close()
+
+
+def test_disabled_store_refuses_batches():
+    with pytest.raises(SharedResultError):
+        SharedResultStore(enabled=False).put_batch(_batch())